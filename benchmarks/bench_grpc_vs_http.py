@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latência HTTP x gRPC no serviço de Prazos (listar e criar)
+
+Sobe o serviço de Prazos real (mesmo `create_app`) com as duas interfaces
+sobre o mesmo armazenamento: HTTP/1.1 keep-alive via werkzeug e gRPC via
+o servicer do serviço. Mede a latência por chamada de um cliente
+(requests.Session x stub gRPC) para listagem e criação.
+
+O arquivo de dados do serviço é restaurado ao final.
+
+Uso:
+    python benchmarks/bench_grpc_vs_http.py --requests 500 --items 200
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import sys
+import threading
+import time
+from concurrent import futures
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import grpc  # noqa: E402
+import requests  # noqa: E402
+from werkzeug.serving import make_server, WSGIRequestHandler  # noqa: E402
+
+from protos import deadlines_pb2, deadlines_pb2_grpc  # noqa: E402
+from services.deadlines.app import create_app  # noqa: E402
+from services.deadlines.grpc_server import register  # noqa: E402
+
+DATA_FILE = os.path.join(BASE_DIR, "services", "deadlines", "data", "deadlines.json")
+OFFICE_ID = "bench-office"
+PAYLOAD = {"process_id": "PROC-001", "due_date": "2099-12-31", "description": "Prazo de benchmark"}
+
+
+def start_servers(app) -> tuple:
+    """Sobe HTTP e gRPC em portas livres sobre a mesma aplicação"""
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
+    http_server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+
+    grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    register(grpc_server, app)
+    grpc_port = grpc_server.add_insecure_port("127.0.0.1:0")
+    grpc_server.start()
+    return http_server, grpc_server, f"http://127.0.0.1:{http_server.server_port}", f"127.0.0.1:{grpc_port}"
+
+
+def measure(call, total: int) -> list:
+    """Latências (ms) de `total` chamadas, após aquecimento"""
+    for _ in range(20):
+        call()
+    samples = []
+    for _ in range(total):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summary(samples: list) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"média {statistics.mean(samples):7.3f} ms  p50 {statistics.median(samples):7.3f} ms  p95 {p95:7.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--items", type=int, default=200, help="prazos do escritório antes de medir a listagem")
+    args = parser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    backup = DATA_FILE + ".bench"
+    had_data = os.path.exists(DATA_FILE)
+    if had_data:
+        shutil.copyfile(DATA_FILE, backup)
+
+    try:
+        app = create_app()
+        http_server, grpc_server, base_url, grpc_target = start_servers(app)
+        session = requests.Session()
+        headers = {"X-Office-ID": OFFICE_ID}
+        channel = grpc.insecure_channel(grpc_target)
+        stub = deadlines_pb2_grpc.DeadlinesStub(channel)
+        metadata = (("x-office-id", OFFICE_ID),)
+        create_request = deadlines_pb2.CreateDeadlineRequest(**PAYLOAD)
+
+        for _ in range(args.items):
+            app.extensions["deadlines"]["add"](dict(PAYLOAD), OFFICE_ID)
+
+        results = {
+            "HTTP list  ": measure(lambda: session.get(f"{base_url}/deadlines", headers=headers).json(), args.requests),
+            "gRPC list  ": measure(lambda: stub.ListDeadlines(deadlines_pb2.ListDeadlinesRequest(), metadata=metadata, timeout=5), args.requests),
+            "HTTP create": measure(lambda: session.post(f"{base_url}/deadlines", json=PAYLOAD, headers=headers).json(), args.requests),
+            "gRPC create": measure(lambda: stub.CreateDeadline(create_request, metadata=metadata, timeout=5), args.requests),
+        }
+
+        channel.close()
+        grpc_server.stop(None)
+        http_server.shutdown()
+    finally:
+        if had_data:
+            shutil.move(backup, DATA_FILE)
+        elif os.path.exists(DATA_FILE):
+            os.remove(DATA_FILE)
+
+    print(f"Chamadas por cenário: {args.requests}  Itens na listagem: {args.items}")
+    for name, samples in results.items():
+        print(f"{name}  {summary(samples)}")
+
+
+if __name__ == "__main__":
+    main()
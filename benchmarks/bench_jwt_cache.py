@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: custo da autenticação por requisição com e sem cache de tokens
+
+Executa a checagem do `require_auth` (cabeçalho Bearer → claims) N vezes
+com o mesmo token, dentro de um contexto de requisição Flask, com o cache
+de tokens desligado e ligado.
+
+Uso:
+    python benchmarks/bench_jwt_cache.py --requests 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "gateway"))
+
+from flask import Flask  # noqa: E402
+
+import security  # noqa: E402
+
+
+def run(enabled: bool, token: str, total: int) -> float:
+    """Executa o benchmark e retorna microssegundos por requisição"""
+    security.JWT_CACHE_ENABLED = enabled
+    security.TOKEN_CACHE.clear()
+    app = Flask("bench_gateway")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with app.test_request_context("/", headers=headers):
+        # Aquecimento
+        for _ in range(100):
+            assert security._check_auth() is None
+
+        start = time.perf_counter()
+        for _ in range(total):
+            security._check_auth()
+        elapsed = time.perf_counter() - start
+    return elapsed / total * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50000)
+    args = parser.parse_args()
+
+    token = security.generate_token(
+        "bench@advogado.com", ["lawyer", "user"], ["read", "write", "orchestrate"], office_id="office-bench"
+    )
+
+    without_cache = run(False, token, args.requests)
+    with_cache = run(True, token, args.requests)
+    stats = security.TOKEN_CACHE.stats()
+
+    print(f"Requisições: {args.requests}")
+    print(f"Sem cache:  {without_cache:8.2f} µs/req")
+    print(f"Com cache:  {with_cache:8.2f} µs/req")
+    print(f"Ganho:      {without_cache / with_cache:8.2f}x")
+    print(f"Cache:      {stats['hits']} acertos, {stats['misses']} falhas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: logins por segundo no serviço de Autenticação com 50k usuários
+
+Grava N usuários no arquivo do serviço (uma parte como contas antigas,
+sem `user_type`), mede o `create_app()` real (leitura + migração das contas
+antigas) e dispara logins com o test client do Flask, em várias threads.
+Mostra também se o arquivo de usuários foi regravado durante os logins.
+O custo do scrypt fica baixo (`--scrypt-n`) para medir o caminho de
+gravação; a latência do hash é medida em `bench_passwords.py`.
+Os arquivos de dados do serviço são restaurados ao final.
+
+Uso:
+    python benchmarks/bench_login.py --users 50000 --logins 5000 --concurrency 4
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("STORAGE_ENGINE", "json")
+
+from common import passwords  # noqa: E402
+from services.auth.app import create_app  # noqa: E402
+
+DATA_DIR = os.path.join(BASE_DIR, "services", "auth", "data")
+DATA_FILES = [os.path.join(DATA_DIR, name) for name in ("users.json", "offices.json")]
+PASSWORD = "senha123"
+
+
+def make_users(total: int, legacy_ratio: float) -> dict:
+    """Usuários de advogados; `legacy_ratio` deles sem os campos novos"""
+    # Mesmo hash para todos: gerar 50k hashes scrypt levaria minutos
+    password_hash = passwords.hash_password(PASSWORD)
+    users = {}
+    for i in range(total):
+        email = f"adv{i:06d}@advogado.com"
+        user = {
+            "password_hash": password_hash,
+            "name": f"Advogado {i}",
+            "roles": ["advogado", "user"],
+            "permissions": ["read", "write", "orchestrate"],
+        }
+        if i >= total * legacy_ratio:
+            user.update({"email": email, "user_type": "advogado", "office_id": f"office-{i % 100:03d}"})
+        users[email] = user
+    return users
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--logins", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--legacy", type=float, default=0.5, help="fração de contas antigas")
+    parser.add_argument("--scrypt-n", type=int, default=1024)
+    args = parser.parse_args()
+    passwords.PASSWORD_SCRYPT_N = args.scrypt_n
+
+    backups = {}
+    for path in DATA_FILES:
+        if os.path.exists(path):
+            backups[path] = f"{path}.bench-bak"
+            shutil.copyfile(path, backups[path])
+
+    users_file = DATA_FILES[0]
+    try:
+        with open(users_file, "w", encoding="utf-8") as f:
+            json.dump(make_users(args.users, args.legacy), f)
+
+        start = time.perf_counter()
+        app = create_app()
+        startup = time.perf_counter() - start
+
+        emails = [f"adv{random.randrange(args.users):06d}@advogado.com" for _ in range(args.logins)]
+        chunks = [emails[i::args.concurrency] for i in range(args.concurrency)]
+
+        def worker(chunk: list) -> None:
+            client = app.test_client()
+            for email in chunk:
+                resp = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+                assert resp.status_code == 200, resp.get_json()
+
+        worker(chunks[0][:10])  # aquecimento (migra as contas antigas, se ainda for no login)
+        mtime = os.stat(users_file).st_mtime_ns
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(worker, chunks))
+        elapsed = time.perf_counter() - start
+        rewritten = os.stat(users_file).st_mtime_ns != mtime
+    finally:
+        for path in DATA_FILES:
+            if os.path.exists(path):
+                os.remove(path)
+        for path, backup in backups.items():
+            shutil.move(backup, path)
+
+    print(f"Usuários: {args.users}  Logins: {args.logins}  Concorrência: {args.concurrency}")
+    print(f"Subida (leitura + migração): {startup:8.2f} s")
+    print(f"Logins:                      {args.logins / elapsed:8.1f} logins/s")
+    print(f"Arquivo regravado no login:  {'sim' if rewritten else 'não'}")
+
+
+if __name__ == "__main__":
+    main()
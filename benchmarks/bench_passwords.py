@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latência de login (p50/p99) por custo do scrypt
+
+Para cada valor de N (custo do scrypt), dispara verificações de senha pelo
+PasswordHasher do serviço de Autenticação a partir de várias threads
+(como as requisições de login) e mostra p50, p99, vazão e quantas foram
+recusadas pela fila. Marca os custos que cabem no p99 alvo: use o maior
+deles em PASSWORD_SCRYPT_N.
+
+Uso:
+    python benchmarks/bench_passwords.py --costs 4096,8192,16384,32768 --logins 400 --concurrency 16 --target-p99-ms 250
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from common.passwords import (  # noqa: E402
+    PASSWORD_QUEUE_SIZE, PASSWORD_WORKERS, PasswordHasher, PasswordHasherBusy, hash_password
+)
+
+PASSWORD = "senha123"
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(hasher: PasswordHasher, n: int, total: int, concurrency: int) -> tuple:
+    """Retorna latências (s) das verificações aceitas, recusadas e vazão"""
+    stored = hash_password(PASSWORD, (n, 8, 1))
+    latencies, rejected = [], 0
+
+    def login(_):
+        nonlocal rejected
+        start = time.perf_counter()
+        try:
+            assert hasher.verify(PASSWORD, stored)
+        except PasswordHasherBusy:
+            rejected += 1
+            return
+        latencies.append(time.perf_counter() - start)
+
+    # Aquecimento (sobe os processos do pool)
+    with ThreadPoolExecutor(max_workers=hasher.workers or 1) as executor:
+        list(executor.map(login, range(max(hasher.workers, 1))))
+    latencies.clear()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(login, range(total)))
+    elapsed = time.perf_counter() - start
+    return latencies, rejected, len(latencies) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--costs", default="4096,8192,16384,32768")
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=PASSWORD_WORKERS)
+    parser.add_argument("--queue-size", type=int, default=PASSWORD_QUEUE_SIZE)
+    parser.add_argument("--target-p99-ms", type=float, default=250.0)
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(workers=args.workers, queue_size=args.queue_size)
+    print(f"Logins: {args.logins}  Concorrência: {args.concurrency}  "
+          f"Pool: {args.workers} processos, fila {args.queue_size}  Alvo p99: {args.target_p99_ms:.0f} ms")
+    print(f"{'N':>7} {'p50 (ms)':>9} {'p99 (ms)':>9} {'logins/s':>9} {'recusados':>10}  alvo")
+    try:
+        for n in (int(c) for c in args.costs.split(",")):
+            latencies, rejected, throughput = run(hasher, n, args.logins, args.concurrency)
+            p50, p99 = percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+            ok = "ok" if p99 <= args.target_p99_ms else "-"
+            print(f"{n:>7} {p50:>9.1f} {p99:>9.1f} {throughput:>9.1f} {rejected:>10}  {ok}")
+    finally:
+        hasher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: buscas do serviço de Processos com 100k processos
+
+Carrega o serviço de Processos real (mesmo `create_app`) com N processos
+distribuídos entre escritórios e mede, pelo test client do Flask, a
+busca por número, a criação (checagem de duplicidade) e a listagem de um
+escritório. Para comparação, mede as mesmas buscas como varreduras
+lineares da coleção (o comportamento anterior aos índices).
+
+As escritas usam o motor `log` (sem snapshots) para que a persistência
+não domine a medição. O arquivo de dados do serviço é restaurado ao final.
+
+Uso:
+    python benchmarks/bench_process_index.py --processes 100000 --requests 200
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("STORAGE_ENGINE", "log")
+os.environ.setdefault("LOG_SNAPSHOT_INTERVAL", "0")
+
+from services.processes.app import create_app  # noqa: E402
+
+DATA_FILE = os.path.join(BASE_DIR, "services", "processes", "data", "processes.json")
+OFFICES = 1000
+
+
+def make_processes(total: int) -> dict:
+    processes = {}
+    for i in range(total):
+        proc_id = f"{i:08x}"
+        processes[proc_id] = {
+            "id": proc_id,
+            "number": f"PROC-{i:06d}",
+            "title": f"Ação {i}",
+            "description": "",
+            "status": "open",
+            "created_at": "2025-01-01T10:00:00-03:00",
+            "updated_at": "2025-01-01T10:00:00-03:00",
+            "office_id": f"office-{i % OFFICES}",
+        }
+    return processes
+
+
+def measure(call, total: int) -> list:
+    """Latências (ms) de `total` chamadas"""
+    samples = []
+    for i in range(total):
+        start = time.perf_counter()
+        call(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summary(samples: list) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"p50 {statistics.median(samples):8.3f} ms  p95 {p95:8.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    processes = make_processes(args.processes)
+    backup = DATA_FILE + ".bench.bak"
+    shutil.copyfile(DATA_FILE, backup)
+    try:
+        with open(DATA_FILE, "w", encoding="utf-8") as f:
+            json.dump(processes, f)
+        client = create_app().test_client()
+        headers = {"X-Office-ID": "office-7"}
+        values = list(processes.values())
+
+        def by_number(i):
+            number = f"PROC-{(i * 7919) % args.processes:06d}"
+            assert client.get(f"/processes/by-number/{number}").status_code == 200
+
+        def create(i):
+            body = {"number": f"PROC-9{i:08d}", "title": "Nova ação"}
+            assert client.post("/processes", json=body, headers=headers).status_code == 201
+
+        def list_office(i):
+            assert client.get("/processes", headers=headers).status_code == 200
+
+        def scan_number(i):
+            number = f"PROC-{(i * 7919) % args.processes:06d}"
+            next(p for p in values if p["number"] == number)
+
+        def scan_office(i):
+            [p for p in values if p["office_id"] == "office-7"]
+
+        print(f"Processos: {args.processes}  Escritórios: {OFFICES}  Requisições: {args.requests}")
+        print(f"GET  /processes/by-number (índice)   {summary(measure(by_number, args.requests))}")
+        print(f"POST /processes (índice)             {summary(measure(create, args.requests))}")
+        print(f"GET  /processes de um escritório     {summary(measure(list_office, args.requests))}")
+        print(f"varredura por número (antes)         {summary(measure(scan_number, args.requests))}")
+        print(f"varredura por escritório (antes)     {summary(measure(scan_office, args.requests))}")
+    finally:
+        shutil.move(backup, DATA_FILE)
+        for suffix in (".log", ".log.1"):
+            if os.path.exists(DATA_FILE + suffix):
+                os.remove(DATA_FILE + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memória de prazos e audiências em dicts x registros compactos
+
+Gera N prazos e N audiências no formato dos arquivos dos serviços, faz o
+parse como na carga (`json.loads` do arquivo inteiro) e mede, com
+`tracemalloc`, a memória retida pela coleção: a lista de dicts (formato
+anterior) e a lista de `Deadline`/`Hearing` (`__slots__`, strings
+internadas, datas como ordinais). Também mede o tempo de conversão de
+volta ao formato da API de uma página de 500 registros.
+
+Uso:
+    python benchmarks/bench_records.py --records 1000000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from services.deadlines.app import Deadline  # noqa: E402
+from services.hearings.app import Hearing  # noqa: E402
+
+
+def make_deadline(i: int) -> dict:
+    return {
+        "id": f"{i:08x}",
+        "process_id": f"PROC-{i % 5000:04d}",
+        "due_date": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        "description": "Contestação",
+        "created_at": f"2025-01-01T10:{i % 60:02d}:{i % 60:02d}.{i % 1000000:06d}-03:00",
+        "office_id": f"office-{i % 50}",
+    }
+
+
+def make_hearing(i: int) -> dict:
+    return {
+        "id": f"{i:08x}",
+        "process_id": f"PROC-{i % 5000:04d}",
+        "date": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        "courtroom": f"Sala {i % 10}",
+        "description": "Audiência de instrução",
+        "created_at": f"2025-01-01T10:{i % 60:02d}:{i % 60:02d}.{i % 1000000:06d}-03:00",
+        "office_id": f"office-{i % 50}",
+    }
+
+
+def measure(build) -> tuple:
+    """(MiB retidos pelo resultado de `build`, segundos), sem contar temporários"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained / (1024 * 1024), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.records
+
+    print(f"{'coleção':>10} {'formato':>10} {'MiB':>9} {'bytes/reg':>10} {'carga (s)':>10}")
+    for name, make, record_cls in (("prazos", make_deadline, Deadline), ("audiências", make_hearing, Hearing)):
+        text = json.dumps([make(i) for i in range(n)])
+
+        records, mib, elapsed = measure(lambda: json.loads(text))
+        print(f"{name:>10} {'dict':>10} {mib:>9.1f} {mib * 1024 * 1024 / n:>10.0f} {elapsed:>10.2f}")
+        del records
+
+        records, mib, elapsed = measure(lambda: [record_cls.from_dict(r) for r in json.loads(text)])
+        print(f"{name:>10} {'compacto':>10} {mib:>9.1f} {mib * 1024 * 1024 / n:>10.0f} {elapsed:>10.2f}")
+
+        page = records[:500]
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for record in page:
+                record.to_dict()
+            timings.append(time.perf_counter() - start)
+        print(f"{'':>10} to_dict de 500 registros: {min(timings) * 1000:.2f} ms")
+        del records, text
+
+
+if __name__ == "__main__":
+    main()
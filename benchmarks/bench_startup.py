@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tempo até o serviço ficar pronto, JSON x snapshot binário
+
+Para cada tamanho, grava N prazos no arquivo do serviço de Prazos em cada
+formato (JSON indentado, como hoje; snapshot binário sem compressão e com
+gzip) e mede o `create_app()` real: leitura do arquivo, registros
+compactos e índice de datas. Também mostra o tamanho do arquivo. O
+arquivo de dados do serviço é restaurado ao final.
+
+Uso:
+    python benchmarks/bench_startup.py --sizes 10000,100000,1000000
+"""
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("STORAGE_ENGINE", "json")
+
+from benchmarks.bench_records import make_deadline  # noqa: E402
+from services import snapshot, storage  # noqa: E402
+from services.deadlines.app import create_app  # noqa: E402
+
+DATA_FILE = os.path.join(BASE_DIR, "services", "deadlines", "data", "deadlines.json")
+SNAP_FILE = snapshot.snapshot_path(DATA_FILE)
+FORMATS = (("json", "none"), ("binary", "none"), ("binary", "gzip"))
+
+
+def write_data(records: list, fmt: str, compression: str) -> int:
+    """Grava a coleção no formato; retorna o tamanho do arquivo"""
+    for path in (DATA_FILE, SNAP_FILE):
+        if os.path.exists(path):
+            os.remove(path)
+    if fmt == "json":
+        with open(DATA_FILE, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+        return os.path.getsize(DATA_FILE)
+    snapshot.write_file(SNAP_FILE, records, compression)
+    return os.path.getsize(SNAP_FILE)
+
+
+def time_to_ready(fmt: str, compression: str) -> float:
+    storage.SNAPSHOT_FORMAT = fmt
+    storage.SNAPSHOT_COMPRESSION = compression
+    gc.collect()
+    start = time.perf_counter()
+    app = create_app()
+    elapsed = time.perf_counter() - start
+    del app
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    args = parser.parse_args()
+
+    backups = {}
+    for path in (DATA_FILE, SNAP_FILE):
+        if os.path.exists(path):
+            backups[path] = f"{path}.bench-bak"
+            shutil.copyfile(path, backups[path])
+
+    print(f"{'registros':>10} {'formato':>14} {'arquivo (MB)':>13} {'pronto (s)':>11}")
+    try:
+        for size in (int(s) for s in args.sizes.split(",")):
+            records = [make_deadline(i) for i in range(size)]
+            for fmt, compression in FORMATS:
+                file_size = write_data(records, fmt, compression)
+                elapsed = time_to_ready(fmt, compression)
+                label = fmt if compression == "none" else f"{fmt}+{compression}"
+                print(f"{size:>10} {label:>14} {file_size / 1e6:>13.1f} {elapsed:>11.2f}")
+            del records
+    finally:
+        for path in (DATA_FILE, SNAP_FILE):
+            if os.path.exists(path):
+                os.remove(path)
+        for path, backup in backups.items():
+            shutil.move(backup, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latência de escrita do JsonStore x LogStore
+
+Para cada tamanho de coleção, grava um arquivo com N registros no
+formato dos serviços, carrega o store e mede a latência de `put` de
+registros novos. O JsonStore reescreve o arquivo inteiro a cada escrita;
+o LogStore só acrescenta uma linha ao log (snapshots desligados).
+
+Uso:
+    python benchmarks/bench_storage.py --sizes 1000,100000,1000000 --writes 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from services.storage import JsonStore, LogStore  # noqa: E402
+
+
+def make_record(i: int) -> dict:
+    return {
+        "id": f"{i:08x}",
+        "title": f"Documento {i}",
+        "content": "Petição inicial " * 4,
+        "author": "Autor",
+        "process_id": f"PROC-{i % 1000:03d}",
+        "created_at": "2025-01-01T10:00:00-03:00",
+        "updated_at": "2025-01-01T10:00:00-03:00",
+        "office_id": f"office-{i % 10}",
+    }
+
+
+def run(store_cls, size: int, writes: int, data_dir: str) -> list:
+    """Retorna as latências (ms) de `writes` escritas sobre `size` registros"""
+    file_path = os.path.join(data_dir, f"{store_cls.__name__}-{size}.json")
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump({r["id"]: r for r in map(make_record, range(size))}, f)
+
+    kwargs = {"snapshot_interval": 0} if store_cls is LogStore else {}
+    store = store_cls(file_path, default={}, **kwargs)
+    store.load()
+
+    latencies = []
+    for i in range(size, size + writes):
+        record = make_record(i)
+        start = time.perf_counter()
+        store.put(record["id"], record)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--writes", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'registros':>10} {'store':>10} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    with tempfile.TemporaryDirectory() as data_dir:
+        for size in (int(s) for s in args.sizes.split(",")):
+            for store_cls in (JsonStore, LogStore):
+                latencies = sorted(run(store_cls, size, args.writes, data_dir))
+                p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+                print(f"{size:>10} {store_cls.__name__:>10} {statistics.median(latencies):>10.3f} {p99:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
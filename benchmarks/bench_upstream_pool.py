@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: requisições por segundo do ServiceClient com e sem pool keep-alive
+
+Sobe um upstream HTTP/1.1 local (keep-alive) e dispara N requisições
+com o ServiceClient do gateway nos dois modos.
+
+Uso:
+    python benchmarks/bench_upstream_pool.py --requests 2000 --concurrency 8
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "gateway"))
+
+from flask import Flask, jsonify  # noqa: E402
+from werkzeug.serving import make_server, WSGIRequestHandler  # noqa: E402
+
+from services import ServiceClient  # noqa: E402
+
+
+def start_upstream() -> tuple:
+    """Sobe um serviço mínimo com keep-alive em porta livre"""
+    upstream = Flask("bench_upstream")
+
+    @upstream.get("/ping")
+    def ping():
+        return jsonify({"status": "ok"}), 200
+
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
+    server = make_server("127.0.0.1", 0, upstream, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def run(pooled: bool, base_url: str, total: int, concurrency: int) -> float:
+    """Executa o benchmark e retorna requisições por segundo"""
+    client = ServiceClient(pooled=pooled)
+    client.services = {"bench": base_url}
+    ctx_app = Flask("bench_gateway")
+
+    def worker(count: int) -> None:
+        with ctx_app.test_request_context("/"):
+            for _ in range(count):
+                _, status = client.forward_request("bench", "GET", "/ping")
+                assert status == 200
+
+    per_worker = [total // concurrency] * concurrency
+    per_worker[0] += total % concurrency
+
+    # Aquecimento
+    worker(10)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, per_worker))
+    elapsed = time.perf_counter() - start
+
+    if client.session_pool is not None:
+        client.session_pool.close()
+    return total / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    logging.getLogger("services").setLevel(logging.WARNING)
+
+    server, base_url = start_upstream()
+    try:
+        no_pool = run(False, base_url, args.requests, args.concurrency)
+        pooled = run(True, base_url, args.requests, args.concurrency)
+    finally:
+        server.shutdown()
+
+    print(f"Requisições: {args.requests}  Concorrência: {args.concurrency}")
+    print(f"Sem pool:  {no_pool:10.1f} req/s")
+    print(f"Com pool:  {pooled:10.1f} req/s")
+    print(f"Ganho:     {pooled / no_pool:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Código compartilhado entre o API Gateway e os microserviços
+
+O Gateway adiciona a raiz do repositório ao final do sys.path para
+importar este pacote (como faz com `protos`).
+"""
@@ -0,0 +1,169 @@
+"""
+Hash de senhas (scrypt com sal por usuário)
+
+Formato gravado: `scrypt$<n>$<r>$<p>$<sal hex>$<hash hex>`. Hashes SHA-256
+sem sal (contas antigas) continuam aceitos; `needs_rehash` indica quando
+regravar a senha no formato (e custo) atual, feito no próximo login.
+
+O scrypt é caro de propósito (CPU e memória). `PasswordHasher` executa a
+derivação num pool de processos limitado, fora das threads das requisições;
+com `PASSWORD_QUEUE_SIZE` derivações pendentes, novas chamadas são
+recusadas (`PasswordHasherBusy`) em vez de formar fila sem fim.
+
+A memória de uma derivação é limitada pela configuração, não pelo hash:
+um hash gravado com custo acima de PASSWORD_SCRYPT_MAXMEM não é aceito.
+
+Usado pelo serviço de Autenticação e pelo Gateway.
+"""
+
+import hashlib
+import hmac
+import multiprocessing
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+# Custo do scrypt (memória ≈ 128 * n * r bytes por derivação); ver benchmarks/bench_passwords.py
+PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", "16384"))
+PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+# Teto de memória por derivação (o custo configurado sempre cabe)
+PASSWORD_SCRYPT_MAXMEM = int(os.getenv("PASSWORD_SCRYPT_MAXMEM", str(64 << 20)))
+# Processos do pool (0: deriva na própria thread) e derivações pendentes aceitas
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_QUEUE_SIZE = int(os.getenv("PASSWORD_QUEUE_SIZE", "32"))
+
+SCHEME = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+class PasswordHasherBusy(Exception):
+    """Fila de derivações cheia: a requisição deve ser recusada (503)"""
+
+
+def _max_memory() -> int:
+    # Folga sobre o custo configurado (o padrão do OpenSSL é 32 MB)
+    return max(PASSWORD_SCRYPT_MAXMEM, 256 * PASSWORD_SCRYPT_N * PASSWORD_SCRYPT_R * PASSWORD_SCRYPT_P + (1 << 20))
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # Custo acima do teto: ValueError (o hash é recusado)
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=_max_memory(), dklen=KEY_BYTES)
+
+
+def current_params() -> Tuple[int, int, int]:
+    return PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P
+
+
+def hash_password(password: str, params: Optional[Tuple[int, int, int]] = None) -> str:
+    """Hash scrypt com sal aleatório, no formato gravado"""
+    n, r, p = params or current_params()
+    salt = secrets.token_bytes(SALT_BYTES)
+    return f"{SCHEME}${n}${r}${p}${salt.hex()}${_scrypt(password, salt, n, r, p).hex()}"
+
+
+def _legacy_hash(password: str) -> str:
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def is_legacy(password_hash: str) -> bool:
+    return not password_hash.startswith(SCHEME + "$")
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Confere a senha com o hash gravado (scrypt ou SHA-256 antigo)"""
+    if not password_hash:
+        return False
+    if is_legacy(password_hash):
+        return hmac.compare_digest(_legacy_hash(password), password_hash)
+    try:
+        _, n, r, p, salt, expected = password_hash.split("$")
+        key = _scrypt(password, bytes.fromhex(salt), int(n), int(r), int(p))
+    except ValueError:
+        return False
+    return hmac.compare_digest(key.hex(), expected)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """Hash antigo ou com custo diferente do configurado"""
+    if is_legacy(password_hash):
+        return True
+    try:
+        _, n, r, p, _, _ = password_hash.split("$")
+        return (int(n), int(r), int(p)) != current_params()
+    except ValueError:
+        return True
+
+
+class PasswordHasher:
+    """
+    Derivações em um pool de processos com fila limitada
+
+    Hashes SHA-256 antigos são conferidos na própria thread (são baratos).
+    O pool é criado no primeiro uso: com vários workers pré-forkados cada
+    um tem o seu. Usa `spawn` para não herdar locks de um processo com threads.
+    """
+
+    def __init__(self, workers: int = PASSWORD_WORKERS, queue_size: int = PASSWORD_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._pid = os.getpid()
+        # Derivações concluídas com sucesso e recusadas pela fila
+        self._stats_lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self._pid = os.getpid()
+            return self._pool
+
+    def _run(self, fn, *args) -> Any:
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("Fila de hash de senhas cheia")
+        try:
+            if self.workers <= 0:
+                result = fn(*args)
+            else:
+                result = self._executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+        with self._stats_lock:
+            self.completed += 1
+        return result
+
+    def hash(self, password: str) -> str:
+        return self._run(hash_password, password, current_params())
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        if not password_hash or is_legacy(password_hash):
+            return verify_password(password, password_hash or "")
+        return self._run(verify_password, password, password_hash)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            completed, rejected = self.completed, self.rejected
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "completed": completed,
+            "rejected": rejected,
+        }
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
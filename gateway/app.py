@@ -15,14 +15,19 @@ from flask_talisman import Talisman
 # Imports locais
 from config import get_config
 from middleware import setup_middleware, protocol_selector
-from services import ServiceClient, HealthChecker, GrpcClient
+from services import (
+    ServiceClient, HealthChecker, GrpcClient, FanOutExecutor, ProcessLookup, OfficeLookup,
+    NDJSON_MIMETYPE, NEXT_CURSOR_HEADER, LIST_QUERY_PARAMS
+)
 from security import (
     require_auth, require_permission, require_role, validate_json,
     LoginSchema, DocumentSchema, DeadlineSchema, HearingSchema,
     authenticate_user, generate_token, log_security_event,
-    RegisterSchema, ProcessSchema, CreateUserSchema
+    RegisterSchema, ProcessSchema, CreateUserSchema, TOKEN_CACHE
 )
 from exceptions import GatewayException
+from cache import TTLCache
+from policy import AccessPolicy, decode_access
 
 # Configuração
 config = get_config()
@@ -48,7 +53,8 @@ def create_app():
         r"/api/*": {
             "origins": config.ALLOWED_ORIGINS,
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization", "X-Correlation-ID"]
+            "allow_headers": ["Content-Type", "Authorization", "X-Correlation-ID", "If-None-Match"],
+            "expose_headers": ["ETag", NEXT_CURSOR_HEADER]
         },
         r"/ui": {"origins": config.ALLOWED_ORIGINS},
         r"/health": {"origins": config.ALLOWED_ORIGINS}
@@ -75,16 +81,105 @@ def create_app():
     
     # Serviços
     service_client = ServiceClient()
+    fan_out = FanOutExecutor(
+        service_client,
+        max_workers=config.ORCHESTRATION_MAX_WORKERS,
+        default_timeout=config.ORCHESTRATION_BRANCH_TIMEOUT
+    )
     grpc_client = GrpcClient()
-    health_checker = HealthChecker(service_client)
+    health_checker = HealthChecker(
+        service_client,
+        interval=config.HEALTH_REFRESH_INTERVAL,
+        probe_timeout=config.HEALTH_PROBE_TIMEOUT
+    )
+    if config.HEALTH_REFRESH_ENABLED:
+        health_checker.start()
+    process_lookup = ProcessLookup(
+        service_client,
+        cache=TTLCache(
+            max_entries=config.PROCESS_CACHE_MAX_ENTRIES, ttl=config.PROCESS_CACHE_TTL
+        ) if config.PROCESS_CACHE_ENABLED else None,
+        cache_negative=config.PROCESS_CACHE_NEGATIVE,
+        negative_ttl=config.PROCESS_CACHE_NEGATIVE_TTL
+    )
+    office_lookup = OfficeLookup(
+        service_client,
+        cache=TTLCache(
+            max_entries=config.OFFICE_CACHE_MAX_ENTRIES, ttl=config.OFFICE_CACHE_TTL
+        ) if config.OFFICE_CACHE_ENABLED else None
+    )
     
     # Registra rotas
-    register_routes(app, service_client, grpc_client, health_checker, limiter)
+    register_routes(app, service_client, grpc_client, health_checker, limiter, fan_out, process_lookup, office_lookup)
+
+    # Tabela rota → permissões exigidas (máscara), compilada uma vez
+    app.extensions["access_policy"] = AccessPolicy().compile(app)
     
     return app
 
-def register_routes(app, service_client, grpc_client, health_checker, limiter):
+def register_routes(app, service_client, grpc_client, health_checker, limiter, fan_out, process_lookup, office_lookup):
     """Registra todas as rotas da aplicação"""
+
+    def use_grpc(service_name: str) -> bool:
+        """Cliente pediu gRPC (X-Prefer-Protocol) e o canal do serviço está utilizável"""
+        return getattr(request, 'prefer_grpc', False) and grpc_client.is_available(service_name)
+
+    def http_only_query(*params: str) -> bool:
+        """Cliente usou paginação/ordenação ou `params` (suportados só no HTTP)"""
+        return any(name in request.args for name in (*LIST_QUERY_PARAMS, *params))
+
+    def grpc_list_response(service_name: str, method_name: str, filters=(), envelope=None):
+        """
+        Listagem pelo gRPC: os `filters` da rota vão na mensagem e a resposta
+        tem o mesmo formato da rota HTTP (lista, ou `{envelope: lista}`)
+        """
+        request_data = {name: request.args[name] for name in filters if request.args.get(name)}
+        response_data, status_code = grpc_client.call_service(service_name, method_name, request_data)
+        if status_code >= 400:
+            return jsonify(response_data), status_code
+        items = response_data.get("items") or []
+        return jsonify({envelope: items} if envelope else items), status_code
+
+    def conditional_list_response(service_name: str, path: str, filters=()):
+        """
+        Listagem com GET condicional: repassa If-None-Match ao serviço e,
+        em 304, responde sem corpo (nada é serializado no Gateway).
+
+        Com `Accept: application/x-ndjson` o corpo do serviço é repassado
+        em blocos, sem ser decodificado nem montado em memória.
+
+        `limit`, `cursor` e `sort` (e os `filters` da rota) são repassados
+        ao serviço; o cursor da próxima página volta em X-Next-Cursor.
+        """
+        params = {
+            name: request.args[name]
+            for name in (*filters, *LIST_QUERY_PARAMS) if request.args.get(name)
+        }
+        if request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+            chunks, status_code, upstream_headers = service_client.forward_stream(
+                service_name, path, params=params
+            )
+            response = app.response_class(
+                chunks, status=status_code, content_type=upstream_headers.get("Content-Type")
+            )
+        else:
+            response_data, status_code, upstream_headers = service_client.forward_conditional(
+                service_name, path, params=params
+            )
+            if status_code == 304:
+                response = app.response_class(status=304)
+            else:
+                response = jsonify(response_data)
+                response.status_code = status_code
+        response.vary.add("Accept")
+        etag = upstream_headers.get("ETag")
+        if etag:
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "private, no-cache"
+        next_cursor = upstream_headers.get(NEXT_CURSOR_HEADER)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return response
     
     # === Rotas de UI ===
     @app.route("/")
@@ -136,20 +231,30 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
                     "services": list(service_client.services.keys())
                 }), 200
 
-            health_info = health_checker.check_all_services()
+            # Snapshot em cache; ?refresh=1 força uma verificação síncrona
+            force_refresh = request.args.get('refresh', '0') in ('1', 'true', 'yes')
+            health_info = health_checker.get_snapshot(force_refresh=force_refresh)
             
             # Adiciona informações sobre gRPC se disponível
             try:
                 if grpc_client.is_available():
                     health_info["grpc"] = {
                         "status": "available",
-                        "services": list(grpc_client.channels.keys())
+                        "services": grpc_client.available_services()
                     }
                 else:
                     health_info["grpc"] = {"status": "unavailable"}
             except Exception:
                 health_info["grpc"] = {"status": "unavailable"}
             
+            # Estado dos circuit breakers e caches (sempre atual, fora do snapshot)
+            health_info["circuit_breakers"] = service_client.circuit_states()
+            health_info["caches"] = {
+                "processes": process_lookup.stats(),
+                "offices": office_lookup.stats(),
+                "jwt": TOKEN_CACHE.stats()
+            }
+            
             status_code = 200 if health_info["status"] == "healthy" else 503
             return jsonify(health_info), status_code
         except Exception as e:
@@ -170,9 +275,17 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             response_data, status_code = service_client.forward_request(
                 "auth", "POST", "/auth/register", json_body=request.validated_data
             )
+            # O cadastro cria ou atualiza o escritório: renova a entrada do cache
+            if status_code == 201 and isinstance(response_data, dict):
+                office = response_data.get("office")
+                office_id = (response_data.get("user") or {}).get("office_id")
+                if office_id:
+                    office_lookup.invalidate(office_id)
+                    if isinstance(office, dict):
+                        office_lookup.remember(office_id, office)
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     # Admin cria usuários do escritório
     @app.post("/api/users")
@@ -189,7 +302,7 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     @app.post("/api/auth/login")
     @limiter.limit(config.LOGIN_RATE_LIMIT)
     @validate_json(LoginSchema)
@@ -204,6 +317,9 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             auth_resp, auth_status = service_client.forward_request(
                 "auth", "POST", "/auth/login", json_body={"email": email, "password": password}
             )
+            if auth_status == 503:
+                # Fila de hash de senhas do Auth cheia: não é falha de credencial
+                return jsonify({"error": "Login temporarily unavailable"}), 503, {"Retry-After": "1"}
             if auth_status != 200:
                 log_security_event("LOGIN_FAILED", f"Failed login attempt for {email} from {request.remote_addr}")
                 return jsonify({"error": "Invalid credentials"}), 401
@@ -244,22 +360,21 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
     @require_auth
     def get_current_user():
         """Retorna informações do usuário atual"""
+        roles, permissions = decode_access(request.current_user.get('acl', 0))
         user_data = {
             "email": request.current_user.get('email'),
             "name": request.current_user.get('name'),
             "user_type": request.current_user.get('user_type'),
-            "roles": request.current_user.get('roles', []),
-            "permissions": request.current_user.get('permissions', []),
+            "roles": roles,
+            "permissions": permissions,
             "office_id": request.current_user.get('office_id')
         }
         
-        # Buscar nome do escritório
+        # Nome do escritório (cache do Gateway; o Auth só é chamado na falta)
         office_id = request.current_user.get('office_id')
         if office_id:
             try:
-                office_resp, office_status = service_client.forward_request(
-                    "auth", "GET", f"/offices/{office_id}"
-                )
+                office_resp, office_status = office_lookup.get(office_id)
                 if office_status == 200 and office_resp:
                     user_data['office'] = office_resp.get('name') or office_resp.get('office_name') or 'Escritório'
             except Exception as e:
@@ -278,17 +393,11 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
         """Lista todos os documentos"""
         try:
             # Verifica se deve usar gRPC
-            if getattr(request, 'prefer_grpc', False) and grpc_client.is_available('documents'):
-                response_data, status_code = grpc_client.call_service(
-                    "documents", "ListItems", {"limit": 100, "offset": 0}
-                )
-            else:
-                response_data, status_code = service_client.forward_request(
-                    "documents", "GET", "/documents"
-                )
-            return jsonify(response_data), status_code
+            if use_grpc('documents') and not http_only_query():
+                return grpc_list_response("documents", "ListDocuments", filters=("process_id",))
+            return conditional_list_response("documents", "/documents", filters=("process_id",))
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     @app.post("/api/documents")
     @require_auth
@@ -306,9 +415,7 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
 
             # Valida existência do processo no serviço de processos (busca por número)
             try:
-                proc_resp, proc_status = service_client.forward_request(
-                    "processes", "GET", f"/processes/by-number/{process_id}"
-                )
+                proc_resp, proc_status = process_lookup.by_number(process_id)
             except Exception:
                 return jsonify({"error": "Failed to validate process existence"}), 503
 
@@ -316,9 +423,9 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
                 return jsonify({"error": f"Process '{process_id}' not found. Please create the process first."}), 404
 
             # Verifica se deve usar gRPC
-            if getattr(request, 'prefer_grpc', False) and grpc_client.is_available('documents'):
+            if use_grpc('documents'):
                 response_data, status_code = grpc_client.call_service(
-                    "documents", "CreateItem", request.validated_data
+                    "documents", "CreateDocument", request.validated_data
                 )
             else:
                 response_data, status_code = service_client.forward_request(
@@ -326,8 +433,23 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
                 )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
+    @app.get("/api/documents/search")
+    @require_auth
+    @require_permission("read")
+    @limiter.limit("30 per minute")
+    def search_documents():
+        """Busca documentos por palavras do título e do conteúdo (mais relevantes primeiro)"""
+        try:
+            params = {name: request.args[name] for name in ("q", "limit") if request.args.get(name)}
+            response_data, status_code = service_client.forward_request(
+                "documents", "GET", "/documents/search", params=params
+            )
+            return jsonify(response_data), status_code
+        except GatewayException as e:
+            return jsonify({"error": e.message}), e.status_code, e.headers
+
     @app.get("/api/documents/<doc_id>")
     @require_auth
     @require_permission("read")
@@ -340,7 +462,7 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     @app.put("/api/documents/<doc_id>")
     @require_auth
@@ -355,7 +477,7 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     @app.delete("/api/documents/<doc_id>")
     @require_auth
@@ -369,27 +491,28 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     # === Rotas de Prazos ===
     @app.get("/api/deadlines")
     @require_auth
     @require_permission("read")
+    @protocol_selector()
     @limiter.limit("30 per minute")
     def list_deadlines():
         """Lista todos os prazos"""
         try:
-            response_data, status_code = service_client.forward_request(
-                "deadlines", "GET", "/deadlines"
-            )
-            return jsonify(response_data), status_code
+            if use_grpc('deadlines') and not http_only_query("from", "to"):
+                return grpc_list_response("deadlines", "ListDeadlines")
+            return conditional_list_response("deadlines", "/deadlines", filters=("from", "to"))
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     @app.post("/api/deadlines")
     @require_auth
     @require_permission("write")
     @validate_json(DeadlineSchema)
+    @protocol_selector()
     @limiter.limit("10 per minute")
     def create_deadline():
         """Cria um novo prazo"""
@@ -401,21 +524,24 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
 
             # Valida existência do processo (busca por número)
             try:
-                proc_resp, proc_status = service_client.forward_request(
-                    "processes", "GET", f"/processes/by-number/{process_id}"
-                )
+                proc_resp, proc_status = process_lookup.by_number(process_id)
             except Exception:
                 return jsonify({"error": "Failed to validate process existence"}), 503
 
             if proc_status != 200:
                 return jsonify({"error": f"Process '{process_id}' not found. Please create the process first."}), 404
 
-            response_data, status_code = service_client.forward_request(
-                "deadlines", "POST", "/deadlines", json_body=request.validated_data
-            )
+            if use_grpc('deadlines'):
+                response_data, status_code = grpc_client.call_service(
+                    "deadlines", "CreateDeadline", request.validated_data
+                )
+            else:
+                response_data, status_code = service_client.forward_request(
+                    "deadlines", "POST", "/deadlines", json_body=request.validated_data
+                )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     @app.get("/api/deadlines/today")
     @require_auth
@@ -429,7 +555,7 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     @app.delete("/api/deadlines/<deadline_id>")
     @require_auth
@@ -443,22 +569,22 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     # === Rotas de Audiências ===
     @app.get("/api/hearings")
     @require_auth
     @require_permission("read")
+    @protocol_selector()
     @limiter.limit("30 per minute")
     def list_hearings():
         """Lista audiências com filtros opcionais"""
         try:
-            response_data, status_code = service_client.forward_request(
-                "hearings", "GET", "/hearings", params=request.args
-            )
-            return jsonify(response_data), status_code
+            if use_grpc('hearings') and not http_only_query("from", "to"):
+                return grpc_list_response("hearings", "ListHearings", filters=("date", "process_id"), envelope="items")
+            return conditional_list_response("hearings", "/hearings", filters=("date", "process_id", "from", "to"))
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
 
     # === Rotas de Processos ===
     @app.get("/api/processes")
@@ -467,12 +593,9 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
     @limiter.limit("30 per minute")
     def list_processes():
         try:
-            response_data, status_code = service_client.forward_request(
-                "processes", "GET", "/processes"
-            )
-            return jsonify(response_data), status_code
+            return conditional_list_response("processes", "/processes")
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
 
     @app.post("/api/processes")
     @require_auth
@@ -484,9 +607,12 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             response_data, status_code = service_client.forward_request(
                 "processes", "POST", "/processes", json_body=request.validated_data
             )
+            if status_code == 201 and isinstance(response_data, dict):
+                process_lookup.invalidate(number=response_data.get("number"))
+                process_lookup.remember(response_data)
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
 
     @app.get("/api/processes/<proc_id>")
     @require_auth
@@ -499,7 +625,7 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
 
     @app.put("/api/processes/<proc_id>")
     @require_auth
@@ -511,9 +637,14 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             response_data, status_code = service_client.forward_request(
                 "processes", "PUT", f"/processes/{proc_id}", json_body=request.validated_data
             )
+            if status_code == 200:
+                process_lookup.invalidate(proc_id=proc_id)
+                if isinstance(response_data, dict):
+                    process_lookup.invalidate(number=response_data.get("number"))
+                    process_lookup.remember(response_data)
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
 
     @app.delete("/api/processes/<proc_id>")
     @require_auth
@@ -524,9 +655,11 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             response_data, status_code = service_client.forward_request(
                 "processes", "DELETE", f"/processes/{proc_id}"
             )
+            if status_code == 200:
+                process_lookup.invalidate(proc_id=proc_id)
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     @app.get("/api/hearings/today")
     @require_auth
@@ -540,12 +673,13 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     @app.post("/api/hearings")
     @require_auth
     @require_permission("write")
     @validate_json(HearingSchema)
+    @protocol_selector()
     @limiter.limit("10 per minute")
     def create_hearing():
         """Cria uma nova audiência"""
@@ -559,25 +693,26 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             try:
                 proc_status = None
                 if isinstance(process_id, str) and process_id.strip().upper().startswith('PROC-'):
-                    _, proc_status = service_client.forward_request(
-                        "processes", "GET", f"/processes/by-number/{process_id.strip().upper()}"
-                    )
+                    _, proc_status = process_lookup.by_number(process_id.strip().upper())
                 else:
-                    _, proc_status = service_client.forward_request(
-                        "processes", "GET", f"/processes/{process_id}"
-                    )
+                    _, proc_status = process_lookup.by_id(process_id)
             except Exception:
                 return jsonify({"error": "Failed to validate process existence"}), 503
 
             if proc_status != 200:
                 return jsonify({"error": f"Process '{process_id}' not found. Please create the process first."}), 404
 
-            response_data, status_code = service_client.forward_request(
-                "hearings", "POST", "/hearings", json_body=request.validated_data
-            )
+            if use_grpc('hearings'):
+                response_data, status_code = grpc_client.call_service(
+                    "hearings", "CreateHearing", request.validated_data
+                )
+            else:
+                response_data, status_code = service_client.forward_request(
+                    "hearings", "POST", "/hearings", json_body=request.validated_data
+                )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     @app.delete("/api/hearings/<hearing_id>")
     @require_auth
@@ -591,7 +726,7 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
             )
             return jsonify(response_data), status_code
         except GatewayException as e:
-            return jsonify({"error": e.message}), e.status_code
+            return jsonify({"error": e.message}), e.status_code, e.headers
     
     # === Rotas de Orquestração ===
     @app.get("/api/process/<proc_id>/summary")
@@ -601,44 +736,33 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
     def process_summary(proc_id):
         """Obtém resumo de um processo (orquestração)"""
         try:
-            # Busca dados em paralelo de todos os serviços
+            # Busca dados em paralelo de todos os serviços, cada ramo com seu orçamento de tempo
+            branches = fan_out.run({
+                name: {"service_name": name, "method": "GET", "path": f"/{name}", "params": {"process_id": proc_id}}
+                for name in ("documents", "deadlines", "hearings")
+            })
+
             results = {}
-            
-            # Documentos do processo
-            try:
-                docs_data, docs_status = service_client.forward_request(
-                    "documents", "GET", "/documents", params={"process_id": proc_id}
-                )
-                results["documents"] = docs_data if docs_status == 200 else []
-            except:
-                results["documents"] = []
-            
-            # Prazos do processo
-            try:
-                deadlines_data, deadlines_status = service_client.forward_request(
-                    "deadlines", "GET", "/deadlines", params={"process_id": proc_id}
-                )
-                results["deadlines"] = deadlines_data if deadlines_status == 200 else []
-            except:
-                results["deadlines"] = []
-            
-            # Audiências do processo
-            try:
-                hearings_data, hearings_status = service_client.forward_request(
-                    "hearings", "GET", "/hearings", params={"process_id": proc_id}
-                )
-                results["hearings"] = hearings_data if hearings_status == 200 else []
-            except:
-                results["hearings"] = []
-            
+            timings = {}
+            for name, branch in branches.items():
+                results[name] = branch["data"] if branch["status"] == "ok" else []
+                timings[name] = {
+                    "status": branch["status"],
+                    "status_code": branch["status_code"],
+                    "elapsed_ms": branch["elapsed_ms"]
+                }
+
             return jsonify({
                 "process_id": proc_id,
-                "summary": results
+                "summary": results,
+                "partial": any(b["status"] != "ok" for b in branches.values()),
+                "branches": timings
             }), 200
-            
+
         except Exception as e:
             log_security_event("ORCHESTRATION_ERROR", f"Process summary error: {str(e)}")
             return jsonify({"error": "Failed to get process summary"}), 500
+
     
     @app.post("/api/orchestrate/file-case")
     @require_auth
@@ -699,11 +823,13 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
                         "processes", "POST", "/processes", json_body=body
                     )
                     if proc_status == 201 and isinstance(proc_data, dict):
+                        process_lookup.invalidate(number=proc_data.get('number'))
+                        process_lookup.remember(proc_data)
                         used_process_number = proc_data.get('number') or desired_number
                         results['process'] = {"status": proc_status, "data": proc_data}
                         break
                     if proc_status == 409:
-                        # Número global já existe (talvez em outro escritório) → incrementa e tenta de novo
+                        # Número já existe (números são únicos entre todos os escritórios) → incrementa e tenta de novo
                         desired_number = next_from(desired_number)
                         attempts += 1
                         continue
@@ -727,13 +853,13 @@ def register_routes(app, service_client, grpc_client, health_checker, limiter):
                     # Se parece um número (PROC-xxx), valida via by-number
                     if isinstance(pid, str) and pid.strip().upper().startswith('PROC-'):
                         number = pid.strip().upper()
-                        pr, ps = service_client.forward_request("processes", "GET", f"/processes/by-number/{number}")
+                        pr, ps = process_lookup.by_number(number)
                         if ps != 200:
                             return None, ({"error": f"Process '{number}' not found"}, 404)
                         used_process_number = number
                         return number, (None, None)
                     # Caso contrário, tenta tratar como ID interno e obter o número
-                    pr, ps = service_client.forward_request("processes", "GET", f"/processes/{pid}")
+                    pr, ps = process_lookup.by_id(pid)
                     if ps != 200 or not isinstance(pr, dict) or not pr.get('number'):
                         return None, ({"error": "Associated process not found"}, 404)
                     used_process_number = pr.get('number')
@@ -0,0 +1,165 @@
+"""
+Circuit breaker e bulkhead por microserviço
+
+O breaker observa as últimas chamadas de cada serviço (janela deslizante)
+e abre quando a taxa de erros ou de chamadas lentas passa do limite.
+Aberto, falha rápido até `open_seconds`; depois permite algumas chamadas
+de teste (half-open) antes de fechar de novo. O bulkhead limita quantas
+chamadas simultâneas cada serviço pode ocupar no Gateway.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Any
+
+from exceptions import ServiceUnavailableError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Circuit breaker (closed, open, half-open) guiado por taxa de erro e latência"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_threshold: float = 2.0,
+        slow_call_rate_threshold: float = 0.8,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 15.0,
+        half_open_max_calls: int = 2
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._window = deque(maxlen=window_size)  # (falhou, lenta)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._trial_calls = 0
+            self._trial_successes = 0
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._window.clear()
+
+    def retry_after(self) -> int:
+        """Segundos até o breaker aceitar chamadas de teste"""
+        with self._lock:
+            remaining = self.open_seconds - (time.monotonic() - self._opened_at)
+        return max(int(math.ceil(remaining)), 1)
+
+    def allow(self) -> bool:
+        """Indica se uma chamada pode seguir; em half-open reserva uma chamada de teste"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                return True
+            return False
+
+    def record(self, duration: float, failed: bool) -> None:
+        """Registra o resultado de uma chamada"""
+        slow = duration >= self.slow_call_threshold
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if failed or slow:
+                    self._open()
+                    return
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_max_calls:
+                    self._state = CLOSED
+                    self._window.clear()
+                return
+            if self._state == OPEN:
+                return
+
+            self._window.append((failed, slow))
+            calls = len(self._window)
+            if calls < self.min_calls:
+                return
+            failure_rate = sum(1 for f, _ in self._window if f) / calls
+            slow_rate = sum(1 for _, s in self._window if s) / calls
+            if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+                self._open()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado atual (exposto no /health)"""
+        with self._lock:
+            self._maybe_half_open()
+            calls = len(self._window)
+            info = {
+                "state": self._state,
+                "calls": calls,
+                "failure_rate": round(sum(1 for f, _ in self._window if f) / calls, 3) if calls else 0.0,
+                "slow_call_rate": round(sum(1 for _, s in self._window if s) / calls, 3) if calls else 0.0
+            }
+            if self._state == OPEN:
+                info["retry_after"] = max(int(math.ceil(self.open_seconds - (time.monotonic() - self._opened_at))), 1)
+            return info
+
+class UpstreamGuard:
+    """Combina circuit breaker e bulkhead (máximo de chamadas em andamento) de um serviço"""
+
+    def __init__(self, breaker: CircuitBreaker, max_in_flight: int = 32):
+        self.breaker = breaker
+        self.max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Reserva uma vaga para a chamada
+
+        Raises:
+            ServiceUnavailableError: circuito aberto ou bulkhead cheio (com Retry-After)
+        """
+        name = self.breaker.name
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                raise ServiceUnavailableError(
+                    name, {"reason": "Too many concurrent requests", "max_in_flight": self.max_in_flight},
+                    retry_after=1
+                )
+            if not self.breaker.allow():
+                retry_after = self.breaker.retry_after()
+                raise ServiceUnavailableError(
+                    name, {"reason": "Circuit breaker open", "retry_after": retry_after},
+                    retry_after=retry_after
+                )
+            self._in_flight += 1
+
+    def release(self, duration: float, failed: bool) -> None:
+        """Libera a vaga e registra o resultado no breaker"""
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+        self.breaker.record(duration, failed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+        return {**self.breaker.snapshot(), "in_flight": in_flight, "max_in_flight": self.max_in_flight}
@@ -37,7 +37,49 @@ class Config:
     
     # Timeouts e limites
     REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "5"))
-    
+
+    # Pool de conexões keep-alive para os microserviços
+    UPSTREAM_POOL_ENABLED = os.getenv("UPSTREAM_POOL_ENABLED", "true").lower() == "true"
+    UPSTREAM_POOL_CONNECTIONS = int(os.getenv("UPSTREAM_POOL_CONNECTIONS", "10"))
+    UPSTREAM_POOL_MAXSIZE = int(os.getenv("UPSTREAM_POOL_MAXSIZE", "20"))
+    UPSTREAM_POOL_BLOCK = os.getenv("UPSTREAM_POOL_BLOCK", "false").lower() == "true"
+    UPSTREAM_POOL_IDLE_TIMEOUT = float(os.getenv("UPSTREAM_POOL_IDLE_TIMEOUT", "60"))
+
+    # Circuit breaker e bulkhead por serviço
+    CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+    CIRCUIT_FAILURE_RATE_THRESHOLD = float(os.getenv("CIRCUIT_FAILURE_RATE_THRESHOLD", "0.5"))
+    CIRCUIT_SLOW_CALL_THRESHOLD = float(os.getenv("CIRCUIT_SLOW_CALL_THRESHOLD", "2"))
+    CIRCUIT_SLOW_CALL_RATE_THRESHOLD = float(os.getenv("CIRCUIT_SLOW_CALL_RATE_THRESHOLD", "0.8"))
+    CIRCUIT_WINDOW_SIZE = int(os.getenv("CIRCUIT_WINDOW_SIZE", "20"))
+    CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "10"))
+    CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "15"))
+    CIRCUIT_HALF_OPEN_MAX_CALLS = int(os.getenv("CIRCUIT_HALF_OPEN_MAX_CALLS", "2"))
+    UPSTREAM_MAX_IN_FLIGHT = int(os.getenv("UPSTREAM_MAX_IN_FLIGHT", "32"))
+
+    # Cache de validação de processos (por escritório)
+    PROCESS_CACHE_ENABLED = os.getenv("PROCESS_CACHE_ENABLED", "true").lower() == "true"
+    PROCESS_CACHE_TTL = float(os.getenv("PROCESS_CACHE_TTL", "60"))
+    PROCESS_CACHE_MAX_ENTRIES = int(os.getenv("PROCESS_CACHE_MAX_ENTRIES", "10000"))
+    PROCESS_CACHE_NEGATIVE = os.getenv("PROCESS_CACHE_NEGATIVE", "false").lower() == "true"
+    PROCESS_CACHE_NEGATIVE_TTL = float(os.getenv("PROCESS_CACHE_NEGATIVE_TTL", "5"))
+
+    # Cache dos dados de escritórios (usado pelo /api/auth/me)
+    OFFICE_CACHE_ENABLED = os.getenv("OFFICE_CACHE_ENABLED", "true").lower() == "true"
+    OFFICE_CACHE_TTL = float(os.getenv("OFFICE_CACHE_TTL", "300"))
+    OFFICE_CACHE_MAX_ENTRIES = int(os.getenv("OFFICE_CACHE_MAX_ENTRIES", "10000"))
+
+    # Health check em background
+    HEALTH_REFRESH_ENABLED = os.getenv("HEALTH_REFRESH_ENABLED", "true").lower() == "true"
+    HEALTH_REFRESH_INTERVAL = float(os.getenv("HEALTH_REFRESH_INTERVAL", "10"))
+    HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+
+    # Listagens em NDJSON: tamanho dos blocos repassados do serviço ao cliente
+    STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "65536"))
+
+    # Orquestração (fan-out concorrente)
+    ORCHESTRATION_MAX_WORKERS = int(os.getenv("ORCHESTRATION_MAX_WORKERS", "16"))
+    ORCHESTRATION_BRANCH_TIMEOUT = float(os.getenv("ORCHESTRATION_BRANCH_TIMEOUT", "2"))
+
     # CORS
     ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', 'http://localhost:3000,http://127.0.0.1:8000').split(',')
     
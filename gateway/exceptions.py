@@ -9,6 +9,7 @@ class GatewayException(Exception):
         self.message = message
         self.status_code = status_code
         self.details = details or {}
+        self.headers = {}
 
 class AuthenticationError(GatewayException):
     """Erro de autenticação"""
@@ -27,9 +28,11 @@ class ValidationError(GatewayException):
 
 class ServiceUnavailableError(GatewayException):
     """Erro de serviço indisponível"""
-    def __init__(self, service_name: str, details: dict = None):
+    def __init__(self, service_name: str, details: dict = None, retry_after: int = None):
         message = f"{service_name} service is unavailable"
-        super().__init__(message, 502, details)
+        super().__init__(message, 502 if retry_after is None else 503, details)
+        if retry_after is not None:
+            self.headers["Retry-After"] = str(retry_after)
 
 class ServiceTimeoutError(GatewayException):
     """Erro de timeout do serviço"""
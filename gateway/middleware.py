@@ -2,12 +2,11 @@
 Middleware e decoradores para o API Gateway
 """
 
-from functools import wraps
 from flask import request, jsonify, current_app
 import logging
 
 from exceptions import GatewayException
-from security import log_security_event
+from security import log_security_event, guarded_view
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +26,7 @@ def error_handler(app):
         if error.details:
             response["details"] = error.details
         
-        return jsonify(response), error.status_code
+        return jsonify(response), error.status_code, error.headers
     
     @app.errorhandler(429)
     def handle_rate_limit(error):
@@ -141,21 +140,20 @@ def grpc_middleware(app):
 
 def protocol_selector():
     """Decorator para selecionar automaticamente o protocolo (HTTP/gRPC)"""
+    def select_protocol():
+        # Verifica se deve usar gRPC
+        should_use_grpc = getattr(request, 'prefer_grpc', False)
+        
+        if should_use_grpc:
+            logger.info(f"gRPC preferido para {request.path}")
+        else:
+            logger.debug(f"Usando HTTP para {request.path}")
+        # Só vira True quando a chamada gRPC acontece (sem canal, a rota usa HTTP)
+        request.used_grpc = False
+        return None
+
     def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            # Verifica se deve usar gRPC
-            should_use_grpc = getattr(request, 'prefer_grpc', False)
-            
-            if should_use_grpc:
-                logger.info(f"Usando gRPC para {request.path}")
-                request.used_grpc = True
-            else:
-                logger.debug(f"Usando HTTP para {request.path}")
-                request.used_grpc = False
-            
-            return f(*args, **kwargs)
-        return decorated_function
+        return guarded_view(f, select_protocol)
     return decorator
 
 def setup_middleware(app):
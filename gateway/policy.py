@@ -0,0 +1,95 @@
+"""
+Política de acesso do API Gateway (RBAC compilado)
+
+Permissões e papéis viram bits de um único inteiro: o token carrega o
+claim `acl` no lugar das listas `roles` e `permissions`, e a máscara exigida
+por cada rota é calculada uma vez, na subida do app. A checagem por
+requisição é um único AND.
+
+`require_permission`/`require_role` (em `security.py`) só marcam a view;
+quem aplica a política é o `require_auth`.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# A ordem define os bits: só acrescentar no fim (tokens emitidos dependem dela)
+PERMISSIONS = ("read", "write", "delete", "orchestrate", "create_user")
+ROLES = ("user", "admin", "advogado", "lawyer", "estagiario")
+ROLE_SHIFT = 16
+
+PERMISSION_BITS = {name: 1 << i for i, name in enumerate(PERMISSIONS)}
+ROLE_BITS = {name: 1 << (ROLE_SHIFT + i) for i, name in enumerate(ROLES)}
+PERMISSION_MASK = (1 << ROLE_SHIFT) - 1
+
+
+def permission_bit(name: str) -> int:
+    try:
+        return PERMISSION_BITS[name]
+    except KeyError:
+        raise ValueError(f"Permissão desconhecida: {name}") from None
+
+
+def role_bit(name: str) -> int:
+    try:
+        return ROLE_BITS[name]
+    except KeyError:
+        raise ValueError(f"Papel desconhecido: {name}") from None
+
+
+def encode_access(roles: Iterable[str], permissions: Iterable[str]) -> int:
+    """Máscara do claim `acl`; nomes fora da tabela não concedem nada"""
+    mask = 0
+    for name in roles or ():
+        mask |= ROLE_BITS.get(name, 0)
+    for name in permissions or ():
+        mask |= PERMISSION_BITS.get(name, 0)
+    return mask
+
+
+def decode_access(mask: int) -> Tuple[List[str], List[str]]:
+    """Listas (roles, permissions) de uma máscara"""
+    roles = [name for name, bit in ROLE_BITS.items() if mask & bit]
+    permissions = [name for name, bit in PERMISSION_BITS.items() if mask & bit]
+    return roles, permissions
+
+
+def require_access(view, mask: int):
+    """Acrescenta `mask` ao acesso exigido pela view (propagado pelos `wraps`)"""
+    view.required_access = getattr(view, "required_access", 0) | mask
+    return view
+
+
+def denied_message(missing: int) -> str:
+    """Mensagem do 403 para a primeira permissão (ou papel) que falta"""
+    roles, permissions = decode_access(missing)
+    if permissions:
+        return f'Permission "{permissions[0]}" required'
+    return f'Role "{roles[0]}" required'
+
+
+class AccessPolicy:
+    """Tabela endpoint → máscara exigida, compilada a partir das views do app"""
+
+    def __init__(self):
+        self.table: Dict[str, int] = {}
+
+    def compile(self, app) -> "AccessPolicy":
+        table = {}
+        for endpoint, view in app.view_functions.items():
+            required = getattr(view, "required_access", 0)
+            if required and not getattr(view, "requires_auth", False):
+                # Sem require_auth a marcação nunca seria checada: falha na subida
+                raise ValueError(f"Rota '{endpoint}' exige permissão mas não usa require_auth")
+            table[endpoint] = required
+        self.table = table
+        return self
+
+    def missing(self, app, endpoint: Optional[str], acl: int) -> int:
+        """Bits exigidos pelo endpoint que `acl` não tem (0: acesso liberado)"""
+        required = self.table.get(endpoint)
+        if required is None:
+            if endpoint not in app.view_functions:
+                return 0
+            # Rota registrada depois da compilação
+            required = self.compile(app).table[endpoint]
+        return required & ~acl
@@ -12,13 +12,34 @@ from flask import request, jsonify, current_app
 from marshmallow import Schema, fields, ValidationError
 import hashlib
 import secrets
+import sys
+import time
 from typing import Dict, List, Optional
 
+from cache import TTLCache
+from policy import AccessPolicy, encode_access, permission_bit, role_bit, require_access, denied_message
+
+# Hash de senhas compartilhado com o serviço de Autenticação (pacote `common`
+# na raiz do repositório). Adicionado ao final do sys.path para não encobrir
+# os módulos do Gateway.
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _BASE_DIR not in sys.path:
+    sys.path.append(_BASE_DIR)
+from common.passwords import PasswordHasher, hash_password, verify_password  # noqa: E402,F401
+
 # Configurações de segurança
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = int(os.getenv("JWT_EXPIRATION_HOURS", "24"))
 
+# Cache de tokens já verificados (chave: digest do token; expira junto com o token)
+JWT_CACHE_ENABLED = os.getenv("JWT_CACHE_ENABLED", "true").lower() == "true"
+JWT_CACHE_MAX_ENTRIES = int(os.getenv("JWT_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE = TTLCache(max_entries=JWT_CACHE_MAX_ENTRIES)
+
+# Derivações scrypt fora das threads das requisições (mesmos PASSWORD_* do serviço Auth)
+PASSWORD_HASHER = PasswordHasher()
+
 # Usuários de exemplo (em produção, usar banco de dados)
 USERS_DB = {
     "admin": {
@@ -92,22 +113,14 @@ class ProcessSchema(Schema):
     description = fields.Str(missing="")
     status = fields.Str(missing="open")
 
-def hash_password(password: str) -> str:
-    """Gera hash da senha usando SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def verify_password(password: str, password_hash: str) -> bool:
-    """Verifica se a senha corresponde ao hash"""
-    return hash_password(password) == password_hash
-
 def generate_token(email: str, roles: List[str], permissions: List[str], office_id: Optional[str] = None, name: Optional[str] = None, user_type: Optional[str] = None) -> str:
     """Gera token JWT usando email"""
     payload = {
         'email': email,
         'name': name,
         'user_type': user_type,
-        'roles': roles,
-        'permissions': permissions,
+        # Papéis e permissões como máscara de bits (ver policy.py)
+        'acl': encode_access(roles, permissions),
         'office_id': office_id,
         'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=JWT_EXPIRATION_HOURS),
         'iat': datetime.datetime.utcnow(),
@@ -116,100 +129,120 @@ def generate_token(email: str, roles: List[str], permissions: List[str], office_
     return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 def decode_token(token: str) -> Optional[Dict]:
-    """Decodifica e valida token JWT"""
+    """
+    Decodifica e valida token JWT
+
+    Tokens válidos ficam em cache até o `exp`: requisições seguintes com o
+    mesmo token não refazem a verificação da assinatura. Tokens inválidos
+    não entram no cache.
+    """
+    key = hashlib.sha256(token.encode()).digest() if JWT_CACHE_ENABLED else None
+    if key is not None:
+        payload = TOKEN_CACHE.get(key, None)
+        if payload is not None:
+            # Cópia: a requisição não altera a entrada compartilhada
+            return dict(payload)
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    if "acl" not in payload:
+        # Token emitido antes da máscara: converte as listas uma vez
+        payload["acl"] = encode_access(payload.pop("roles", ()), payload.pop("permissions", ()))
+    if key is not None and isinstance(payload.get("exp"), (int, float)):
+        ttl = payload["exp"] - time.time()
+        if ttl > 0:
+            TOKEN_CACHE.set(key, dict(payload), ttl=ttl)
+    return payload
 
 def authenticate_user(username: str, password: str) -> Optional[Dict]:
     """Autentica usuário"""
     user = USERS_DB.get(username)
-    if user and verify_password(password, user['password_hash']):
+    if user and PASSWORD_HASHER.verify(password, user['password_hash']):
         return user
     return None
 
-def require_auth(f):
-    """Decorator para exigir autenticação"""
+def guarded_view(f, check):
+    """
+    Envolve uma view executando `check` antes dela
+
+    `check` retorna uma resposta de erro (interrompe) ou None (segue).
+    """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        token = None
-        auth_header = request.headers.get('Authorization')
-        
-        if auth_header:
-            try:
-                token = auth_header.split(' ')[1]  # Bearer <token>
-            except IndexError:
-                return jsonify({'error': 'Invalid authorization header format'}), 401
-        
-        if not token:
-            return jsonify({'error': 'Token is missing'}), 401
-        
-        payload = decode_token(token)
-        if payload is None:
-            return jsonify({'error': 'Token is invalid or expired'}), 401
-        
-        # Adiciona informações do usuário ao contexto da requisição
-        request.current_user = payload
+        error = check()
+        if error is not None:
+            return error
         return f(*args, **kwargs)
-    
     return decorated_function
 
+def _check_auth():
+    token = None
+    auth_header = request.headers.get('Authorization')
+    
+    if auth_header:
+        try:
+            token = auth_header.split(' ')[1]  # Bearer <token>
+        except IndexError:
+            return jsonify({'error': 'Invalid authorization header format'}), 401
+    
+    if not token:
+        return jsonify({'error': 'Token is missing'}), 401
+    
+    payload = decode_token(token)
+    if payload is None:
+        return jsonify({'error': 'Token is invalid or expired'}), 401
+    
+    # Adiciona informações do usuário ao contexto da requisição
+    request.current_user = payload
+
+    # Permissões e papéis exigidos pela rota: um AND com a máscara do token
+    app = current_app._get_current_object()
+    policy = app.extensions.get("access_policy")
+    if policy is None:
+        policy = app.extensions["access_policy"] = AccessPolicy().compile(app)
+    missing = policy.missing(app, request.endpoint, payload.get("acl", 0))
+    if missing:
+        return jsonify({'error': denied_message(missing)}), 403
+    return None
+
+def require_auth(f):
+    """Decorator para exigir autenticação (e o acesso marcado na view)"""
+    view = guarded_view(f, _check_auth)
+    view.requires_auth = True
+    return view
+
 def require_permission(permission: str):
-    """Decorator para exigir permissão específica"""
-    def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            if not hasattr(request, 'current_user'):
-                return jsonify({'error': 'Authentication required'}), 401
-            
-            user_permissions = request.current_user.get('permissions', [])
-            if permission not in user_permissions:
-                return jsonify({'error': f'Permission "{permission}" required'}), 403
-            
-            return f(*args, **kwargs)
-        return decorated_function
-    return decorator
+    """Decorator para exigir permissão específica (checada pelo require_auth)"""
+    bit = permission_bit(permission)
+    return lambda f: require_access(f, bit)
 
 def require_role(role: str):
-    """Decorator para exigir role específico"""
-    def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            if not hasattr(request, 'current_user'):
-                return jsonify({'error': 'Authentication required'}), 401
-            
-            user_roles = request.current_user.get('roles', [])
-            if role not in user_roles:
-                return jsonify({'error': f'Role "{role}" required'}), 403
-            
-            return f(*args, **kwargs)
-        return decorated_function
-    return decorator
+    """Decorator para exigir role específico (checado pelo require_auth)"""
+    bit = role_bit(role)
+    return lambda f: require_access(f, bit)
 
 def validate_json(schema_class):
     """Decorator para validação de JSON usando Marshmallow"""
+    def check():
+        try:
+            schema = schema_class()
+            json_data = request.get_json(force=True)
+            if not json_data:
+                return jsonify({'error': 'JSON payload required'}), 400
+            
+            # Valida e deserializa os dados
+            request.validated_data = schema.load(json_data)
+            return None
+        except ValidationError as err:
+            return jsonify({'error': 'Validation failed', 'details': err.messages}), 400
+        except Exception:
+            return jsonify({'error': 'Invalid JSON payload'}), 400
+
     def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            try:
-                schema = schema_class()
-                json_data = request.get_json(force=True)
-                if not json_data:
-                    return jsonify({'error': 'JSON payload required'}), 400
-                
-                # Valida e deserializa os dados
-                validated_data = schema.load(json_data)
-                request.validated_data = validated_data
-                return f(*args, **kwargs)
-            except ValidationError as err:
-                return jsonify({'error': 'Validation failed', 'details': err.messages}), 400
-            except Exception as e:
-                return jsonify({'error': 'Invalid JSON payload'}), 400
-        return decorated_function
+        return guarded_view(f, check)
     return decorator
 
 def sanitize_input(data):
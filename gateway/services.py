@@ -2,20 +2,38 @@
 Serviços e utilitários para comunicação com microserviços
 """
 
+import os
+import sys
 import requests
 import uuid
+import time
+import threading
+from datetime import datetime, timezone
+from http.cookiejar import DefaultCookiePolicy
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, Tuple
-from flask import request, jsonify
+from flask import request, jsonify, has_request_context, copy_current_request_context
 import logging
 
 from config import get_config
 from exceptions import ServiceUnavailableError, ServiceTimeoutError
 from security import sanitize_input, log_security_event
+from circuit_breaker import CircuitBreaker, UpstreamGuard
+from cache import TTLCache, MISSING
 
 # Imports gRPC (opcionais)
 try:
     import grpc
-    from google.protobuf.json_format import MessageToDict, ParseDict
+    # Stubs gerados no pacote `protos` (raiz do repositório). Adicionado ao
+    # final do sys.path para não encobrir os módulos do Gateway.
+    _BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _BASE_DIR not in sys.path:
+        sys.path.append(_BASE_DIR)
+    from protos import (
+        documents_pb2, documents_pb2_grpc, deadlines_pb2, deadlines_pb2_grpc,
+        hearings_pb2, hearings_pb2_grpc, message_from_dict, message_to_dict
+    )
     GRPC_AVAILABLE = True
 except ImportError:
     GRPC_AVAILABLE = False
@@ -24,13 +42,231 @@ except ImportError:
 logger = logging.getLogger(__name__)
 config = get_config()
 
+NDJSON_MIMETYPE = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+LIST_QUERY_PARAMS = ("limit", "cursor", "sort")
+
+
+def _call_on_close(response: requests.Response, callback) -> None:
+    """Executa `callback` uma única vez, quando a resposta (lida em streaming) for fechada"""
+    close = response.close
+    called = []
+
+    def close_and_call() -> None:
+        try:
+            close()
+        finally:
+            if not called:
+                called.append(True)
+                callback()
+
+    response.close = close_and_call
+
+
+class UpstreamBody:
+    """
+    Corpo de uma resposta do upstream repassado em blocos
+
+    Iterável com `close()`: o servidor WSGI o fecha ao fim da resposta,
+    inclusive quando o cliente desconecta ou o corpo nem chega a ser
+    enviado (304, HEAD). Fechar libera a conexão, a sessão do pool e a vaga
+    do bulkhead, reservadas até aqui.
+    """
+
+    def __init__(self, response: requests.Response, chunk_size: int):
+        self._response = response
+        self._chunks = response.iter_content(chunk_size=chunk_size)
+
+    def __iter__(self) -> "UpstreamBody":
+        return self
+
+    def __next__(self) -> bytes:
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class UpstreamSessionPool:
+    """
+    Sessões HTTP keep-alive por microserviço
+
+    Cada serviço recebe um `requests.Session` com pool de conexões próprio.
+    O pool do urllib3 é thread-safe; cookies são desabilitados para que a
+    sessão não carregue estado entre requisições de usuários diferentes.
+    Sessões ociosas além de `idle_timeout` são descartadas e recriadas,
+    evitando reutilizar sockets já fechados pelo servidor: a do serviço na
+    própria retirada e as dos demais numa varredura (`evict_idle`) feita na
+    retirada, no máximo uma vez a cada `idle_timeout`. Uma resposta em
+    streaming mantém a sessão em uso até ser fechada.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        pool_block: bool = False,
+        idle_timeout: float = 60.0
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.idle_timeout = idle_timeout
+        self._sessions: Dict[str, requests.Session] = {}
+        self._last_used: Dict[str, float] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._last_sweep = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """Cria sessão com adapter configurado para o pool"""
+        session = requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _acquire(self, service_name: str) -> requests.Session:
+        """Obtém a sessão do serviço, recriando-a se estiver ociosa há muito tempo"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep >= self.idle_timeout:
+                self._last_sweep = now
+                self._evict_idle_locked(now)
+            session = self._sessions.get(service_name)
+            idle = now - self._last_used.get(service_name, now)
+            if session is not None and idle > self.idle_timeout and not self._in_flight.get(service_name):
+                logger.debug(f"Sessão ociosa descartada para {service_name} ({idle:.1f}s)")
+                session.close()
+                session = None
+            if session is None:
+                session = self._create_session()
+                self._sessions[service_name] = session
+            self._last_used[service_name] = now
+            self._in_flight[service_name] = self._in_flight.get(service_name, 0) + 1
+            return session
+
+    def _release(self, service_name: str) -> None:
+        with self._lock:
+            self._in_flight[service_name] = max(self._in_flight.get(service_name, 1) - 1, 0)
+            self._last_used[service_name] = time.monotonic()
+
+    def request(self, service_name: str, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Executa requisição reutilizando a sessão do serviço
+
+        Com `stream=True` a sessão só é devolvida quando a resposta é fechada.
+        """
+        session = self._acquire(service_name)
+        try:
+            response = session.request(method=method, url=url, **kwargs)
+        except BaseException:
+            self._release(service_name)
+            raise
+        if kwargs.get("stream"):
+            _call_on_close(response, lambda: self._release(service_name))
+        else:
+            self._release(service_name)
+        return response
+
+    def _evict_idle_locked(self, now: float) -> int:
+        evicted = 0
+        for service_name in list(self._sessions.keys()):
+            idle = now - self._last_used.get(service_name, now)
+            if idle > self.idle_timeout and not self._in_flight.get(service_name):
+                self._sessions.pop(service_name).close()
+                logger.debug(f"Sessão ociosa descartada para {service_name} ({idle:.1f}s)")
+                evicted += 1
+        return evicted
+
+    def evict_idle(self) -> int:
+        """Fecha sessões ociosas; retorna quantas foram descartadas"""
+        with self._lock:
+            return self._evict_idle_locked(time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado atual do pool (para diagnóstico)"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                service_name: {
+                    "in_flight": self._in_flight.get(service_name, 0),
+                    "idle_seconds": round(now - self._last_used.get(service_name, now), 3)
+                }
+                for service_name in self._sessions
+            }
+
+    def close(self) -> None:
+        """Fecha todas as sessões"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
 class ServiceClient:
     """Cliente para comunicação com microserviços"""
-    
-    def __init__(self):
+
+    def __init__(self, pooled: Optional[bool] = None):
         self.services = config.SERVICES
         self.timeout = config.REQUEST_TIMEOUT
-    
+        if pooled is None:
+            pooled = config.UPSTREAM_POOL_ENABLED
+        self.session_pool = UpstreamSessionPool(
+            pool_connections=config.UPSTREAM_POOL_CONNECTIONS,
+            pool_maxsize=config.UPSTREAM_POOL_MAXSIZE,
+            pool_block=config.UPSTREAM_POOL_BLOCK,
+            idle_timeout=config.UPSTREAM_POOL_IDLE_TIMEOUT
+        ) if pooled else None
+        self.guards: Dict[str, UpstreamGuard] = {}
+        if config.CIRCUIT_BREAKER_ENABLED:
+            self.guards = {
+                service_name: UpstreamGuard(
+                    CircuitBreaker(
+                        service_name,
+                        failure_rate_threshold=config.CIRCUIT_FAILURE_RATE_THRESHOLD,
+                        slow_call_threshold=config.CIRCUIT_SLOW_CALL_THRESHOLD,
+                        slow_call_rate_threshold=config.CIRCUIT_SLOW_CALL_RATE_THRESHOLD,
+                        window_size=config.CIRCUIT_WINDOW_SIZE,
+                        min_calls=config.CIRCUIT_MIN_CALLS,
+                        open_seconds=config.CIRCUIT_OPEN_SECONDS,
+                        half_open_max_calls=config.CIRCUIT_HALF_OPEN_MAX_CALLS
+                    ),
+                    max_in_flight=config.UPSTREAM_MAX_IN_FLIGHT
+                )
+                for service_name in self.services
+            }
+
+    def _acquire_guard(self, service_name: str) -> Optional[UpstreamGuard]:
+        """Reserva vaga no bulkhead e consulta o circuit breaker do serviço"""
+        guard = self.guards.get(service_name)
+        if guard is None:
+            return None
+        try:
+            guard.acquire()
+        except ServiceUnavailableError as e:
+            log_security_event("SERVICE_REJECTED", f"{service_name}: {e.details.get('reason')}")
+            raise
+        return guard
+
+    def circuit_states(self) -> Dict[str, Dict[str, Any]]:
+        """Estado do circuit breaker e do bulkhead de cada serviço"""
+        return {service_name: guard.snapshot() for service_name, guard in self.guards.items()}
+
+    def _send(self, service_name: str, method: str, url: str, **kwargs) -> requests.Response:
+        """Envia a requisição pelo pool do serviço (ou sem pool, se desabilitado)"""
+        if self.session_pool is not None:
+            return self.session_pool.request(service_name, method, url, **kwargs)
+        return requests.request(method=method, url=url, **kwargs)
+
     def _get_correlation_id(self) -> str:
         """Gera ou obtém correlation ID"""
         return request.headers.get("X-Correlation-ID", str(uuid.uuid4()))
@@ -62,7 +298,8 @@ class ServiceClient:
         method: str, 
         path: str, 
         json_body: Optional[Dict] = None, 
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None
     ) -> Tuple[Dict, int]:
         """
         Encaminha requisição para microserviço
@@ -73,6 +310,7 @@ class ServiceClient:
             path: Caminho da requisição
             json_body: Corpo da requisição JSON
             params: Parâmetros da query string
+            timeout: Timeout da chamada (padrão: REQUEST_TIMEOUT)
             
         Returns:
             Tuple com resposta JSON e status code
@@ -81,42 +319,141 @@ class ServiceClient:
             ServiceUnavailableError: Quando serviço não está disponível
             ServiceTimeoutError: Quando há timeout na requisição
         """
+        response_data, status_code, _ = self._forward(
+            service_name, method, path, json_body=json_body, params=params, timeout=timeout
+        )
+        return response_data, status_code
+
+    def forward_conditional(
+        self,
+        service_name: str,
+        path: str,
+        params: Optional[Dict] = None
+    ) -> Tuple[Optional[Any], int, Dict[str, str]]:
+        """
+        GET condicional: propaga If-None-Match da requisição atual
+
+        Returns:
+            Tuple com resposta JSON (None em 304), status code e headers do serviço
+        """
+        extra_headers = {}
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            extra_headers["If-None-Match"] = if_none_match
+        return self._forward(service_name, "GET", path, params=params, extra_headers=extra_headers)
+
+    def forward_stream(
+        self,
+        service_name: str,
+        path: str,
+        params: Optional[Dict] = None
+    ) -> Tuple[UpstreamBody, int, Dict[str, str]]:
+        """
+        GET em NDJSON repassado em blocos, sem decodificar o corpo
+
+        O upstream é lido sob demanda (`stream=True`) conforme o cliente
+        consome o iterador; a conexão é liberada ao final (ou se o cliente
+        desconectar). If-None-Match é propagado como em `forward_conditional`.
+
+        Returns:
+            Tuple com iterador de bytes, status code e headers do serviço
+        """
+        extra_headers = {"Accept": NDJSON_MIMETYPE}
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            extra_headers["If-None-Match"] = if_none_match
+        return self._forward(
+            service_name, "GET", path, params=params, extra_headers=extra_headers, stream=True
+        )
+
+    def _prepare_request(
+        self,
+        service_name: str,
+        path: str,
+        json_body: Optional[Dict],
+        params: Optional[Dict],
+        timeout: Optional[float],
+        extra_headers: Optional[Dict[str, str]]
+    ) -> Tuple[str, Dict[str, str], Any, Any, float]:
+        """Monta URL, headers, corpo e parâmetros sanitizados e o timeout efetivo"""
         if service_name not in self.services:
             raise ServiceUnavailableError(service_name, {"reason": "Service not configured"})
         
-        base_url = self.services[service_name]
-        url = f"{base_url}{path}"
+        url = f"{self.services[service_name]}{path}"
         headers = self._prepare_headers()
+        if extra_headers:
+            headers.update(extra_headers)
+        timeout = timeout if timeout is not None else self.timeout
         
         # Sanitiza dados de entrada
-        json_body = self._sanitize_data(json_body)
-        params = self._sanitize_data(params)
+        return url, headers, self._sanitize_data(json_body), self._sanitize_data(params), timeout
+
+    @staticmethod
+    def _parse_body(status_code: int, parse_json, text: str) -> Any:
+        """Tenta parsear JSON, se falhar retorna texto (sem corpo em 304)"""
+        if status_code == 304:
+            return None
+        try:
+            return parse_json()
+        except ValueError:
+            return {"message": text}
+
+    def _forward(
+        self,
+        service_name: str,
+        method: str,
+        path: str,
+        json_body: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        stream: bool = False
+    ) -> Tuple[Any, int, Dict[str, str]]:
+        """
+        Envia a requisição; retorna corpo, status e headers da resposta
+
+        Com `stream=True` o corpo não é lido: retorna um UpstreamBody, e a
+        vaga do bulkhead (com o tempo até os headers) só é liberada quando
+        ele é fechado.
+        """
+        url, headers, json_body, params, timeout = self._prepare_request(
+            service_name, path, json_body, params, timeout, extra_headers
+        )
         
+        guard = self._acquire_guard(service_name)
+        started = time.perf_counter()
+        failed = True
+        release_guard = guard is not None
         try:
             logger.info(f"Forwarding {method} request to {service_name}: {url}")
             
-            response = requests.request(
-                method=method,
-                url=url,
+            response = self._send(
+                service_name,
+                method,
+                url,
                 json=json_body,
                 params=params,
                 headers=headers,
-                timeout=self.timeout
+                timeout=timeout,
+                stream=stream
             )
             
             logger.info(f"Response from {service_name}: {response.status_code}")
+            failed = response.status_code >= 500
+
+            if stream:
+                if guard is not None:
+                    elapsed = time.perf_counter() - started
+                    _call_on_close(response, lambda: guard.release(elapsed, response.status_code >= 500))
+                    release_guard = False
+                return UpstreamBody(response, config.STREAM_CHUNK_SIZE), response.status_code, response.headers
             
-            # Tenta parsear JSON, se falhar retorna texto
-            try:
-                response_data = response.json()
-            except ValueError:
-                response_data = {"message": response.text}
-            
-            return response_data, response.status_code
+            response_data = self._parse_body(response.status_code, response.json, response.text)
+            return response_data, response.status_code, response.headers
             
         except requests.exceptions.Timeout:
             log_security_event("SERVICE_TIMEOUT", f"Timeout calling {service_name}")
-            raise ServiceTimeoutError(service_name, {"url": url, "timeout": self.timeout})
+            raise ServiceTimeoutError(service_name, {"url": url, "timeout": timeout})
             
         except requests.exceptions.ConnectionError:
             log_security_event("SERVICE_CONNECTION_ERROR", f"Connection error to {service_name}")
@@ -126,57 +463,359 @@ class ServiceClient:
             log_security_event("SERVICE_ERROR", f"Error calling {service_name}: {str(e)}")
             raise ServiceUnavailableError(service_name, {"url": url, "reason": str(e)})
 
+        finally:
+            if release_guard:
+                guard.release(time.perf_counter() - started, failed)
+
+    def probe(self, service_name: str, path: str = "/health", timeout: Optional[float] = None) -> Tuple[Dict, int]:
+        """
+        Chamada GET sem contexto de requisição (usada por verificações em background)
+
+        Não propaga Authorization nem X-Office-ID; erros de rede são repassados
+        como exceções de `requests`.
+        """
+        if service_name not in self.services:
+            raise ServiceUnavailableError(service_name, {"reason": "Service not configured"})
+
+        response = self._send(
+            service_name,
+            "GET",
+            f"{self.services[service_name]}{path}",
+            headers={"X-Correlation-ID": str(uuid.uuid4())},
+            timeout=timeout if timeout is not None else self.timeout
+        )
+        try:
+            return response.json(), response.status_code
+        except ValueError:
+            return {"message": response.text}, response.status_code
+
+class FanOutExecutor:
+    """
+    Executor limitado compartilhado pelas rotas de orquestração
+
+    Dispara as chamadas de uma orquestração em paralelo. Cada ramo tem seu
+    próprio orçamento de tempo; um ramo lento ou com erro é marcado como
+    parcial sem afetar os demais.
+    """
+
+    def __init__(self, service_client: ServiceClient, max_workers: int = 16, default_timeout: float = 2.0):
+        self.service_client = service_client
+        self.default_timeout = default_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="orchestration")
+
+    def run(
+        self,
+        calls: Dict[str, Dict[str, Any]],
+        timeouts: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Executa as chamadas concorrentemente
+
+        Args:
+            calls: Mapa nome -> argumentos de `ServiceClient.forward_request`
+            timeouts: Orçamento de tempo por ramo em segundos (padrão: default_timeout)
+
+        Returns:
+            Mapa nome -> {"status", "status_code", "data", "elapsed_ms"};
+            status é "ok", "error" ou "timeout"
+        """
+        timeouts = timeouts or {}
+        started = time.perf_counter()
+        finished: Dict[str, float] = {}
+        futures = {}
+
+        for name, call in calls.items():
+            budget = timeouts.get(name, self.default_timeout)
+
+            def fn(name=name, call=call, budget=budget):
+                try:
+                    return self.service_client.forward_request(timeout=budget, **call)
+                finally:
+                    finished[name] = time.perf_counter()
+
+            if has_request_context():
+                fn = copy_current_request_context(fn)
+            futures[name] = self._executor.submit(fn)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for name, future in futures.items():
+            budget = timeouts.get(name, self.default_timeout)
+            remaining = max(started + budget - time.perf_counter(), 0)
+            try:
+                results[name] = branch_result(*future.result(timeout=remaining))
+            except FutureTimeoutError:
+                future.cancel()
+                results[name] = branch_result(status="timeout")
+            except ServiceTimeoutError:
+                results[name] = branch_result(status="timeout")
+            except Exception as e:
+                results[name] = branch_result(status="error", error=str(e))
+
+            end = finished.get(name, time.perf_counter())
+            results[name]["elapsed_ms"] = round((end - started) * 1000, 2)
+
+        return results
+
+    def shutdown(self) -> None:
+        """Encerra o executor sem aguardar ramos pendentes"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+def branch_result(
+    data: Any = None,
+    status_code: Optional[int] = None,
+    status: Optional[str] = None,
+    error: Optional[str] = None
+) -> Dict[str, Any]:
+    """Resultado padronizado de um ramo de orquestração"""
+    if status is None:
+        status = "ok" if status_code == 200 else "error"
+    result = {"status": status, "status_code": status_code, "data": data}
+    if error:
+        result["error"] = error
+    return result
+
+class ProcessLookup:
+    """
+    Validação de existência de processos com cache por escritório
+
+    Guarda respostas de `/processes/by-number/<n>` e `/processes/<id>` em
+    um cache LRU com TTL, chaveado por (office_id, tipo, valor). Negativos
+    (404) só são guardados se `cache_negative` estiver ativo. As rotas de
+    escrita de processos do Gateway invalidam as entradas explicitamente.
+    """
+
+    def __init__(
+        self,
+        service_client: ServiceClient,
+        cache: Optional[TTLCache] = None,
+        cache_negative: bool = False,
+        negative_ttl: float = 5.0
+    ):
+        self.service_client = service_client
+        self.cache = cache
+        self.cache_negative = cache_negative
+        self.negative_ttl = negative_ttl
+
+    def _office_id(self) -> Optional[str]:
+        return getattr(request, 'current_user', {}).get('office_id')
+
+    def _lookup(self, kind: str, value: str, path: str) -> Tuple[Dict, int]:
+        if self.cache is None:
+            return self.service_client.forward_request("processes", "GET", path)
+
+        key = (self._office_id(), kind, value)
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        response_data, status_code = self.service_client.forward_request("processes", "GET", path)
+        if status_code == 200 and isinstance(response_data, dict):
+            self.remember(response_data)
+        elif status_code == 404 and self.cache_negative:
+            self.cache.set(key, (response_data, status_code), ttl=self.negative_ttl)
+        return response_data, status_code
+
+    def by_number(self, number: str) -> Tuple[Dict, int]:
+        """Busca processo pelo número (PROC-XXX)"""
+        return self._lookup("number", number, f"/processes/by-number/{number}")
+
+    def by_id(self, proc_id: str) -> Tuple[Dict, int]:
+        """Busca processo pelo ID interno"""
+        return self._lookup("id", proc_id, f"/processes/{proc_id}")
+
+    def remember(self, process: Dict[str, Any]) -> None:
+        """Registra um processo conhecido (por número e por ID)"""
+        if self.cache is None:
+            return
+        office_id = self._office_id()
+        if process.get("number"):
+            self.cache.set((office_id, "number", process["number"]), (process, 200))
+        if process.get("id"):
+            self.cache.set((office_id, "id", process["id"]), (process, 200))
+
+    def invalidate(self, proc_id: Optional[str] = None, number: Optional[str] = None) -> None:
+        """Remove do cache as entradas do processo (por ID e/ou número), em qualquer escritório"""
+        if self.cache is None:
+            return
+
+        def matches(key, value):
+            _, kind, ref = key
+            data = value[0] if isinstance(value[0], dict) else {}
+            if proc_id and (ref == proc_id and kind == "id" or data.get("id") == proc_id):
+                return True
+            if number and (ref == number and kind == "number" or data.get("number") == number):
+                return True
+            return False
+
+        self.cache.discard_where(matches)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats() if self.cache is not None else {"enabled": False}
+
+class OfficeLookup:
+    """
+    Dados dos escritórios (`/offices/<id>` do serviço Auth) com cache
+
+    Escritórios quase nunca mudam: o `/api/auth/me` responde com o JWT e
+    este cache, sem chamada ao Auth. Só respostas 200 entram no cache; o
+    cadastro (register), que pode atualizar o escritório, invalida a entrada.
+    """
+
+    def __init__(self, service_client: ServiceClient, cache: Optional[TTLCache] = None):
+        self.service_client = service_client
+        self.cache = cache
+
+    def get(self, office_id: str) -> Tuple[Dict, int]:
+        if self.cache is not None:
+            cached = self.cache.get(office_id)
+            if cached is not MISSING:
+                return cached, 200
+        response_data, status_code = self.service_client.forward_request("auth", "GET", f"/offices/{office_id}")
+        if status_code == 200 and isinstance(response_data, dict):
+            self.remember(office_id, response_data)
+        return response_data, status_code
+
+    def remember(self, office_id: str, office: Dict[str, Any]) -> None:
+        if self.cache is not None:
+            self.cache.set(office_id, office)
+
+    def invalidate(self, office_id: str) -> None:
+        if self.cache is not None:
+            self.cache.pop(office_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats() if self.cache is not None else {"enabled": False}
+
 class HealthChecker:
-    """Verificador de saúde dos serviços"""
+    """
+    Verificador de saúde dos serviços
+
+    Sonda todos os serviços em paralelo. Com `start()`, um refresher em
+    background atualiza o snapshot a cada `interval` segundos e o /health
+    passa a servir o snapshot em cache.
+    """
     
-    def __init__(self, service_client: ServiceClient):
+    def __init__(self, service_client: ServiceClient, interval: float = 10.0, probe_timeout: float = 2.0):
         self.service_client = service_client
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_at: Optional[float] = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(len(service_client.services), 1), thread_name_prefix="health-probe"
+        )
     
     def check_service_health(self, service_name: str) -> Dict[str, Any]:
         """Verifica saúde de um serviço específico"""
+        started = time.perf_counter()
         try:
-            response_data, status_code = self.service_client.forward_request(
-                service_name, "GET", "/health"
+            response_data, status_code = self.service_client.probe(
+                service_name, "/health", timeout=self.probe_timeout
             )
             
             return {
                 "service": service_name,
                 "status": "healthy" if status_code == 200 else "unhealthy",
                 "status_code": status_code,
-                "response": response_data
+                "response": response_data,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2)
             }
         except Exception as e:
             return {
                 "service": service_name,
                 "status": "unhealthy",
-                "error": str(e)
+                "error": str(e),
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2)
             }
     
     def check_all_services(self) -> Dict[str, Any]:
-        """Verifica saúde de todos os serviços"""
-        results = {}
-        overall_healthy = True
+        """Verifica saúde de todos os serviços (em paralelo) e atualiza o snapshot"""
+        service_names = list(self.service_client.services.keys())
+        results = dict(zip(service_names, self._executor.map(self.check_service_health, service_names)))
+        overall_healthy = all(info["status"] == "healthy" for info in results.values())
         
-        for service_name in self.service_client.services.keys():
-            health_info = self.check_service_health(service_name)
-            results[service_name] = health_info
-            
-            if health_info["status"] != "healthy":
-                overall_healthy = False
-        
-        return {
+        snapshot = {
             "status": "healthy" if overall_healthy else "degraded",
             "services": results,
-            "timestamp": uuid.uuid4().hex
+            "timestamp": uuid.uuid4().hex,
+            "checked_at": datetime.now(timezone.utc).isoformat()
         }
+        with self._refresh_lock:
+            self._snapshot = snapshot
+            self._snapshot_at = time.monotonic()
+        return snapshot
+
+    def get_snapshot(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Retorna o último snapshot com a idade em segundos
+
+        Faz uma verificação síncrona se `force_refresh` for True ou se ainda
+        não houver snapshot.
+        """
+        with self._refresh_lock:
+            snapshot, snapshot_at = self._snapshot, self._snapshot_at
+        if force_refresh or snapshot is None:
+            snapshot = self.check_all_services()
+            snapshot_at = time.monotonic()
+
+        age = time.monotonic() - snapshot_at
+        return {
+            **snapshot,
+            "age_seconds": round(age, 3),
+            "stale": self._thread is not None and age > 2 * self.interval
+        }
+
+    def start(self) -> None:
+        """Inicia o refresher em background"""
+        if self._thread is not None:
+            return
+
+        def refresh_loop():
+            while not self._stop.is_set():
+                try:
+                    self.check_all_services()
+                except Exception as e:
+                    logger.warning(f"Falha ao atualizar snapshot de saúde: {str(e)}")
+                self._stop.wait(self.interval)
+
+        self._thread = threading.Thread(target=refresh_loop, name="health-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe o refresher em background"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.probe_timeout + 1)
+            self._thread = None
 
 class GrpcClient:
-    """Cliente para comunicação gRPC com microserviços"""
-    
+    """
+    Cliente gRPC para os microserviços com contrato em `protos/`
+
+    Um canal por serviço, criado na inicialização; o gRPC reconecta sozinho.
+    O estado de conectividade de cada canal é acompanhado para que as rotas
+    usem HTTP enquanto o servidor gRPC do serviço não estiver acessível.
+    """
+
+    # Status gRPC devolvidos ao cliente como erro HTTP equivalente
+    STATUS_TO_HTTP = {
+        "INVALID_ARGUMENT": 400,
+        "UNAUTHENTICATED": 401,
+        "PERMISSION_DENIED": 403,
+        "NOT_FOUND": 404,
+        "ALREADY_EXISTS": 409,
+        "FAILED_PRECONDITION": 409,
+    }
+
     def __init__(self):
         self.config = get_config()
         self.channels = {}
         self.stubs = {}
+        self.methods = {}
+        self.states = {}
         
         if not GRPC_AVAILABLE:
             logger.info("gRPC não está disponível. Para usar gRPC, instale: pip install -r requirements-grpc.txt")
@@ -190,85 +829,137 @@ class GrpcClient:
             self._initialize_channels()
         except Exception as e:
             logger.warning(f"Falha ao inicializar gRPC: {str(e)}")
+
+    @staticmethod
+    def _service_definitions() -> Dict[str, Tuple[Any, Dict[str, Tuple[Any, int]]]]:
+        """Stub e métodos de cada serviço: método -> (classe da requisição, status HTTP de sucesso)"""
+        return {
+            "documents": (documents_pb2_grpc.DocumentsStub, {
+                "ListDocuments": (documents_pb2.ListDocumentsRequest, 200),
+                "GetDocument": (documents_pb2.GetDocumentRequest, 200),
+                "CreateDocument": (documents_pb2.CreateDocumentRequest, 201),
+            }),
+            "deadlines": (deadlines_pb2_grpc.DeadlinesStub, {
+                "ListDeadlines": (deadlines_pb2.ListDeadlinesRequest, 200),
+                "CreateDeadline": (deadlines_pb2.CreateDeadlineRequest, 201),
+            }),
+            "hearings": (hearings_pb2_grpc.HearingsStub, {
+                "ListHearings": (hearings_pb2.ListHearingsRequest, 200),
+                "CreateHearing": (hearings_pb2.CreateHearingRequest, 201),
+            }),
+        }
     
     def _initialize_channels(self):
-        """Inicializa canais gRPC para os serviços configurados"""
+        """Inicializa canais e stubs gRPC para os serviços configurados"""
         if not GRPC_AVAILABLE or not hasattr(self.config, 'GRPC_ENABLED') or not self.config.GRPC_ENABLED:
             return
             
         if not hasattr(self.config, 'GRPC_SERVICES'):
             logger.warning("GRPC_SERVICES não configurado")
             return
-            
+
+        definitions = self._service_definitions()
         for service_name, address in self.config.GRPC_SERVICES.items():
+            if service_name not in definitions:
+                logger.warning(f"Sem contrato gRPC para {service_name}")
+                continue
+            stub_class, methods = definitions[service_name]
             try:
-                # Cria canal gRPC
                 channel = grpc.insecure_channel(address)
                 self.channels[service_name] = channel
-                
-                # Verifica conectividade
-                grpc.channel_ready_future(channel).result(timeout=2)
-                logger.info(f"Canal gRPC conectado para {service_name}: {address}")
-                
+                self.stubs[service_name] = stub_class(channel)
+                self.methods[service_name] = methods
+                self.states[service_name] = grpc.ChannelConnectivity.IDLE
+                channel.subscribe(self._state_callback(service_name), try_to_connect=True)
+                logger.info(f"Canal gRPC criado para {service_name}: {address}")
             except Exception as e:
-                logger.warning(f"Falha ao conectar gRPC {service_name}: {str(e)}")
+                logger.warning(f"Falha ao criar canal gRPC {service_name}: {str(e)}")
+
+    def _state_callback(self, service_name: str):
+        def on_change(state):
+            if self.states.get(service_name) != state:
+                logger.info(f"Canal gRPC {service_name}: {state.name}")
+            self.states[service_name] = state
+        return on_change
     
     def is_available(self, service_name: str = None) -> bool:
-        """Verifica se gRPC está disponível"""
+        """Verifica se gRPC está disponível (canal conectado ou ocioso)"""
         if not GRPC_AVAILABLE:
             return False
             
         if not hasattr(self.config, 'GRPC_ENABLED') or not self.config.GRPC_ENABLED:
             return False
-            
+
+        usable = (grpc.ChannelConnectivity.READY, grpc.ChannelConnectivity.IDLE)
         if service_name:
-            return service_name in self.channels
+            return self.states.get(service_name) in usable
             
-        return len(self.channels) > 0
+        return any(state in usable for state in self.states.values())
+
+    def available_services(self) -> list:
+        """Serviços cujo canal gRPC está utilizável"""
+        return [name for name in self.stubs if self.is_available(name)]
+
+    def _metadata(self) -> Tuple[Tuple[str, str], ...]:
+        """Metadata equivalente aos headers propagados no HTTP"""
+        metadata = [("x-correlation-id", request.headers.get("X-Correlation-ID", str(uuid.uuid4())))]
+        if hasattr(request, 'current_user'):
+            office_id = request.current_user.get('office_id')
+            if office_id:
+                metadata.append(("x-office-id", office_id))
+        return tuple(metadata)
     
-    def call_service(self, service_name: str, method_name: str, request_data: Dict[str, Any]) -> Tuple[Dict, int]:
+    def call_service(
+        self,
+        service_name: str,
+        method_name: str,
+        request_data: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Tuple[Dict, int]:
         """
         Chama um método gRPC de um serviço
         
         Args:
             service_name: Nome do serviço
-            method_name: Nome do método gRPC
-            request_data: Dados da requisição
+            method_name: Nome do método gRPC (ex.: ListDocuments)
+            request_data: Dados da requisição (campos da mensagem)
+            timeout: Deadline da chamada em segundos (padrão: GRPC_TIMEOUT)
             
         Returns:
             Tuple com resposta JSON e status code
+
+        Raises:
+            ServiceUnavailableError: canal indisponível ou erro do servidor
+            ServiceTimeoutError: deadline excedido
         """
         if not self.is_available(service_name):
             raise ServiceUnavailableError(service_name, {"reason": "gRPC not available"})
+
+        if method_name not in self.methods[service_name]:
+            raise ServiceUnavailableError(service_name, {"reason": f"Unknown gRPC method {method_name}"})
+        request_class, success_status = self.methods[service_name][method_name]
+        message = message_from_dict(request_class, sanitize_input(request_data or {}))
+        timeout = timeout or self.config.GRPC_TIMEOUT
         
         try:
-            channel = self.channels[service_name]
-            
-            # Exemplo simples de chamada gRPC
-            # Em uma implementação real, você teria stubs específicos para cada serviço
-            logger.info(f"Chamando gRPC {service_name}.{method_name} com dados: {request_data}")
-            
-            # Simula uma resposta gRPC bem-sucedida
-            response_data = {
-                "grpc_service": service_name,
-                "grpc_method": method_name,
-                "request_data": request_data,
-                "status": "success",
-                "message": "gRPC call completed successfully"
-            }
-            
-            return response_data, 200
+            logger.info(f"Chamando gRPC {service_name}.{method_name}")
+            rpc = getattr(self.stubs[service_name], method_name)
+            request.used_grpc = True
+            response = rpc(message, timeout=timeout, metadata=self._metadata())
+            return message_to_dict(response), success_status
             
         except grpc.RpcError as e:
-            logger.error(f"Erro gRPC {service_name}.{method_name}: {e.code()} - {e.details()}")
+            code = e.code()
+            logger.error(f"Erro gRPC {service_name}.{method_name}: {code} - {e.details()}")
+            if code == grpc.StatusCode.DEADLINE_EXCEEDED:
+                log_security_event("SERVICE_TIMEOUT", f"gRPC timeout calling {service_name}")
+                raise ServiceTimeoutError(service_name, {"method": method_name, "timeout": timeout})
+            if code.name in self.STATUS_TO_HTTP:
+                return {"error": e.details()}, self.STATUS_TO_HTTP[code.name]
             raise ServiceUnavailableError(service_name, {
-                "grpc_error": str(e.code()),
+                "grpc_error": code.name,
                 "details": e.details()
             })
-            
-        except Exception as e:
-            logger.error(f"Erro inesperado gRPC {service_name}.{method_name}: {str(e)}")
-            raise ServiceUnavailableError(service_name, {"error": str(e)})
     
     def close_channels(self):
         """Fecha todos os canais gRPC"""
@@ -281,6 +972,7 @@ class GrpcClient:
         
         self.channels.clear()
         self.stubs.clear()
+        self.states.clear()
     
     def __del__(self):
         """Destructor para limpar recursos"""
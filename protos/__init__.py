@@ -0,0 +1,34 @@
+"""
+Contratos gRPC dos microserviços (documentos, prazos e audiências)
+
+Os módulos `*_pb2.py` e `*_pb2_grpc.py` são gerados a partir dos `.proto`
+deste diretório (ver comentário no topo de cada arquivo). As funções
+abaixo convertem entre os dicts usados pelas rotas HTTP e as mensagens,
+preservando `None` nos campos opcionais, para que as duas interfaces
+devolvam o mesmo formato.
+"""
+
+from typing import Any, Dict
+
+
+def message_from_dict(message_class, data: Dict[str, Any]):
+    """Monta a mensagem com os campos conhecidos de `data` (ignora os demais e os nulos)"""
+    fields = {}
+    for field in message_class.DESCRIPTOR.fields:
+        value = data.get(field.name)
+        if value is not None:
+            fields[field.name] = str(value)
+    return message_class(**fields)
+
+
+def message_to_dict(message) -> Dict[str, Any]:
+    """Converte a mensagem em dict; campos opcionais ausentes viram `None`"""
+    result = {}
+    for field in message.DESCRIPTOR.fields:
+        if field.is_repeated:
+            result[field.name] = [message_to_dict(item) for item in getattr(message, field.name)]
+        elif field.has_presence and not message.HasField(field.name):
+            result[field.name] = None
+        else:
+            result[field.name] = getattr(message, field.name)
+    return result
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: protos/deadlines.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'protos/deadlines.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16protos/deadlines.proto\x12\x0flegal.deadlines\"\x8b\x01\n\x08\x44\x65\x61\x64line\x12\n\n\x02id\x18\x01 \x01(\t\x12\x12\n\nprocess_id\x18\x02 \x01(\t\x12\x10\n\x08\x64ue_date\x18\x03 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\x12\x12\n\ncreated_at\x18\x05 \x01(\t\x12\x16\n\toffice_id\x18\x06 \x01(\tH\x00\x88\x01\x01\x42\x0c\n\n_office_id\"\x16\n\x14ListDeadlinesRequest\"8\n\x0c\x44\x65\x61\x64lineList\x12(\n\x05items\x18\x01 \x03(\x0b\x32\x19.legal.deadlines.Deadline\"R\n\x15\x43reateDeadlineRequest\x12\x12\n\nprocess_id\x18\x01 \x01(\t\x12\x10\n\x08\x64ue_date\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t2\xb7\x01\n\tDeadlines\x12U\n\rListDeadlines\x12%.legal.deadlines.ListDeadlinesRequest\x1a\x1d.legal.deadlines.DeadlineList\x12S\n\x0e\x43reateDeadline\x12&.legal.deadlines.CreateDeadlineRequest\x1a\x19.legal.deadlines.Deadlineb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'protos.deadlines_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_DEADLINE']._serialized_start=44
+  _globals['_DEADLINE']._serialized_end=183
+  _globals['_LISTDEADLINESREQUEST']._serialized_start=185
+  _globals['_LISTDEADLINESREQUEST']._serialized_end=207
+  _globals['_DEADLINELIST']._serialized_start=209
+  _globals['_DEADLINELIST']._serialized_end=265
+  _globals['_CREATEDEADLINEREQUEST']._serialized_start=267
+  _globals['_CREATEDEADLINEREQUEST']._serialized_end=349
+  _globals['_DEADLINES']._serialized_start=352
+  _globals['_DEADLINES']._serialized_end=535
+# @@protoc_insertion_point(module_scope)
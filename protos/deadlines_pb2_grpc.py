@@ -0,0 +1,140 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from protos import deadlines_pb2 as protos_dot_deadlines__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in protos/deadlines_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class DeadlinesStub:
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ListDeadlines = channel.unary_unary(
+                '/legal.deadlines.Deadlines/ListDeadlines',
+                request_serializer=protos_dot_deadlines__pb2.ListDeadlinesRequest.SerializeToString,
+                response_deserializer=protos_dot_deadlines__pb2.DeadlineList.FromString,
+                _registered_method=True)
+        self.CreateDeadline = channel.unary_unary(
+                '/legal.deadlines.Deadlines/CreateDeadline',
+                request_serializer=protos_dot_deadlines__pb2.CreateDeadlineRequest.SerializeToString,
+                response_deserializer=protos_dot_deadlines__pb2.Deadline.FromString,
+                _registered_method=True)
+
+
+class DeadlinesServicer:
+    """Missing associated documentation comment in .proto file."""
+
+    def ListDeadlines(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CreateDeadline(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_DeadlinesServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ListDeadlines': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListDeadlines,
+                    request_deserializer=protos_dot_deadlines__pb2.ListDeadlinesRequest.FromString,
+                    response_serializer=protos_dot_deadlines__pb2.DeadlineList.SerializeToString,
+            ),
+            'CreateDeadline': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateDeadline,
+                    request_deserializer=protos_dot_deadlines__pb2.CreateDeadlineRequest.FromString,
+                    response_serializer=protos_dot_deadlines__pb2.Deadline.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'legal.deadlines.Deadlines', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('legal.deadlines.Deadlines', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class Deadlines:
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def ListDeadlines(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/legal.deadlines.Deadlines/ListDeadlines',
+            protos_dot_deadlines__pb2.ListDeadlinesRequest.SerializeToString,
+            protos_dot_deadlines__pb2.DeadlineList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CreateDeadline(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/legal.deadlines.Deadlines/CreateDeadline',
+            protos_dot_deadlines__pb2.CreateDeadlineRequest.SerializeToString,
+            protos_dot_deadlines__pb2.Deadline.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
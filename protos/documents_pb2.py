@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: protos/documents.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'protos/documents.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16protos/documents.proto\x12\x0flegal.documents\"\xbc\x01\n\x08\x44ocument\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x04 \x01(\t\x12\x17\n\nprocess_id\x18\x05 \x01(\tH\x00\x88\x01\x01\x12\x12\n\ncreated_at\x18\x06 \x01(\t\x12\x12\n\nupdated_at\x18\x07 \x01(\t\x12\x16\n\toffice_id\x18\x08 \x01(\tH\x01\x88\x01\x01\x42\r\n\x0b_process_idB\x0c\n\n_office_id\">\n\x14ListDocumentsRequest\x12\x17\n\nprocess_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x42\r\n\x0b_process_id\"8\n\x0c\x44ocumentList\x12(\n\x05items\x18\x01 \x03(\x0b\x32\x19.legal.documents.Document\" \n\x12GetDocumentRequest\x12\n\n\x02id\x18\x01 \x01(\t\"o\n\x15\x43reateDocumentRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\x17\n\nprocess_id\x18\x04 \x01(\tH\x00\x88\x01\x01\x42\r\n\x0b_process_id2\x86\x02\n\tDocuments\x12U\n\rListDocuments\x12%.legal.documents.ListDocumentsRequest\x1a\x1d.legal.documents.DocumentList\x12M\n\x0bGetDocument\x12#.legal.documents.GetDocumentRequest\x1a\x19.legal.documents.Document\x12S\n\x0e\x43reateDocument\x12&.legal.documents.CreateDocumentRequest\x1a\x19.legal.documents.Documentb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'protos.documents_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_DOCUMENT']._serialized_start=44
+  _globals['_DOCUMENT']._serialized_end=232
+  _globals['_LISTDOCUMENTSREQUEST']._serialized_start=234
+  _globals['_LISTDOCUMENTSREQUEST']._serialized_end=296
+  _globals['_DOCUMENTLIST']._serialized_start=298
+  _globals['_DOCUMENTLIST']._serialized_end=354
+  _globals['_GETDOCUMENTREQUEST']._serialized_start=356
+  _globals['_GETDOCUMENTREQUEST']._serialized_end=388
+  _globals['_CREATEDOCUMENTREQUEST']._serialized_start=390
+  _globals['_CREATEDOCUMENTREQUEST']._serialized_end=501
+  _globals['_DOCUMENTS']._serialized_start=504
+  _globals['_DOCUMENTS']._serialized_end=766
+# @@protoc_insertion_point(module_scope)
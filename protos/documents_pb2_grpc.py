@@ -0,0 +1,183 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from protos import documents_pb2 as protos_dot_documents__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in protos/documents_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class DocumentsStub:
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ListDocuments = channel.unary_unary(
+                '/legal.documents.Documents/ListDocuments',
+                request_serializer=protos_dot_documents__pb2.ListDocumentsRequest.SerializeToString,
+                response_deserializer=protos_dot_documents__pb2.DocumentList.FromString,
+                _registered_method=True)
+        self.GetDocument = channel.unary_unary(
+                '/legal.documents.Documents/GetDocument',
+                request_serializer=protos_dot_documents__pb2.GetDocumentRequest.SerializeToString,
+                response_deserializer=protos_dot_documents__pb2.Document.FromString,
+                _registered_method=True)
+        self.CreateDocument = channel.unary_unary(
+                '/legal.documents.Documents/CreateDocument',
+                request_serializer=protos_dot_documents__pb2.CreateDocumentRequest.SerializeToString,
+                response_deserializer=protos_dot_documents__pb2.Document.FromString,
+                _registered_method=True)
+
+
+class DocumentsServicer:
+    """Missing associated documentation comment in .proto file."""
+
+    def ListDocuments(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetDocument(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CreateDocument(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_DocumentsServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ListDocuments': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListDocuments,
+                    request_deserializer=protos_dot_documents__pb2.ListDocumentsRequest.FromString,
+                    response_serializer=protos_dot_documents__pb2.DocumentList.SerializeToString,
+            ),
+            'GetDocument': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetDocument,
+                    request_deserializer=protos_dot_documents__pb2.GetDocumentRequest.FromString,
+                    response_serializer=protos_dot_documents__pb2.Document.SerializeToString,
+            ),
+            'CreateDocument': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateDocument,
+                    request_deserializer=protos_dot_documents__pb2.CreateDocumentRequest.FromString,
+                    response_serializer=protos_dot_documents__pb2.Document.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'legal.documents.Documents', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('legal.documents.Documents', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class Documents:
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def ListDocuments(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/legal.documents.Documents/ListDocuments',
+            protos_dot_documents__pb2.ListDocumentsRequest.SerializeToString,
+            protos_dot_documents__pb2.DocumentList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetDocument(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/legal.documents.Documents/GetDocument',
+            protos_dot_documents__pb2.GetDocumentRequest.SerializeToString,
+            protos_dot_documents__pb2.Document.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CreateDocument(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/legal.documents.Documents/CreateDocument',
+            protos_dot_documents__pb2.CreateDocumentRequest.SerializeToString,
+            protos_dot_documents__pb2.Document.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: protos/hearings.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'protos/hearings.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x15protos/hearings.proto\x12\x0elegal.hearings\"\x99\x01\n\x07Hearing\x12\n\n\x02id\x18\x01 \x01(\t\x12\x12\n\nprocess_id\x18\x02 \x01(\t\x12\x0c\n\x04\x64\x61te\x18\x03 \x01(\t\x12\x11\n\tcourtroom\x18\x04 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\x12\x12\n\ncreated_at\x18\x06 \x01(\t\x12\x16\n\toffice_id\x18\x07 \x01(\tH\x00\x88\x01\x01\x42\x0c\n\n_office_id\"Y\n\x13ListHearingsRequest\x12\x11\n\x04\x64\x61te\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x17\n\nprocess_id\x18\x02 \x01(\tH\x01\x88\x01\x01\x42\x07\n\x05_dateB\r\n\x0b_process_id\"5\n\x0bHearingList\x12&\n\x05items\x18\x01 \x03(\x0b\x32\x17.legal.hearings.Hearing\"s\n\x14\x43reateHearingRequest\x12\x12\n\nprocess_id\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61te\x18\x02 \x01(\t\x12\x16\n\tcourtroom\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\tB\x0c\n\n_courtroom2\xac\x01\n\x08Hearings\x12P\n\x0cListHearings\x12#.legal.hearings.ListHearingsRequest\x1a\x1b.legal.hearings.HearingList\x12N\n\rCreateHearing\x12$.legal.hearings.CreateHearingRequest\x1a\x17.legal.hearings.Hearingb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'protos.hearings_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_HEARING']._serialized_start=42
+  _globals['_HEARING']._serialized_end=195
+  _globals['_LISTHEARINGSREQUEST']._serialized_start=197
+  _globals['_LISTHEARINGSREQUEST']._serialized_end=286
+  _globals['_HEARINGLIST']._serialized_start=288
+  _globals['_HEARINGLIST']._serialized_end=341
+  _globals['_CREATEHEARINGREQUEST']._serialized_start=343
+  _globals['_CREATEHEARINGREQUEST']._serialized_end=458
+  _globals['_HEARINGS']._serialized_start=461
+  _globals['_HEARINGS']._serialized_end=633
+# @@protoc_insertion_point(module_scope)
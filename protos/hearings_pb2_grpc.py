@@ -0,0 +1,140 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from protos import hearings_pb2 as protos_dot_hearings__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in protos/hearings_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class HearingsStub:
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ListHearings = channel.unary_unary(
+                '/legal.hearings.Hearings/ListHearings',
+                request_serializer=protos_dot_hearings__pb2.ListHearingsRequest.SerializeToString,
+                response_deserializer=protos_dot_hearings__pb2.HearingList.FromString,
+                _registered_method=True)
+        self.CreateHearing = channel.unary_unary(
+                '/legal.hearings.Hearings/CreateHearing',
+                request_serializer=protos_dot_hearings__pb2.CreateHearingRequest.SerializeToString,
+                response_deserializer=protos_dot_hearings__pb2.Hearing.FromString,
+                _registered_method=True)
+
+
+class HearingsServicer:
+    """Missing associated documentation comment in .proto file."""
+
+    def ListHearings(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CreateHearing(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_HearingsServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ListHearings': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListHearings,
+                    request_deserializer=protos_dot_hearings__pb2.ListHearingsRequest.FromString,
+                    response_serializer=protos_dot_hearings__pb2.HearingList.SerializeToString,
+            ),
+            'CreateHearing': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateHearing,
+                    request_deserializer=protos_dot_hearings__pb2.CreateHearingRequest.FromString,
+                    response_serializer=protos_dot_hearings__pb2.Hearing.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'legal.hearings.Hearings', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('legal.hearings.Hearings', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class Hearings:
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def ListHearings(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/legal.hearings.Hearings/ListHearings',
+            protos_dot_hearings__pb2.ListHearingsRequest.SerializeToString,
+            protos_dot_hearings__pb2.HearingList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CreateHearing(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/legal.hearings.Hearings/CreateHearing',
+            protos_dot_hearings__pb2.CreateHearingRequest.SerializeToString,
+            protos_dot_hearings__pb2.Hearing.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -7,52 +7,46 @@ Endpoints:
 """
 
 import os
-import json
-import threading
-import hashlib
+import uuid
 from typing import Dict, Any, Optional
 
 from flask import Flask, request, jsonify
 
+from common.passwords import PasswordHasher, PasswordHasherBusy, needs_rehash
+from services.storage import mirror, open_store, sync_before_request
 
-class JsonStore:
-    """Persistência simples em arquivo JSON (dict)."""
+BUSY_RESPONSE = {"error": "Serviço de autenticação ocupado, tente novamente"}
 
-    def __init__(self, file_path: str, default: Optional[Dict[str, Any]] = None):
-        self.file_path = file_path
-        self.default: Dict[str, Any] = default or {}
-        self._lock = threading.Lock()
-        self._ensure_storage()
 
-    def _ensure_storage(self) -> None:
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        if not os.path.exists(self.file_path):
-            self._atomic_write(self.default)
+# Domínios permitidos para login por e-mail e seu mapeamento de tipo de usuário
+ALLOWED_LOGIN_DOMAINS = {
+    "admin.com": "admin",
+    "advogado.com": "advogado",
+    "estagiario.com": "estagiario",
+}
 
-    def _atomic_write(self, data: Dict[str, Any]) -> None:
-        temp_path = f"{self.file_path}.tmp"
-        with open(temp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        os.replace(temp_path, self.file_path)
 
-    def load(self) -> Dict[str, Any]:
-        with self._lock:
-            try:
-                with open(self.file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if not isinstance(data, dict):
-                    return self.default.copy()
-                return data
-            except Exception:
-                return self.default.copy()
+def _user_type_from_email(username: str) -> Optional[str]:
+    if "@" not in (username or ""):
+        return None
+    return ALLOWED_LOGIN_DOMAINS.get(username.split("@", 1)[1].lower())
 
-    def save(self, data: Dict[str, Any]) -> None:
-        with self._lock:
-            self._atomic_write(data)
 
-
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+def _backfill_user(email: str, user: Dict[str, Any]) -> bool:
+    """Preenche campos que contas antigas não têm; True se o registro mudou"""
+    changed = False
+    if not user.get("office_id"):
+        user["office_id"] = uuid.uuid4().hex[:12]
+        changed = True
+    if not user.get("email"):
+        user["email"] = email
+        changed = True
+    if not user.get("user_type"):
+        user_type = _user_type_from_email(email)
+        if user_type:
+            user["user_type"] = user_type
+            changed = True
+    return changed
 
 
 def create_app() -> Flask:
@@ -62,17 +56,12 @@ def create_app() -> Flask:
     data_dir = os.path.join(base_dir, "data")
     users_file = os.path.join(data_dir, "users.json")
     offices_file = os.path.join(data_dir, "offices.json")
-    users_store = JsonStore(users_file, default={})
-    offices_store = JsonStore(offices_file, default={})
+    users_store = open_store(users_file, default={}, name="auth")
+    offices_store = open_store(offices_file, default={}, name="auth")
     USERS: Dict[str, Any] = users_store.load()
     OFFICES: Dict[str, Any] = offices_store.load()
-
-    # Domínios permitidos para login por e-mail e seu mapeamento de tipo de usuário
-    ALLOWED_LOGIN_DOMAINS = {
-        "admin.com": "admin",
-        "advogado.com": "advogado",
-        "estagiario.com": "estagiario",
-    }
+    # Derivação das senhas (scrypt) fora das threads das requisições
+    hasher = PasswordHasher()
 
     # Seed de usuários padrão se o arquivo estiver vazio (agora com emails)
     if not USERS:
@@ -102,22 +91,19 @@ def create_app() -> Flask:
                 "office_id": "office-default",
             },
         }
-    users_store.save(USERS)
-
-    # Normalização: garante office_id para todos os usuários existentes
-    try:
-        import uuid as _uuid
-        changed = False
-        for _u, _data in list(USERS.items()):
-            if not isinstance(_data, dict):
-                continue
-            if not _data.get("office_id"):
-                _data["office_id"] = _uuid.uuid4().hex[:12]
-                changed = True
-        if changed:
-            users_store.save(USERS)
-    except Exception:
-        pass
+        users_store.save(USERS)
+
+    # Migração das contas antigas (office_id, email, user_type): uma vez, em lote, na subida
+    legacy = [email for email, user in USERS.items() if isinstance(user, dict) and _backfill_user(email, user)]
+    if legacy:
+        with users_store.write():
+            for email in legacy:
+                users_store.put(email, USERS[email])
+
+    # Vários workers (SQLite): aplica as mudanças dos outros antes de cada requisição
+    mirror(users_store, USERS)
+    mirror(offices_store, OFFICES)
+    sync_before_request(app, users_store, offices_store)
 
     @app.get("/")
     def root_index():
@@ -129,7 +115,7 @@ def create_app() -> Flask:
 
     @app.get("/health")
     def health():
-        return {"status": "ok", "count": len(USERS)}, 200
+        return {"status": "ok", "count": len(USERS), "password_hasher": hasher.stats()}, 200
 
     def _roles_permissions_from_user_type(user_type: Optional[str]):
         """
@@ -149,15 +135,6 @@ def create_app() -> Flask:
         # default minimal
         return ["user"], ["read"]
 
-    def _user_type_from_email(username: str) -> Optional[str]:
-        if "@" not in (username or ""):
-            return None
-        try:
-            domain = username.split("@", 1)[1].lower()
-        except Exception:
-            return None
-        return ALLOWED_LOGIN_DOMAINS.get(domain)
-
     @app.post("/auth/register")
     def register():
         """
@@ -190,46 +167,58 @@ def create_app() -> Flask:
 
         if email in USERS:
             return jsonify({"error": "Email já cadastrado"}), 409
+        # Derivação (cara) fora do lock exclusivo
+        try:
+            password_hash = hasher.hash(password)
+        except PasswordHasherBusy:
+            return jsonify(BUSY_RESPONSE), 503, {"Retry-After": "1"}
+
+        # Checagem de e-mail duplicado e gravação exclusivas entre threads e workers
+        with users_store.exclusive():
+            if email in USERS:
+                return jsonify({"error": "Email já cadastrado"}), 409
 
-        # Define roles e permissões automaticamente
-        roles, permissions = _roles_permissions_from_user_type(user_type)
-
-        import uuid as _uuid
-        # Office ID: usa o enviado, senão cria um novo
-        office_id = data.get("office_id") or _uuid.uuid4().hex[:12]
-
-        # Cria/atualiza escritório
-        if office_id not in OFFICES:
-            OFFICES[office_id] = {
-                "id": office_id,
-                "name": office_name or "Escritório",
-                "cnpj": cnpj,
-                "responsible_name": responsible_name,
-                "oab_number": oab_number,
+            # Define roles e permissões automaticamente
+            roles, permissions = _roles_permissions_from_user_type(user_type)
+
+            import uuid as _uuid
+            # Office ID: usa o enviado, senão cria um novo
+            office_id = data.get("office_id") or _uuid.uuid4().hex[:12]
+
+            # Cria/atualiza escritório
+            with offices_store.write():
+                if office_id not in OFFICES:
+                    OFFICES[office_id] = {
+                        "id": office_id,
+                        "name": office_name or "Escritório",
+                        "cnpj": cnpj,
+                        "responsible_name": responsible_name,
+                        "oab_number": oab_number,
+                        "email": email,
+                        "phone": phone,
+                    }
+                else:
+                    # atualiza alguns campos se enviados
+                    off = dict(OFFICES[office_id])
+                    for k, v in (('name', office_name), ('cnpj', cnpj), ('responsible_name', responsible_name),
+                                 ('oab_number', oab_number), ('email', email), ('phone', phone)):
+                        if v:
+                            off[k] = v
+                    OFFICES[office_id] = off
+
+                offices_store.put(office_id, OFFICES[office_id])
+
+            # Cria usuário
+            USERS[email] = {
+                "password_hash": password_hash,
                 "email": email,
-                "phone": phone,
+                "name": name or email.split("@")[0],
+                "user_type": user_type,
+                "roles": roles,
+                "permissions": permissions,
+                "office_id": office_id,
             }
-        else:
-            # atualiza alguns campos se enviados
-            off = OFFICES[office_id]
-            for k, v in (('name', office_name), ('cnpj', cnpj), ('responsible_name', responsible_name),
-                         ('oab_number', oab_number), ('email', email), ('phone', phone)):
-                if v:
-                    off[k] = v
-
-        offices_store.save(OFFICES)
-
-        # Cria usuário
-        USERS[email] = {
-            "password_hash": hash_password(password),
-            "email": email,
-            "name": name or email.split("@")[0],
-            "user_type": user_type,
-            "roles": roles,
-            "permissions": permissions,
-            "office_id": office_id,
-        }
-        users_store.save(USERS)
+            users_store.put(email, USERS[email])
 
         return jsonify({
             "user": {
@@ -262,19 +251,25 @@ def create_app() -> Flask:
         if not user:
             return jsonify({"error": "Credenciais inválidas"}), 401
 
-        if user.get("password_hash") != hash_password(password):
-            return jsonify({"error": "Credenciais inválidas"}), 401
-
-        # Garante office_id e campos novos para contas antigas
-        if not user.get("office_id"):
-            import uuid as _uuid
-            user["office_id"] = _uuid.uuid4().hex[:12]
-        if not user.get("email"):
-            user["email"] = email
-        if not user.get("user_type"):
-            user["user_type"] = _user_type_from_email(email)
-        USERS[email] = user
-        users_store.save(USERS)
+        try:
+            if not hasher.verify(password, user.get("password_hash", "")):
+                return jsonify({"error": "Credenciais inválidas"}), 401
+            # Hash antigo (SHA-256 sem sal) ou de custo diferente: regrava no formato atual
+            password_hash = hasher.hash(password) if needs_rehash(user["password_hash"]) else None
+        except PasswordHasherBusy:
+            return jsonify(BUSY_RESPONSE), 503, {"Retry-After": "1"}
+
+        # Contas antigas já foram migradas na subida; só grava se algo faltar
+        # (registro vindo de um worker de versão anterior) ou se o hash mudou.
+        # Login comum não escreve.
+        if _backfill_user(email, user) or password_hash:
+            with users_store.write():
+                user = dict(USERS.get(email, user))
+                _backfill_user(email, user)
+                if password_hash:
+                    user["password_hash"] = password_hash
+                USERS[email] = user
+                users_store.put(email, user)
 
         return jsonify({
             "user": {
@@ -308,26 +303,34 @@ def create_app() -> Flask:
         if len(password) < 6:
             return jsonify({"error": "Senha deve ter no mínimo 6 caracteres"}), 400
         
-        if email in USERS:
-            return jsonify({"error": "Email já cadastrado"}), 409
-
         # Detecta tipo automaticamente pelo domínio
         user_type = _user_type_from_email(email)
         if not user_type:
             return jsonify({"error": "Domínio de e-mail não permitido. Use @admin.com, @advogado.com ou @estagiario.com"}), 400
+        if email in USERS:
+            return jsonify({"error": "Email já cadastrado"}), 409
+        # Derivação (cara) fora do lock exclusivo
+        try:
+            password_hash = hasher.hash(password)
+        except PasswordHasherBusy:
+            return jsonify(BUSY_RESPONSE), 503, {"Retry-After": "1"}
 
-        roles, permissions = _roles_permissions_from_user_type(user_type)
+        with users_store.exclusive():
+            if email in USERS:
+                return jsonify({"error": "Email já cadastrado"}), 409
 
-        USERS[email] = {
-            "password_hash": hash_password(password),
-            "email": email,
-            "name": name or email.split("@")[0],
-            "user_type": user_type,
-            "roles": roles,
-            "permissions": permissions,
-            "office_id": office_id,
-        }
-        users_store.save(USERS)
+            roles, permissions = _roles_permissions_from_user_type(user_type)
+
+            USERS[email] = {
+                "password_hash": password_hash,
+                "email": email,
+                "name": name or email.split("@")[0],
+                "user_type": user_type,
+                "roles": roles,
+                "permissions": permissions,
+                "office_id": office_id,
+            }
+            users_store.put(email, USERS[email])
 
         return jsonify({
             "user": {
@@ -50,10 +50,14 @@ class BaseService:
             return {
                 "status": "ok",
                 "service": self.service_name,
-                "count": len(self.data_store),
+                "count": self.record_count(),
                 "timestamp": datetime.now(timezone(timedelta(hours=-3))).isoformat()
             }, 200
     
+    def record_count(self) -> int:
+        """Quantidade de registros informada no /health"""
+        return len(self.data_store)
+
     def generate_id(self) -> str:
         """Gera um ID único"""
         return str(uuid.uuid4())[:8]
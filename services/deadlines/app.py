@@ -2,48 +2,28 @@
 Serviço de Prazos isolado com persistência JSON
 """
 
+import functools
 import os
-import json
-import threading
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
 from flask import Flask, request, jsonify
 
+from services.indexes import DateIndex
+from services.pagination import list_response
+from services.records import CompactRecord, as_dicts
+from services.storage import open_store, sync_before_request
+from services.versioning import CollectionVersions
 
-class JsonListStore:
-    """Persistência simples em arquivo JSON (lista de dicts)."""
 
-    def __init__(self, file_path: str, default: Optional[List[Dict[str, Any]]] = None):
-        self.file_path = file_path
-        self.default: List[Dict[str, Any]] = default or []
-        self._lock = threading.Lock()
-        self._ensure_storage()
+class Deadline(CompactRecord):
+    """Prazo em memória (campos na ordem do JSON da API)"""
 
-    def _ensure_storage(self) -> None:
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        if not os.path.exists(self.file_path):
-            self._atomic_write(self.default)
+    __slots__ = ("id", "process_id", "due_date", "description", "created_at", "office_id")
+    DATE_FIELDS = ("due_date",)
+    INTERNED_FIELDS = ("process_id", "office_id")
 
-    def _atomic_write(self, data: List[Dict[str, Any]]) -> None:
-        temp_path = f"{self.file_path}.tmp"
-        with open(temp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        os.replace(temp_path, self.file_path)
 
-    def load(self) -> List[Dict[str, Any]]:
-        with self._lock:
-            try:
-                with open(self.file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if not isinstance(data, list):
-                    return self.default.copy()
-                return data
-            except Exception:
-                return self.default.copy()
-
-    def save(self, data: List[Dict[str, Any]]) -> None:
-        with self._lock:
-            self._atomic_write(data)
+SORT_FIELDS = ("created_at", "due_date", "process_id")
 
 
 def create_app() -> Flask:
@@ -52,8 +32,18 @@ def create_app() -> Flask:
     base_dir = os.path.dirname(__file__)
     data_dir = os.path.join(base_dir, "data")
     store_file = os.path.join(data_dir, "deadlines.json")
-    store = JsonListStore(store_file, default=[])
-    DEADLINES: List[Dict[str, Any]] = store.load()
+    store = open_store(store_file, default=[], name="deadlines", decode=Deadline.from_dict, by_office=True)
+    versions = CollectionVersions("deadlines", store)
+
+    # Motores em memória (json/log): vencimentos ordenados por escritório,
+    # para /today e from/to sem varrer a lista. No SQLite, a coluna indexada
+    # `due_date` do banco responde essas consultas
+    by_due_date = DateIndex("due_date") if store.in_memory else None
+
+    if by_due_date is not None:
+        # Registros lidos do disco: a coleção inteira ou, com sharding, a de um escritório
+        store.load_with(by_due_date.extend)
+    sync_before_request(app, store)
 
     import uuid, datetime
 
@@ -67,50 +57,97 @@ def create_app() -> Flask:
 
     @app.get("/health")
     def health():
-        return {"status": "ok", "count": len(DEADLINES)}, 200
+        return {"status": "ok", "count": store.count()}, 200
+
+    # Operações compartilhadas entre as rotas HTTP e o servicer gRPC
+
+    def query_deadlines(office_id: Optional[str]) -> List[Dict[str, Any]]:
+        # Chamadas gRPC não passam pelo before_request: abre o shard aqui
+        store.open_scope(office_id)
+        return list(as_dicts(iter_deadlines(office_id)))
+
+    def by_keys(office_id: Optional[str], keys: List[str]) -> Iterator[Dict[str, Any]]:
+        items = (store.get(key, office_id) for key in keys)
+        return (item for item in items if item is not None)
+
+    def select_deadlines(
+        office_id: Optional[str], date_from: Optional[str] = None, date_to: Optional[str] = None, **page: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Consulta ao store (SQLite); `page`: ordem, cursor e limite da listagem"""
+        between = ("due_date", date_from, date_to) if date_from or date_to else None
+        return store.select(between=between, office_id=office_id, **page)
+
+    def iter_deadlines(office_id: Optional[str], date_from: Optional[str] = None, date_to: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Prazos do escritório; com `date_from`/`date_to`, só os que vencem no intervalo (por data)"""
+        if by_due_date is None:
+            return select_deadlines(office_id, date_from, date_to)
+        if date_from or date_to:
+            return by_keys(office_id, by_due_date.range(office_id, date_from, date_to))
+        return store.find(office_id=office_id)
+
+    def add_deadline(data: Dict[str, Any], office_id: Optional[str]) -> Dict[str, Any]:
+        item = Deadline.from_dict({
+            "id": str(uuid.uuid4())[:8],
+            "process_id": data.get("process_id", ""),
+            "due_date": data.get("due_date", ""),
+            "description": data.get("description", ""),
+            "created_at": datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=-3))).isoformat(),
+            "office_id": office_id,
+        })
+        with store.write(office_id):
+            if by_due_date is not None:
+                by_due_date.add(item)
+            store.put(item["id"], item)
+        versions.bump(office_id)
+        return item.to_dict()
+
+    app.extensions["deadlines"] = {"query": query_deadlines, "add": add_deadline}
 
     @app.get("/deadlines")
     def list_deadlines():
         office_id = request.headers.get("X-Office-ID")
-        if office_id:
-            return jsonify([d for d in DEADLINES if d.get("office_id") == office_id]), 200
-        return jsonify(DEADLINES), 200
+        date_from = request.args.get("from")
+        date_to = request.args.get("to")
+        return list_response(
+            versions, office_id, lambda: iter_deadlines(office_id, date_from, date_to), SORT_FIELDS,
+            select=None if by_due_date is not None else functools.partial(select_deadlines, office_id, date_from, date_to)
+        )
 
     @app.post("/deadlines")
     def create_deadline():
         data = request.get_json(force=True)
-        office_id = request.headers.get("X-Office-ID")
-        item = {
-            "id": str(uuid.uuid4())[:8],
-            "process_id": data.get("process_id", ""),
-            "due_date": data.get("due_date", ""),
-            "description": data.get("description", ""),
-            "created_at": datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=-3))).isoformat(),
-            "office_id": office_id,
-        }
-        DEADLINES.append(item)
-        store.save(DEADLINES)
+        item = add_deadline(data, request.headers.get("X-Office-ID"))
         return jsonify(item), 201
 
     @app.get("/deadlines/today")
     def deadlines_today():
         today = datetime.date.today().isoformat()
         office_id = request.headers.get("X-Office-ID")
-        todays = [d for d in DEADLINES if d.get("due_date") == today and (not office_id or d.get("office_id") == office_id)]
+        if by_due_date is None:
+            items = store.select(order_by="due_date", office_id=office_id, due_date=today)
+        else:
+            items = by_keys(office_id, by_due_date.equal(office_id, today))
+        todays = list(as_dicts(items))
         return jsonify({"date": today, "items": todays}), 200
 
     @app.delete("/deadlines/<deadline_id>")
     def delete_deadline(deadline_id):
-        nonlocal DEADLINES
-        for i, deadline in enumerate(DEADLINES):
-            if deadline.get("id") == deadline_id:
-                deleted_deadline = DEADLINES.pop(i)
-                store.save(DEADLINES)
-                return jsonify({
-                    "message": "Deadline deleted successfully",
-                    "deleted_deadline": deleted_deadline
-                }), 200
-        return jsonify({"error": "Deadline not found"}), 404
+        current = store.get(deadline_id)
+        if current is None:
+            return jsonify({"error": "Deadline not found"}), 404
+        owner = current.get("office_id")
+        with store.write(owner):
+            deleted_deadline = store.get(deadline_id, owner)
+            if deleted_deadline is None:
+                return jsonify({"error": "Deadline not found"}), 404
+            if by_due_date is not None:
+                by_due_date.remove(deleted_deadline)
+            store.delete(deadline_id)
+        versions.bump(deleted_deadline.get("office_id"))
+        return jsonify({
+            "message": "Deadline deleted successfully",
+            "deleted_deadline": deleted_deadline.to_dict()
+        }), 200
 
     return app
 
@@ -118,6 +155,10 @@ def create_app() -> Flask:
 if __name__ == "__main__":
     PORT = int(os.getenv("DEADLINES_PORT", "5002"))
     app = create_app()
+    from services.grpc_support import GRPC_AVAILABLE, start_grpc_server
+    if GRPC_AVAILABLE:
+        from services.deadlines.grpc_server import register
+        grpc_server = start_grpc_server("deadlines", 50002, register, app, debug=True)
     print(f"Deadlines Service on {PORT}")
     app.run(port=PORT, host="0.0.0.0", debug=True)
 
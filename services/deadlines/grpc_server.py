@@ -0,0 +1,30 @@
+"""
+Servicer gRPC do serviço de Prazos
+
+Usa as operações que `create_app` registra em `app.extensions["deadlines"]`,
+as mesmas das rotas HTTP (mesma lista em memória e mesmo arquivo).
+"""
+
+from services.grpc_support import office_from_context
+from protos import deadlines_pb2, deadlines_pb2_grpc, message_from_dict, message_to_dict
+
+
+class DeadlinesServicer(deadlines_pb2_grpc.DeadlinesServicer):
+    """Implementação do serviço `legal.deadlines.Deadlines`"""
+
+    def __init__(self, app):
+        self.ops = app.extensions["deadlines"]
+
+    def ListDeadlines(self, request, context):
+        items = self.ops["query"](office_from_context(context))
+        return deadlines_pb2.DeadlineList(
+            items=[message_from_dict(deadlines_pb2.Deadline, d) for d in items]
+        )
+
+    def CreateDeadline(self, request, context):
+        item = self.ops["add"](message_to_dict(request), office_from_context(context))
+        return message_from_dict(deadlines_pb2.Deadline, item)
+
+
+def register(server, app) -> None:
+    deadlines_pb2_grpc.add_DeadlinesServicer_to_server(DeadlinesServicer(app), server)
@@ -2,50 +2,19 @@
 Serviço de Documentos isolado com persistência JSON
 """
 
+import functools
 import os
-import json
-import threading
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 from flask import request
 
 from services.base_service import BaseService
+from services.indexes import TextIndex
+from services.pagination import DEFAULT_LIMIT, MAX_LIMIT, list_response
+from services.storage import open_store, sync_before_request
+from services.versioning import CollectionVersions
 
-
-class JsonStore:
-    """Persistência simples em arquivo JSON (dict)."""
-
-    def __init__(self, file_path: str, default: Optional[Dict[str, Any]] = None):
-        self.file_path = file_path
-        self.default: Dict[str, Any] = default or {}
-        self._lock = threading.Lock()
-        self._ensure_storage()
-
-    def _ensure_storage(self) -> None:
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        if not os.path.exists(self.file_path):
-            self._atomic_write(self.default)
-
-    def _atomic_write(self, data: Dict[str, Any]) -> None:
-        temp_path = f"{self.file_path}.tmp"
-        with open(temp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        os.replace(temp_path, self.file_path)
-
-    def load(self) -> Dict[str, Any]:
-        with self._lock:
-            try:
-                with open(self.file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if not isinstance(data, dict):
-                    return self.default.copy()
-                return data
-            except Exception:
-                return self.default.copy()
-
-    def save(self, data: Dict[str, Any]) -> None:
-        with self._lock:
-            self._atomic_write(data)
+SORT_FIELDS = ("created_at", "updated_at", "title", "author")
 
 
 class DocumentsService(BaseService):
@@ -59,79 +28,135 @@ class DocumentsService(BaseService):
         base_dir = os.path.dirname(__file__)
         data_dir = os.path.join(base_dir, "data")
         store_file = os.path.join(data_dir, "documents.json")
-        self.store = JsonStore(store_file, default={})
-        self.data_store = self.store.load()
+        # Os documentos ficam no store (em memória só nos motores json/log); aqui, só o índice de busca
+        self.store = open_store(store_file, default={}, name="documents", by_office=True)
+        self.versions = CollectionVersions("documents", self.store)
+        # Busca por palavras do título (peso 2) e do conteúdo
+        self.search_index = TextIndex({"title": 2, "content": 1})
+        self.store.load_with(self._load_records)
+        # Vários workers (SQLite): aplica ao índice as mudanças dos outros antes de cada requisição
+        self.store.subscribe(self._apply_search_changes)
+        sync_before_request(self.app, self.store)
 
         self._register_routes()
 
-    def _persist(self) -> None:
-        self.store.save(self.data_store)
+    def record_count(self) -> int:
+        return self.store.count()
+
+    # Operações compartilhadas entre as rotas HTTP e o servicer gRPC
+
+    def iter_documents(self, office_id: Optional[str], process_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Documentos do escritório (todos, se `office_id` vazio), com filtro opcional por processo"""
+        return self.store.find(office_id=office_id, process_id=process_id)
+
+    def query_documents(self, office_id: Optional[str], process_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        # Chamadas gRPC não passam pelo before_request: abre o shard aqui
+        self.store.open_scope(office_id)
+        return list(self.iter_documents(office_id, process_id))
+
+    def _load_records(self, records: Dict[str, Any]) -> None:
+        """Registros lidos do disco: a coleção inteira ou, com sharding, a de um escritório (em lotes, no SQLite)"""
+        for doc_id, document in records.items():
+            self.search_index.add(doc_id, document)
+
+    def _apply_search_changes(self, changes: Dict[str, Any], reset: bool) -> None:
+        if reset:
+            self.search_index.rebuild(changes.items())
+            return
+        for doc_id, document in changes.items():
+            if document is None:
+                self.search_index.remove(doc_id)
+            else:
+                self.search_index.add(doc_id, document)
+
+    def search_documents(self, query: str, office_id: Optional[str], limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """Documentos do escritório mais relevantes para `query` (BM25), com a pontuação"""
+        results = []
+        for doc_id, score in self.search_index.search(query, office_id, limit):
+            document = self.store.get(doc_id, office_id)
+            if document is not None:
+                results.append({**document, "score": round(score, 4)})
+        return results
+
+    def add_document(self, data: Dict[str, Any], office_id: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Valida, cria e persiste um documento; retorna (documento, erro)"""
+        error = self.validate_required_fields(data, ["title", "content", "author"])
+        if error:
+            return None, error
+
+        doc_id = self.generate_id()
+        document = {
+            "id": doc_id,
+            "title": self.sanitize_string(data["title"]),
+            "content": self.sanitize_string(data["content"]),
+            "author": self.sanitize_string(data["author"]),
+            "process_id": data.get("process_id"),
+            "created_at": self._get_current_timestamp(),
+            "updated_at": self._get_current_timestamp(),
+            "office_id": office_id,
+        }
+
+        with self.store.write(office_id):
+            self.search_index.add(doc_id, document)
+            self.store.put(doc_id, document)
+        self.versions.bump(office_id)
+        return document, None
 
     def _register_routes(self):
         """Registra rotas específicas do serviço de documentos"""
 
         @self.app.get("/documents")
         def list_documents():
-            self.log_request("LIST_DOCUMENTS", f"Total: {len(self.data_store)}")
-
             process_id = request.args.get("process_id")
             office_id = request.headers.get("X-Office-ID")
-            if process_id:
-                filtered_docs = [
-                    doc for doc in self.data_store.values()
-                    if doc.get("process_id") == process_id and (not office_id or doc.get("office_id") == office_id)
-                ]
-                return self.create_success_response(filtered_docs)
-
-            if office_id:
-                return self.create_success_response([
-                    d for d in self.data_store.values() if d.get("office_id") == office_id
-                ])
+            self.log_request("LIST_DOCUMENTS", f"Office: {office_id}, Process: {process_id}")
 
-            return self.create_success_response(list(self.data_store.values()))
+            select = None
+            if not self.store.in_memory:
+                select = functools.partial(self.store.select, office_id=office_id, process_id=process_id)
+            return list_response(
+                self.versions, office_id, lambda: self.iter_documents(office_id, process_id), SORT_FIELDS,
+                select=select
+            )
 
         @self.app.post("/documents")
         def create_document():
             try:
                 data = request.get_json(force=True)
-
-                required_fields = ["title", "content", "author"]
-                error = self.validate_required_fields(data, required_fields)
+                document, error = self.add_document(data, request.headers.get("X-Office-ID"))
                 if error:
                     return self.create_error_response(error, 400)
 
-                doc_id = self.generate_id()
-                office_id = request.headers.get("X-Office-ID")
-                document = {
-                    "id": doc_id,
-                    "title": self.sanitize_string(data["title"]),
-                    "content": self.sanitize_string(data["content"]),
-                    "author": self.sanitize_string(data["author"]),
-                    "process_id": data.get("process_id"),
-                    "created_at": self._get_current_timestamp(),
-                    "updated_at": self._get_current_timestamp(),
-                    "office_id": office_id,
-                }
-
-                self.data_store[doc_id] = document
-                self._persist()
-
-                self.log_request("CREATE_DOCUMENT", f"ID: {doc_id}, Title: {document['title']}")
+                self.log_request("CREATE_DOCUMENT", f"ID: {document['id']}, Title: {document['title']}")
                 return self.create_success_response(document, 201)
 
             except Exception as e:
                 self.logger.error(f"Error creating document: {str(e)}")
                 return self.create_error_response("Failed to create document", 500)
 
+        @self.app.get("/documents/search")
+        def search_documents():
+            query = request.args.get("q", "").strip()
+            if not query:
+                return self.create_error_response("Parameter 'q' is required", 400)
+            try:
+                limit = min(max(int(request.args.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+            except ValueError:
+                return self.create_error_response("Parameter 'limit' must be an integer", 400)
+
+            office_id = request.headers.get("X-Office-ID")
+            items = self.search_documents(query, office_id, limit)
+            self.log_request("SEARCH_DOCUMENTS", f"Query: {query}, Results: {len(items)}")
+            return self.create_success_response({"query": query, "items": items})
+
         @self.app.get("/documents/<doc_id>")
         def get_document(doc_id: str):
             self.log_request("GET_DOCUMENT", f"ID: {doc_id}")
 
-            if doc_id not in self.data_store:
-                return self.create_error_response("Document not found", 404)
-
             office_id = request.headers.get("X-Office-ID")
-            doc = self.data_store[doc_id]
+            doc = self.store.get(doc_id, office_id)
+            if doc is None:
+                return self.create_error_response("Document not found", 404)
             if office_id and doc.get("office_id") != office_id:
                 return self.create_error_response("Document not found", 404)
             return self.create_success_response(doc)
@@ -139,12 +164,11 @@ class DocumentsService(BaseService):
         @self.app.put("/documents/<doc_id>")
         def update_document(doc_id: str):
             try:
-                if doc_id not in self.data_store:
-                    return self.create_error_response("Document not found", 404)
-
                 # Enforce office isolation on update
                 office_id = request.headers.get("X-Office-ID")
-                current_doc = self.data_store[doc_id]
+                current_doc = self.store.get(doc_id, office_id)
+                if current_doc is None:
+                    return self.create_error_response("Document not found", 404)
                 if office_id and current_doc.get("office_id") != office_id:
                     return self.create_error_response("Document not found", 404)
 
@@ -157,8 +181,10 @@ class DocumentsService(BaseService):
                         document[field] = self.sanitize_string(str(data[field]))
 
                 document["updated_at"] = self._get_current_timestamp()
-                self.data_store[doc_id] = document
-                self._persist()
+                with self.store.write(document.get("office_id")):
+                    self.search_index.add(doc_id, document)
+                    self.store.put(doc_id, document)
+                self.versions.bump(document.get("office_id"))
 
                 self.log_request("UPDATE_DOCUMENT", f"ID: {doc_id}")
                 return self.create_success_response(document)
@@ -171,11 +197,18 @@ class DocumentsService(BaseService):
         def delete_document(doc_id: str):
             self.log_request("DELETE_DOCUMENT", f"ID: {doc_id}")
 
-            if doc_id not in self.data_store:
+            current_doc = self.store.get(doc_id)
+            if current_doc is None:
                 return self.create_error_response("Document not found", 404)
 
-            deleted_doc = self.data_store.pop(doc_id)
-            self._persist()
+            owner = current_doc.get("office_id")
+            with self.store.write(owner):
+                deleted_doc = self.store.get(doc_id, owner)
+                if deleted_doc is None:
+                    return self.create_error_response("Document not found", 404)
+                self.search_index.remove(doc_id)
+                self.store.delete(doc_id)
+            self.versions.bump(deleted_doc.get("office_id"))
 
             return self.create_success_response({
                 "message": "Document deleted successfully",
@@ -187,10 +220,15 @@ class DocumentsService(BaseService):
         return datetime.now(timezone(timedelta(hours=-3))).isoformat()
 
 
-# Instância do serviço
+# Instância do serviço (`app` para servidores WSGI: gunicorn services.documents.app:app)
 service = DocumentsService()
+app = service.app
 
 if __name__ == "__main__":
+    from services.grpc_support import GRPC_AVAILABLE, start_grpc_server
+    if GRPC_AVAILABLE:
+        from services.documents.grpc_server import register
+        grpc_server = start_grpc_server("documents", 50001, register, service, debug=True)
     print(f"Documents Service on {service.port}")
     service.run()
 
@@ -0,0 +1,44 @@
+"""
+Servicer gRPC do serviço de Documentos
+
+Opera sobre a mesma instância de DocumentsService das rotas HTTP
+(mesmo armazenamento, mesmas validações e mesmo versionamento).
+"""
+
+from services.grpc_support import grpc, office_from_context
+from protos import documents_pb2, documents_pb2_grpc, message_from_dict, message_to_dict
+
+
+class DocumentsServicer(documents_pb2_grpc.DocumentsServicer):
+    """Implementação do serviço `legal.documents.Documents`"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def ListDocuments(self, request, context):
+        office_id = office_from_context(context)
+        process_id = request.process_id if request.HasField("process_id") else None
+        items = self.service.query_documents(office_id, process_id)
+        return documents_pb2.DocumentList(
+            items=[message_from_dict(documents_pb2.Document, doc) for doc in items]
+        )
+
+    def GetDocument(self, request, context):
+        office_id = office_from_context(context)
+        doc = self.service.store.get(request.id, office_id)
+        if doc is None or (office_id and doc.get("office_id") != office_id):
+            context.abort(grpc.StatusCode.NOT_FOUND, "Document not found")
+        return message_from_dict(documents_pb2.Document, doc)
+
+    def CreateDocument(self, request, context):
+        document, error = self.service.add_document(
+            message_to_dict(request), office_from_context(context)
+        )
+        if error:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, error)
+        self.service.logger.info(f"CREATE_DOCUMENT - gRPC - ID: {document['id']}")
+        return message_from_dict(documents_pb2.Document, document)
+
+
+def register(server, service) -> None:
+    documents_pb2_grpc.add_DocumentsServicer_to_server(DocumentsServicer(service), server)
@@ -0,0 +1,71 @@
+"""
+Servidor gRPC dos microserviços
+
+Cada serviço com contrato em `protos/` (documentos, prazos e audiências)
+sobe, ao lado do Flask, um servidor gRPC que opera sobre o mesmo
+armazenamento das rotas HTTP. O gRPC é opcional: sem `grpcio` instalado
+(ou com GRPC_SERVER_ENABLED=false) o serviço segue apenas com HTTP.
+"""
+
+import logging
+import os
+from concurrent import futures
+from typing import Any, Callable, Optional
+
+# Imports gRPC (opcionais)
+try:
+    import grpc
+    GRPC_AVAILABLE = True
+except ImportError:
+    GRPC_AVAILABLE = False
+    grpc = None
+
+logger = logging.getLogger(__name__)
+
+
+def office_from_context(context) -> Optional[str]:
+    """Escritório (tenant) da chamada, enviado como metadata `x-office-id`"""
+    for key, value in context.invocation_metadata():
+        if key == "x-office-id":
+            return value or None
+    return None
+
+
+def start_grpc_server(
+    service_name: str,
+    default_port: int,
+    register: Callable[[Any, Any], None],
+    target: Any,
+    debug: bool = False
+):
+    """
+    Sobe o servidor gRPC do serviço em background
+
+    Args:
+        service_name: Nome do serviço (define a variável <NOME>_GRPC_PORT)
+        default_port: Porta usada quando a variável não está definida
+        register: Função que registra o servicer no servidor
+        target: Estado compartilhado com as rotas HTTP, repassado a `register`
+        debug: Se o Flask roda com reloader (o servidor só sobe no processo filho)
+
+    Returns:
+        O servidor iniciado, ou None se o gRPC estiver indisponível/desabilitado.
+        Guarde a referência: o servidor é encerrado quando coletado.
+    """
+    if not GRPC_AVAILABLE:
+        logger.info("gRPC não está disponível. Para usar gRPC, instale: pip install -r requirements-grpc.txt")
+        return None
+    if os.getenv("GRPC_SERVER_ENABLED", "true").lower() != "true":
+        return None
+    # Com o reloader do Flask o módulo roda duas vezes; a porta é do processo filho
+    if debug and os.environ.get("WERKZEUG_RUN_MAIN") != "true":
+        return None
+
+    port = int(os.getenv(f"{service_name.upper()}_GRPC_PORT", str(default_port)))
+    max_workers = int(os.getenv("GRPC_SERVER_MAX_WORKERS", "10"))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    register(server, target)
+    server.add_insecure_port(f"0.0.0.0:{port}")
+    server.start()
+    logger.info(f"gRPC {service_name} on {port}")
+    return server
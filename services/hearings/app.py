@@ -2,48 +2,28 @@
 Serviço de Audiências isolado com persistência JSON
 """
 
+import functools
 import os
-import json
-import threading
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
 from flask import Flask, request, jsonify
 
+from services.indexes import DateIndex
+from services.pagination import list_response
+from services.records import CompactRecord, as_dicts
+from services.storage import open_store, sync_before_request
+from services.versioning import CollectionVersions
 
-class JsonListStore:
-    """Persistência simples em arquivo JSON (lista de dicts)."""
 
-    def __init__(self, file_path: str, default: Optional[List[Dict[str, Any]]] = None):
-        self.file_path = file_path
-        self.default: List[Dict[str, Any]] = default or []
-        self._lock = threading.Lock()
-        self._ensure_storage()
+class Hearing(CompactRecord):
+    """Audiência em memória (campos na ordem do JSON da API)"""
 
-    def _ensure_storage(self) -> None:
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        if not os.path.exists(self.file_path):
-            self._atomic_write(self.default)
+    __slots__ = ("id", "process_id", "date", "courtroom", "description", "created_at", "office_id")
+    DATE_FIELDS = ("date",)
+    INTERNED_FIELDS = ("process_id", "courtroom", "office_id")
 
-    def _atomic_write(self, data: List[Dict[str, Any]]) -> None:
-        temp_path = f"{self.file_path}.tmp"
-        with open(temp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        os.replace(temp_path, self.file_path)
 
-    def load(self) -> List[Dict[str, Any]]:
-        with self._lock:
-            try:
-                with open(self.file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if not isinstance(data, list):
-                    return self.default.copy()
-                return data
-            except Exception:
-                return self.default.copy()
-
-    def save(self, data: List[Dict[str, Any]]) -> None:
-        with self._lock:
-            self._atomic_write(data)
+SORT_FIELDS = ("created_at", "date", "courtroom", "process_id")
 
 
 def create_app() -> Flask:
@@ -52,8 +32,18 @@ def create_app() -> Flask:
     base_dir = os.path.dirname(__file__)
     data_dir = os.path.join(base_dir, "data")
     store_file = os.path.join(data_dir, "hearings.json")
-    store = JsonListStore(store_file, default=[])
-    HEARINGS: List[Dict[str, Any]] = store.load()
+    store = open_store(store_file, default=[], name="hearings", decode=Hearing.from_dict, by_office=True)
+    versions = CollectionVersions("hearings", store)
+
+    # Motores em memória (json/log): datas ordenadas por escritório, para
+    # /today, date= e from/to sem varrer a lista. No SQLite, a coluna
+    # indexada `date` do banco responde essas consultas
+    by_date = DateIndex("date") if store.in_memory else None
+
+    if by_date is not None:
+        # Registros lidos do disco: a coleção inteira ou, com sharding, a de um escritório
+        store.load_with(by_date.extend)
+    sync_before_request(app, store)
 
     import uuid
     import datetime
@@ -68,13 +58,50 @@ def create_app() -> Flask:
 
     @app.get("/health")
     def health():
-        return {"status": "ok", "count": len(HEARINGS)}, 200
+        return {"status": "ok", "count": store.count()}, 200
+
+    # Operações compartilhadas entre as rotas HTTP e o servicer gRPC
+
+    def query_hearings(office_id: Optional[str], date: Optional[str] = None, process_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        # Chamadas gRPC não passam pelo before_request: abre o shard aqui
+        store.open_scope(office_id)
+        return list(as_dicts(iter_hearings(office_id, date, process_id)))
+
+    def by_keys(office_id: Optional[str], keys: List[str], process_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        for item in (store.get(key, office_id) for key in keys):
+            if item is not None and (not process_id or item.get("process_id") == process_id):
+                yield item
+
+    def select_hearings(
+        office_id: Optional[str],
+        date: Optional[str] = None,
+        process_id: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        **page: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Consulta ao store (SQLite); `page`: ordem, cursor e limite da listagem"""
+        between = ("date", date_from, date_to) if (date_from or date_to) and not date else None
+        return store.select(between=between, office_id=office_id, date=date, process_id=process_id, **page)
+
+    def iter_hearings(
+        office_id: Optional[str],
+        date: Optional[str] = None,
+        process_id: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Audiências do escritório; filtros de data usam o índice (resultado em ordem de data)"""
+        if by_date is None:
+            return select_hearings(office_id, date, process_id, date_from, date_to, order_by="date" if date else None)
+        if date:
+            return by_keys(office_id, by_date.equal(office_id, date), process_id)
+        if date_from or date_to:
+            return by_keys(office_id, by_date.range(office_id, date_from, date_to), process_id)
+        return store.find(office_id=office_id, process_id=process_id)
 
-    @app.post("/hearings")
-    def create_hearing():
-        data = request.get_json(force=True)
-        office_id = request.headers.get("X-Office-ID")
-        item = {
+    def add_hearing(data: Dict[str, Any], office_id: Optional[str]) -> Dict[str, Any]:
+        item = Hearing.from_dict({
             "id": str(uuid.uuid4())[:8],
             "process_id": data.get("process_id", ""),
             "date": data.get("date", ""),
@@ -82,44 +109,66 @@ def create_app() -> Flask:
             "description": data.get("description", ""),
             "created_at": datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=-3))).isoformat(),
             "office_id": office_id,
-        }
-        HEARINGS.append(item)
-        store.save(HEARINGS)
+        })
+        with store.write(office_id):
+            if by_date is not None:
+                by_date.add(item)
+            store.put(item["id"], item)
+        versions.bump(office_id)
+        return item.to_dict()
+
+    app.extensions["hearings"] = {"query": query_hearings, "add": add_hearing}
+
+    @app.post("/hearings")
+    def create_hearing():
+        data = request.get_json(force=True)
+        item = add_hearing(data, request.headers.get("X-Office-ID"))
         return jsonify(item), 201
 
     @app.get("/hearings")
     def list_hearings():
         date = request.args.get("date")
         process_id = request.args.get("process_id")
+        date_from = request.args.get("from")
+        date_to = request.args.get("to")
         office_id = request.headers.get("X-Office-ID")
-        items = HEARINGS
-        if date:
-            items = [h for h in items if h.get("date") == date]
-        if process_id:
-            items = [h for h in items if h.get("process_id") == process_id]
-        if office_id:
-            items = [h for h in items if h.get("office_id") == office_id]
-        return jsonify({"items": items}), 200
+
+        return list_response(
+            versions,
+            office_id,
+            lambda: iter_hearings(office_id, date, process_id, date_from, date_to),
+            SORT_FIELDS,
+            envelope="items",
+            select=None if by_date is not None else functools.partial(
+                select_hearings, office_id, date, process_id, date_from, date_to
+            )
+        )
 
     @app.get("/hearings/today")
     def hearings_today():
         today = datetime.date.today().isoformat()
         office_id = request.headers.get("X-Office-ID")
-        todays = [h for h in HEARINGS if h.get("date") == today and (not office_id or h.get("office_id") == office_id)]
+        todays = list(as_dicts(iter_hearings(office_id, date=today)))
         return jsonify({"date": today, "items": todays}), 200
 
     @app.delete("/hearings/<hearing_id>")
     def delete_hearing(hearing_id):
-        nonlocal HEARINGS
-        for i, hearing in enumerate(HEARINGS):
-            if hearing.get("id") == hearing_id:
-                deleted_hearing = HEARINGS.pop(i)
-                store.save(HEARINGS)
-                return jsonify({
-                    "message": "Hearing deleted successfully",
-                    "deleted_hearing": deleted_hearing
-                }), 200
-        return jsonify({"error": "Hearing not found"}), 404
+        current = store.get(hearing_id)
+        if current is None:
+            return jsonify({"error": "Hearing not found"}), 404
+        owner = current.get("office_id")
+        with store.write(owner):
+            deleted_hearing = store.get(hearing_id, owner)
+            if deleted_hearing is None:
+                return jsonify({"error": "Hearing not found"}), 404
+            if by_date is not None:
+                by_date.remove(deleted_hearing)
+            store.delete(hearing_id)
+        versions.bump(deleted_hearing.get("office_id"))
+        return jsonify({
+            "message": "Hearing deleted successfully",
+            "deleted_hearing": deleted_hearing.to_dict()
+        }), 200
 
     return app
 
@@ -127,6 +176,10 @@ def create_app() -> Flask:
 if __name__ == "__main__":
     PORT = int(os.getenv("HEARINGS_PORT", "5003"))
     app = create_app()
+    from services.grpc_support import GRPC_AVAILABLE, start_grpc_server
+    if GRPC_AVAILABLE:
+        from services.hearings.grpc_server import register
+        grpc_server = start_grpc_server("hearings", 50003, register, app, debug=True)
     print(f"Hearings Service on {PORT}")
     app.run(port=PORT, host="0.0.0.0", debug=True)
 
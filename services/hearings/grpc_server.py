@@ -0,0 +1,36 @@
+"""
+Servicer gRPC do serviço de Audiências
+
+Usa as operações que `create_app` registra em `app.extensions["hearings"]`,
+as mesmas das rotas HTTP (mesma lista em memória e mesmo arquivo).
+"""
+
+from services.grpc_support import office_from_context
+from protos import hearings_pb2, hearings_pb2_grpc, message_from_dict, message_to_dict
+
+
+class HearingsServicer(hearings_pb2_grpc.HearingsServicer):
+    """Implementação do serviço `legal.hearings.Hearings`"""
+
+    def __init__(self, app):
+        self.ops = app.extensions["hearings"]
+
+    def ListHearings(self, request, context):
+        items = self.ops["query"](
+            office_from_context(context),
+            date=request.date if request.HasField("date") else None,
+            process_id=request.process_id if request.HasField("process_id") else None,
+        )
+        return hearings_pb2.HearingList(
+            items=[message_from_dict(hearings_pb2.Hearing, h) for h in items]
+        )
+
+    def CreateHearing(self, request, context):
+        # Campos opcionais ausentes ficam de fora para valerem os padrões do serviço
+        data = {k: v for k, v in message_to_dict(request).items() if v is not None}
+        item = self.ops["add"](data, office_from_context(context))
+        return message_from_dict(hearings_pb2.Hearing, item)
+
+
+def register(server, app) -> None:
+    hearings_pb2_grpc.add_HearingsServicer_to_server(HearingsServicer(app), server)
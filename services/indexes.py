@@ -0,0 +1,301 @@
+"""
+Índices em memória sobre as coleções dos serviços
+
+Mantidos pelo próprio serviço a cada mutação e reconstruídos na carga,
+trocam varreduras O(n) da coleção por buscas O(1) (hash),
+O(log n + k) (intervalos de datas) ou pelas listas de ocorrências dos
+termos buscados (texto).
+"""
+
+import bisect
+import heapq
+import math
+import re
+import sys
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class HashIndex:
+    """
+    Valor de um campo → chaves dos registros com esse valor
+
+    As chaves de cada valor ficam na ordem de inserção (dict usado como
+    conjunto ordenado), para que listagens pelo índice mantenham a ordem
+    da coleção.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self._keys: Dict[Any, Dict[str, None]] = {}
+        self._lock = threading.Lock()
+
+    def rebuild(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Recria o índice a partir de pares (chave, registro)"""
+        keys: Dict[Any, Dict[str, None]] = {}
+        for key, record in records:
+            keys.setdefault(record.get(self.field), {})[key] = None
+        with self._lock:
+            self._keys = keys
+
+    def extend(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Adiciona pares (chave, registro), ex.: um escritório carregado sob demanda"""
+        with self._lock:
+            for key, record in records:
+                self._keys.setdefault(record.get(self.field), {})[key] = None
+
+    def add(self, key: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._keys.setdefault(record.get(self.field), {})[key] = None
+
+    def remove(self, key: str, record: Dict[str, Any]) -> None:
+        value = record.get(self.field)
+        with self._lock:
+            keys = self._keys.get(value)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del self._keys[value]
+
+    def update(self, key: str, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        """Reindexa um registro substituído (só se o campo mudou)"""
+        if old.get(self.field) != new.get(self.field):
+            self.remove(key, old)
+            self.add(key, new)
+
+    def get(self, value: Any) -> List[str]:
+        """Chaves com o valor (cópia: pode ser iterada durante mutações)"""
+        with self._lock:
+            return list(self._keys.get(value, ()))
+
+    def first(self, value: Any) -> Optional[str]:
+        with self._lock:
+            return next(iter(self._keys.get(value, ())), None)
+
+
+class DateIndex:
+    """
+    Índice ordenado por data, por escritório (e um global, para consultas
+    sem escritório)
+
+    Cada escritório tem uma lista ordenada de (data, chave) mantida com
+    `bisect`: um intervalo de datas custa O(log n + k). Datas são strings
+    ISO, então a ordem lexicográfica é a cronológica.
+    """
+
+    _MAX = "\U0010ffff"
+
+    def __init__(self, field: str):
+        self.field = field
+        self._offices: Dict[Optional[str], List[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def _entries(self, record: Dict[str, Any]) -> Iterable[Tuple[Optional[str], Tuple[str, str]]]:
+        value = record.get(self.field)
+        if not value:
+            return ()
+        # Datas se repetem entre registros: uma única string por data
+        entry = (sys.intern(str(value)), str(record.get("id")))
+        office_id = record.get("office_id")
+        return ((None, entry),) if office_id is None else ((None, entry), (office_id, entry))
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Recria o índice com uma ordenação por escritório (inserir um a um é O(n²))"""
+        offices: Dict[Optional[str], List[Tuple[str, str]]] = {}
+        for record in records:
+            for office_id, entry in self._entries(record):
+                offices.setdefault(office_id, []).append(entry)
+        for entries in offices.values():
+            entries.sort()
+        with self._lock:
+            self._offices = offices
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Adiciona vários registros (ex.: um escritório carregado sob demanda) com uma ordenação por escritório"""
+        added: Dict[Optional[str], List[Tuple[str, str]]] = {}
+        for record in records:
+            for office_id, entry in self._entries(record):
+                added.setdefault(office_id, []).append(entry)
+        with self._lock:
+            for office_id, entries in added.items():
+                current = self._offices.setdefault(office_id, [])
+                current.extend(entries)
+                current.sort()
+
+    def add(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            for office_id, entry in self._entries(record):
+                bisect.insort(self._offices.setdefault(office_id, []), entry)
+
+    def remove(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            for office_id, entry in self._entries(record):
+                entries = self._offices.get(office_id, [])
+                position = bisect.bisect_left(entries, entry)
+                if position < len(entries) and entries[position] == entry:
+                    del entries[position]
+
+    def range(self, office_id: Optional[str], start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        """
+        Chaves com `start` <= data <= `end`, em ordem de data
+
+        `end` inclui qualquer valor que comece com ele (ex.: "2025-01-31"
+        inclui "2025-01-31T15:00").
+        """
+        with self._lock:
+            entries = self._offices.get(office_id or None, [])
+            lo = bisect.bisect_left(entries, (start,)) if start else 0
+            hi = bisect.bisect_right(entries, (end + self._MAX,)) if end else len(entries)
+            return [key for _, key in entries[lo:hi]]
+
+    def equal(self, office_id: Optional[str], value: str) -> List[str]:
+        """Chaves com data exatamente igual a `value`"""
+        with self._lock:
+            entries = self._offices.get(office_id or None, [])
+            lo = bisect.bisect_left(entries, (value,))
+            hi = bisect.bisect_right(entries, (value, self._MAX))
+            return [key for _, key in entries[lo:hi]]
+
+
+# Palavras frequentes do português, sem acento (não entram no índice)
+STOPWORDS = frozenset("""
+a ao aos as ate com como da das de dela dele deles do dos e ela elas ele eles em entre era essa esse
+esta este eu foi ha isso isto ja lhe mais mas me mesmo meu minha muito na nao nas nem no nos o os ou
+para pela pelas pelo pelos por qual quando que quem se sem ser seu sua sao so tambem te tem um uma
+umas uns voce
+""".split())
+
+# Plurais (sem acento) → singular, do sufixo mais longo ao mais curto
+_PLURALS = (
+    ("oes", "ao"), ("aes", "ao"), ("ais", "al"), ("eis", "el"), ("ois", "ol"),
+    ("res", "r"), ("zes", "z"), ("ns", "m"), ("s", ""),
+)
+_WORD = re.compile(r"\w+")
+
+
+def _strip_accents(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _singular(token: str) -> str:
+    if len(token) <= 3 or token.isdigit():
+        return token
+    for suffix, replacement in _PLURALS:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            return token[:-len(suffix)] + replacement
+    return token
+
+
+def tokenize(text: Any) -> List[str]:
+    """
+    Termos de um texto em português: minúsculas, sem acentos, sem
+    stopwords e no singular ("Contestações" e "contestação" → "contestacao")
+    """
+    if not text:
+        return []
+    words = _WORD.findall(_strip_accents(str(text).lower()))
+    return [sys.intern(_singular(word)) for word in words if word not in STOPWORDS]
+
+
+class TextIndex:
+    """
+    Índice invertido para busca textual, por escritório, com ranking BM25
+
+    Cada escritório tem as próprias listas de ocorrências (termo → chave →
+    frequência) e estatísticas (documentos, tamanho médio): a busca de um
+    escritório só percorre os documentos dele e o ranking não depende dos
+    outros. Busca sem escritório combina todos. `fields` dá o peso de cada
+    campo na frequência do termo (ex.: título conta em dobro).
+    """
+
+    def __init__(self, fields: Dict[str, int], k1: float = 1.2, b: float = 0.75):
+        self.fields = fields
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Optional[str], Dict[str, int]]] = {}
+        # Chave → (escritório, tamanho, termos), para remover sem o registro antigo
+        self._docs: Dict[str, Tuple[Optional[str], int, Tuple[str, ...]]] = {}
+        # Escritório → [documentos, soma dos tamanhos]
+        self._stats: Dict[Optional[str], List[int]] = {}
+        self._lock = threading.Lock()
+
+    def _terms(self, record: Dict[str, Any]) -> Dict[str, int]:
+        frequencies: Dict[str, int] = {}
+        for field, weight in self.fields.items():
+            for term in tokenize(record.get(field)):
+                frequencies[term] = frequencies.get(term, 0) + weight
+        return frequencies
+
+    def _add(self, key: str, record: Dict[str, Any]) -> None:
+        office_id = record.get("office_id")
+        frequencies = self._terms(record)
+        length = sum(frequencies.values())
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {}).setdefault(office_id, {})[key] = frequency
+        self._docs[key] = (office_id, length, tuple(frequencies))
+        stats = self._stats.setdefault(office_id, [0, 0])
+        stats[0] += 1
+        stats[1] += length
+
+    def _remove(self, key: str) -> None:
+        entry = self._docs.pop(key, None)
+        if entry is None:
+            return
+        office_id, length, terms = entry
+        for term in terms:
+            offices = self._postings[term]
+            offices[office_id].pop(key, None)
+            if not offices[office_id]:
+                del offices[office_id]
+                if not offices:
+                    del self._postings[term]
+        stats = self._stats[office_id]
+        stats[0] -= 1
+        stats[1] -= length
+        if not stats[0]:
+            del self._stats[office_id]
+
+    def rebuild(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Recria o índice a partir de pares (chave, registro)"""
+        with self._lock:
+            self._postings, self._docs, self._stats = {}, {}, {}
+            for key, record in records:
+                self._add(key, record)
+
+    def add(self, key: str, record: Dict[str, Any]) -> None:
+        """Indexa (ou reindexa) um registro"""
+        with self._lock:
+            self._remove(key)
+            self._add(key, record)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def search(self, query: str, office_id: Optional[str] = None, limit: int = 20) -> List[Tuple[str, float]]:
+        """(chave, pontuação) dos `limit` documentos mais relevantes para `query`"""
+        terms = dict.fromkeys(tokenize(query))
+        with self._lock:
+            offices = [office_id] if office_id else list(self._stats)
+            count = sum(self._stats[o][0] for o in offices if o in self._stats)
+            if not count or not terms:
+                return []
+            average = sum(self._stats[o][1] for o in offices if o in self._stats) / count or 1
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = [self._postings.get(term, {}).get(o) for o in offices]
+                postings = [p for p in postings if p]
+                frequency = sum(len(p) for p in postings)
+                if not frequency:
+                    continue
+                idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+                for posting in postings:
+                    for key, tf in posting.items():
+                        norm = self.k1 * (1 - self.b + self.b * self._docs[key][1] / average)
+                        scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+
+    def __len__(self) -> int:
+        return len(self._docs)
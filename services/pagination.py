@@ -0,0 +1,185 @@
+"""
+Paginação por cursor e ordenação das listagens
+
+Parâmetros aceitos pelas rotas de listagem:
+
+- `limit`: tamanho da página (1..LIST_MAX_LIMIT)
+- `sort`: campo de ordenação; prefixo `-` para ordem decrescente
+- `cursor`: valor opaco devolvido no header `X-Next-Cursor` da página anterior
+
+Sem nenhum deles a listagem é devolvida inteira, como antes. O cursor
+guarda a chave (campo, id) do último registro entregue, então páginas
+seguintes não se deslocam quando há inserções. Cada página é escolhida
+com `heapq` (top-k, O(n log k)), sem ordenar a coleção inteira; com o
+motor SQLite a própria consulta ordena e limita (`select` do store).
+"""
+
+import base64
+import heapq
+import itertools
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from flask import jsonify, request
+
+from services.records import as_dicts
+
+DEFAULT_LIMIT = int(os.getenv("LIST_DEFAULT_LIMIT", "50"))
+MAX_LIMIT = int(os.getenv("LIST_MAX_LIMIT", "500"))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+SortKey = Tuple[str, str]
+
+
+def encode_cursor(sort: str, key: SortKey) -> str:
+    raw = json.dumps({"s": sort, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, SortKey]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        sort, (value, record_id) = data["s"], data["k"]
+        return str(sort), (str(value), str(record_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+class PageParams:
+    """Parâmetros de paginação/ordenação de uma requisição de listagem"""
+
+    def __init__(self, sort: str, limit: Optional[int], after: Optional[SortKey] = None):
+        self.sort = sort
+        self.field = sort.lstrip("-")
+        self.descending = sort.startswith("-")
+        self.limit = limit
+        self.after = after
+
+    @classmethod
+    def from_request(cls, sort_fields: Sequence[str], default_sort: str) -> Optional["PageParams"]:
+        """
+        Lê `limit`, `cursor` e `sort` da query string
+
+        Returns:
+            None se a listagem não é paginada nem ordenada
+
+        Raises:
+            ValueError: parâmetro inválido (vira 400 na rota)
+        """
+        args = request.args
+        if not any(name in args for name in ("limit", "cursor", "sort")):
+            return None
+
+        sort = args.get("sort") or default_sort
+        if sort.lstrip("-") not in sort_fields:
+            raise ValueError(f"Invalid sort field. Allowed: {', '.join(sort_fields)}")
+
+        after = None
+        cursor = args.get("cursor")
+        if cursor:
+            cursor_sort, after = decode_cursor(cursor)
+            if cursor_sort != sort:
+                raise ValueError("Cursor does not match sort")
+
+        limit = None
+        if "limit" in args:
+            try:
+                limit = int(args["limit"])
+            except ValueError:
+                raise ValueError("limit must be an integer")
+            if limit < 1:
+                raise ValueError("limit must be positive")
+            limit = min(limit, MAX_LIMIT)
+        elif cursor:
+            limit = DEFAULT_LIMIT
+
+        return cls(sort, limit, after)
+
+    def key(self, record: Dict[str, Any]) -> SortKey:
+        value = record.get(self.field)
+        return ("" if value is None else str(value), str(record.get("id", "")))
+
+
+def paginate(records: Iterable[Dict[str, Any]], params: PageParams) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Página de `records` segundo `params`; retorna (itens, próximo cursor)"""
+    key = params.key
+    if params.after is not None:
+        after = params.after
+        if params.descending:
+            records = (r for r in records if key(r) < after)
+        else:
+            records = (r for r in records if key(r) > after)
+
+    if params.limit is None:
+        return sorted(records, key=key, reverse=params.descending), None
+
+    # Um item a mais indica se existe próxima página
+    select = heapq.nlargest if params.descending else heapq.nsmallest
+    return page_of(select(params.limit + 1, records, key=key), params)
+
+
+def page_of(records: Iterable[Dict[str, Any]], params: PageParams) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Página de registros já ordenados e posteriores ao cursor (ex.: consulta com LIMIT limit+1)"""
+    if params.limit is None:
+        return list(records), None
+    items = list(itertools.islice(records, params.limit + 1))
+    if len(items) <= params.limit:
+        return items, None
+    items = items[:params.limit]
+    return items, encode_cursor(params.sort, params.key(items[-1]))
+
+
+def list_response(
+    versions,
+    office_id: Optional[str],
+    records: Callable[[], Iterable[Dict[str, Any]]],
+    sort_fields: Sequence[str],
+    default_sort: str = "created_at",
+    envelope: Optional[str] = None,
+    select: Optional[Callable[..., Iterable[Dict[str, Any]]]] = None
+):
+    """
+    Resposta da listagem: ETag/304, JSON ou NDJSON e paginação opcional
+
+    Args:
+        versions: CollectionVersions da coleção
+        office_id: Escritório da requisição
+        records: Função que itera os registros já filtrados
+        sort_fields: Campos aceitos em `sort`
+        default_sort: Ordenação usada quando só `limit`/`cursor` são informados
+        envelope: Chave do objeto JSON que envolve a lista (ex.: "items")
+        select: Consulta que já ordena e pagina (`store.select` com os filtros
+            da rota), usada em vez de `records` quando há página ou ordenação
+    """
+    try:
+        params = PageParams.from_request(sort_fields, default_sort)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    next_cursor = None
+
+    def page() -> Iterable[Dict[str, Any]]:
+        nonlocal next_cursor
+        if params is None:
+            return as_dicts(records())
+        if select is None:
+            items, next_cursor = paginate(records(), params)
+        else:
+            limit = None if params.limit is None else params.limit + 1
+            rows = select(order_by=params.field, descending=params.descending, after=params.after, limit=limit)
+            items, next_cursor = page_of(rows, params)
+        # Registros compactos só viram dicts aqui, depois de filtrar e paginar
+        return as_dicts(items)
+
+    def build():
+        items = list(page())
+        return jsonify({envelope: items} if envelope else items), 200
+
+    # Cada combinação de filtros/página tem o próprio ETag
+    variant = request.query_string.decode("utf-8", "replace")
+    response = versions.conditional(office_id, build, stream=page, variant=variant)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
@@ -2,49 +2,19 @@
 Serviço de Processos isolado com persistência JSON (CRUD básico)
 """
 
+import functools
 import os
-import json
-import threading
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
 
 from flask import Flask, request, jsonify
 
+from services.indexes import HashIndex
+from services.pagination import list_response
+from services.storage import ShardedStore, open_store, sync_before_request
+from services.versioning import CollectionVersions
 
-class JsonStore:
-    """Persistência simples em arquivo JSON (dict)."""
-
-    def __init__(self, file_path: str, default: Optional[Dict[str, Any]] = None):
-        self.file_path = file_path
-        self.default: Dict[str, Any] = default or {}
-        self._lock = threading.Lock()
-        self._ensure_storage()
-
-    def _ensure_storage(self) -> None:
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        if not os.path.exists(self.file_path):
-            self._atomic_write(self.default)
-
-    def _atomic_write(self, data: Dict[str, Any]) -> None:
-        temp_path = f"{self.file_path}.tmp"
-        with open(temp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        os.replace(temp_path, self.file_path)
-
-    def load(self) -> Dict[str, Any]:
-        with self._lock:
-            try:
-                with open(self.file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if not isinstance(data, dict):
-                    return self.default.copy()
-                return data
-            except Exception:
-                return self.default.copy()
-
-    def save(self, data: Dict[str, Any]) -> None:
-        with self._lock:
-            self._atomic_write(data)
+SORT_FIELDS = ("created_at", "updated_at", "number", "title", "status")
 
 
 def create_app() -> Flask:
@@ -53,8 +23,26 @@ def create_app() -> Flask:
     base_dir = os.path.dirname(__file__)
     data_dir = os.path.join(base_dir, "data")
     store_file = os.path.join(data_dir, "processes.json")
-    store = JsonStore(store_file, default={})
-    PROCESSES: Dict[str, Any] = store.load()
+    # Números são únicos entre todos os escritórios: com sharding, o store os guarda numa tabela da coleção
+    store = open_store(store_file, default={}, name="processes", by_office=True, unique=("number",))
+    versions = CollectionVersions("processes", store)
+
+    # Motores em memória (json/log): índices escritório → ids e (sem sharding,
+    # que já tem a tabela de números) número → id sobre os registros do
+    # store, mantidos a cada mutação. No SQLite as consultas usam as colunas
+    # indexadas do banco e nada fica em memória
+    by_office = HashIndex("office_id") if store.in_memory else None
+    by_number = HashIndex("number") if store.in_memory and not isinstance(store, ShardedStore) else None
+    indexes = tuple(index for index in (by_number, by_office) if index is not None)
+
+    def load_records(records: Dict[str, Any]) -> None:
+        """Registros lidos do disco: a coleção inteira ou, com sharding, a de um escritório"""
+        for index in indexes:
+            index.extend(records.items())
+
+    if store.in_memory:
+        store.load_with(load_records)
+    sync_before_request(app, store)
 
     import uuid, datetime
 
@@ -68,27 +56,38 @@ def create_app() -> Flask:
 
     @app.get("/health")
     def health():
-        return {"status": "ok", "count": len(PROCESSES)}, 200
+        return {"status": "ok", "count": store.count()}, 200
+
+    def iter_processes(office_id: Optional[str]) -> Iterator[Dict[str, Any]]:
+        if not office_id or by_office is None:
+            return store.find(office_id=office_id)
+        procs = (store.get(key, office_id) for key in by_office.get(office_id))
+        return (proc for proc in procs if proc is not None)
+
+    def find_by_number(number: str) -> Optional[Dict[str, Any]]:
+        if by_number is not None:
+            return store.get(by_number.first(number))
+        return store.lookup("number", number)
 
     @app.get("/processes")
     def list_processes():
         # Filtra por escritório se header presente
         office_id = request.headers.get("X-Office-ID")
-        if office_id:
-            filtered = [p for p in PROCESSES.values() if p.get("office_id") == office_id]
-            return jsonify(filtered), 200
-        return jsonify(list(PROCESSES.values())), 200
+
+        return list_response(
+            versions, office_id, lambda: iter_processes(office_id), SORT_FIELDS,
+            select=None if store.in_memory else functools.partial(store.select, office_id=office_id)
+        )
 
     @app.get("/processes/by-number/<process_number>")
     def get_process_by_number(process_number: str):
         """Busca processo pelo número (ex: PROC-001) ao invés do ID interno"""
         office_id = request.headers.get("X-Office-ID")
-        for proc in PROCESSES.values():
-            if proc.get("number") == process_number:
-                if office_id and proc.get("office_id") != office_id:
-                    break  # não revela existência
-                return jsonify(proc), 200
-        return jsonify({"error": "Process not found"}), 404
+        proc = find_by_number(process_number)
+        # Processo de outro escritório: não revela existência
+        if proc is None or (office_id and proc.get("office_id") != office_id):
+            return jsonify({"error": "Process not found"}), 404
+        return jsonify(proc), 200
 
     @app.post("/processes")
     def create_process():
@@ -104,11 +103,6 @@ def create_app() -> Flask:
         if not re.match(r"^PROC-\d+$", number):
             return jsonify({"error": "Formato do número inválido. Use 'PROC-' seguido apenas de números (ex.: PROC-001, PROC-12, PROC-001000)."}), 400
 
-        # Impede duplicidade de número de processo
-        for existing in PROCESSES.values():
-            if existing.get("number") == number:
-                return jsonify({"error": "Já existe um processo com este número. Altere o número e tente novamente."}), 409
-
         proc_id = str(uuid.uuid4())[:8]
         office_id = request.headers.get("X-Office-ID")
         item = {
@@ -121,27 +115,35 @@ def create_app() -> Flask:
             "updated_at": datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=-3))).isoformat(),
             "office_id": office_id,
         }
-        PROCESSES[proc_id] = item
-        store.save(PROCESSES)
+        # Checagem de número duplicado e gravação exclusivas entre threads e workers
+        # (com sharding, sob o lock da coleção: números são únicos entre os escritórios)
+        with store.exclusive_collection(office_id):
+            # Impede duplicidade de número de processo
+            if find_by_number(number) is not None:
+                return jsonify({"error": "Já existe um processo com este número. Altere o número e tente novamente."}), 409
+            for index in indexes:
+                index.add(proc_id, item)
+            store.put(proc_id, item)
+        versions.bump(office_id)
         return jsonify(item), 201
 
     @app.get("/processes/<proc_id>")
     def get_process(proc_id: str):
-        item = PROCESSES.get(proc_id)
+        office_id = request.headers.get("X-Office-ID")
+        item = store.get(proc_id, office_id)
         if not item:
             return jsonify({"error": "Process not found"}), 404
-        office_id = request.headers.get("X-Office-ID")
         if office_id and item.get("office_id") != office_id:
             return jsonify({"error": "Process not found"}), 404
         return jsonify(item), 200
 
     @app.put("/processes/<proc_id>")
     def update_process(proc_id: str):
-        if proc_id not in PROCESSES:
+        office_id = request.headers.get("X-Office-ID")
+        current = store.get(proc_id, office_id)
+        if current is None:
             return jsonify({"error": "Process not found"}), 404
         data = request.get_json(force=True) or {}
-        current = PROCESSES[proc_id]
-        office_id = request.headers.get("X-Office-ID")
         if office_id and current.get("office_id") != office_id:
             return jsonify({"error": "Process not found"}), 404
         item = current.copy()
@@ -151,28 +153,43 @@ def create_app() -> Flask:
             new_number = str(data["number"]).strip().upper()
             if not re.match(r"^PROC-\d+$", new_number):
                 return jsonify({"error": "Formato do número inválido. Use 'PROC-' seguido apenas de números."}), 400
-            for k, existing in PROCESSES.items():
-                if k != proc_id and existing.get("number") == new_number:
-                    return jsonify({"error": "Já existe um processo com este número."}), 409
             item["number"] = new_number
 
         for field in ["title", "description", "status"]:
             if field in data:
                 item[field] = str(data[field])
         item["updated_at"] = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=-3))).isoformat()
-        PROCESSES[proc_id] = item
-        store.save(PROCESSES)
+        with store.exclusive_collection(item.get("office_id")):
+            existing = find_by_number(item["number"])
+            if existing is not None and existing.get("id") != proc_id:
+                return jsonify({"error": "Já existe um processo com este número."}), 409
+            # Reindexa a partir da versão atual (pode ter mudado desde a leitura)
+            previous = store.get(proc_id, item.get("office_id"))
+            if previous is None:
+                return jsonify({"error": "Process not found"}), 404
+            for index in indexes:
+                index.update(proc_id, previous, item)
+            store.put(proc_id, item)
+        versions.bump(item.get("office_id"))
         return jsonify(item), 200
 
     @app.delete("/processes/<proc_id>")
     def delete_process(proc_id: str):
-        if proc_id not in PROCESSES:
-            return jsonify({"error": "Process not found"}), 404
         office_id = request.headers.get("X-Office-ID")
-        if office_id and PROCESSES[proc_id].get("office_id") != office_id:
+        current = store.get(proc_id, office_id)
+        if current is None:
+            return jsonify({"error": "Process not found"}), 404
+        owner = current.get("office_id")
+        if office_id and owner != office_id:
             return jsonify({"error": "Process not found"}), 404
-        deleted = PROCESSES.pop(proc_id)
-        store.save(PROCESSES)
+        with store.write(owner):
+            deleted = store.get(proc_id, owner)
+            if deleted is None:
+                return jsonify({"error": "Process not found"}), 404
+            for index in indexes:
+                index.remove(proc_id, deleted)
+            store.delete(proc_id)
+        versions.bump(deleted.get("office_id"))
         return jsonify({"message": "Process deleted successfully", "deleted_process": deleted}), 200
 
     return app
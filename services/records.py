@@ -0,0 +1,140 @@
+"""
+Registros compactos em memória
+
+Um dict por registro custa ~350 bytes só de estrutura, fora as strings;
+com milhões de prazos/audiências isso domina a memória do serviço.
+`CompactRecord` guarda os campos em `__slots__` e:
+
+- interna strings que se repetem entre registros (escritório, processo...)
+- guarda datas ISO (`AAAA-MM-DD`) como ordinais inteiros
+
+Os registros expõem a leitura de um dict (`get`, `[]`), então índices,
+filtros e ordenação funcionam sem mudanças; o formato da API (`to_dict`)
+só é montado na resposta. Campos desconhecidos (e valores que não cabem
+na codificação) ficam num dict à parte, preservados como vieram.
+"""
+
+import datetime
+import functools
+import sys
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+_MISSING = object()
+_PLAIN, _DATE, _INTERNED = 0, 1, 2
+
+
+@functools.lru_cache(maxsize=8192)
+def _encode_date(value: str) -> Any:
+    """Ordinal da data se `value` é exatamente `AAAA-MM-DD`; senão o próprio valor"""
+    if len(value) == 10:
+        try:
+            date = datetime.date.fromisoformat(value)
+        except ValueError:
+            return value
+        if date.isoformat() == value:
+            return date.toordinal()
+    return value
+
+
+@functools.lru_cache(maxsize=8192)
+def _decode_date(ordinal: int) -> str:
+    # Poucas datas distintas: a mesma string é reaproveitada entre registros
+    return datetime.date.fromordinal(ordinal).isoformat()
+
+
+class CompactRecord:
+    """
+    Base dos registros compactos
+
+    Subclasses declaram os campos em `__slots__` (na ordem do JSON da API),
+    as datas em `DATE_FIELDS` e os campos repetidos em `INTERNED_FIELDS`.
+    """
+
+    __slots__ = ("_extra",)
+    DATE_FIELDS: Tuple[str, ...] = ()
+    INTERNED_FIELDS: Tuple[str, ...] = ()
+    # Campo → codificação (_PLAIN, _DATE, _INTERNED), calculado por subclasse
+    _KINDS: Dict[str, int] = {}
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._KINDS = {
+            field: _DATE if field in cls.DATE_FIELDS else _INTERNED if field in cls.INTERNED_FIELDS else _PLAIN
+            for field in cls.__slots__
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactRecord":
+        record = cls.__new__(cls)
+        extra: Optional[Dict[str, Any]] = None
+        kinds = cls._KINDS
+        for key, value in data.items():
+            kind = kinds.get(key)
+            if type(value) is str:
+                if kind == _DATE:
+                    value = _encode_date(value)
+                elif kind == _INTERNED:
+                    value = sys.intern(value)
+            elif kind == _DATE:
+                kind = None
+            if kind is None:
+                # Chave desconhecida ou data que não é string: guardada como veio
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            else:
+                setattr(record, key, value)
+        record._extra = extra
+        return record
+
+    def get(self, field: str, default: Any = None) -> Any:
+        value = getattr(self, field, _MISSING) if field in self._KINDS else _MISSING
+        if value is _MISSING:
+            return self._extra.get(field, default) if self._extra else default
+        if type(value) is int and field in self.DATE_FIELDS:
+            return _decode_date(value)
+        return value
+
+    def __getitem__(self, field: str) -> Any:
+        value = self.get(field, _MISSING)
+        if value is _MISSING:
+            raise KeyError(field)
+        return value
+
+    def __contains__(self, field: str) -> bool:
+        return self.get(field, _MISSING) is not _MISSING
+
+    def keys(self) -> Iterator[str]:
+        for field in self.__slots__:
+            if hasattr(self, field):
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Registro no formato da API"""
+        data = {}
+        for field in self.__slots__:
+            value = getattr(self, field, _MISSING)
+            if value is not _MISSING:
+                data[field] = _decode_date(value) if type(value) is int and field in self.DATE_FIELDS else value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CompactRecord):
+            other = other.to_dict()
+        return isinstance(other, dict) and self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def as_dict(record: Any) -> Any:
+    """Formato da API de um registro (compacto ou dict)"""
+    return record.to_dict() if isinstance(record, CompactRecord) else record
+
+
+def as_dicts(records: Iterable[Any]) -> Iterator[Any]:
+    return (as_dict(record) for record in records)
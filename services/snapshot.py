@@ -0,0 +1,208 @@
+"""
+Snapshot binário das coleções
+
+Alternativa ao arquivo JSON indentado (SNAPSHOT_FORMAT=binary): o
+arquivo `<coleção>.snap` tem um cabeçalho (`LSNAP`, versão, codec) e um
+corpo opcionalmente comprimido (gzip, ou zstd com `zstandard` instalado).
+
+O corpo é um JSON compacto em colunas: registros com as mesmas chaves
+formam um grupo, cada campo do grupo vira uma lista de valores, e colunas
+de strings repetidas (escritório, processo, datas...) viram índices numa
+tabela de strings. O parse é bem mais rápido que o do JSON por registro
+(sem chaves repetidas, menos objetos) e as strings repetidas já chegam
+compartilhadas entre registros.
+
+Conversão dos arquivos atuais:
+    python -m services.snapshot services/*/data/*.json [--compression gzip]
+    python -m services.snapshot --to json services/deadlines/data/deadlines.snap
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+Records = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+MAGIC = b"LSNAP"
+VERSION = 1
+CODECS = {"none": 0, "gzip": 1, "zstd": 2}
+SUFFIX = ".snap"
+
+
+def snapshot_path(json_path: str) -> str:
+    """`<coleção>.json` → `<coleção>.snap`"""
+    return f"{os.path.splitext(json_path)[0]}{SUFFIX}"
+
+
+def _as_dict(row: Any) -> Any:
+    # Registros compactos (services.records) são gravados no formato da API
+    to_dict = getattr(row, "to_dict", None)
+    return row if to_dict is None else to_dict()
+
+
+def _encode_column(values: List[Any], strings: List[str], string_ids: Dict[str, int]) -> list:
+    if all(type(v) is str for v in values) and len(set(values)) <= len(values) // 2:
+        ids = []
+        for value in values:
+            index = string_ids.get(value)
+            if index is None:
+                index = string_ids[value] = len(strings)
+                strings.append(value)
+            ids.append(index)
+        return ["s", ids]
+    return ["v", values]
+
+
+def _encode_table(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Registros → grupos por conjunto de chaves, em colunas"""
+    shapes: Dict[tuple, List[Dict[str, Any]]] = {}
+    order: List[int] = []
+    shape_index: Dict[tuple, int] = {}
+    for row in rows:
+        keys = tuple(row)
+        index = shape_index.get(keys)
+        if index is None:
+            index = shape_index[keys] = len(shapes)
+            shapes[keys] = []
+        shapes[keys].append(row)
+        order.append(index)
+
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+    groups = []
+    for keys, group in shapes.items():
+        groups.append({
+            "fields": list(keys),
+            "count": len(group),
+            "columns": [_encode_column([row[key] for row in group], strings, string_ids) for key in keys],
+        })
+    # Ordem dos registros entre grupos (desnecessária com um grupo só)
+    return {"strings": strings, "groups": groups, "order": order if len(groups) > 1 else None}
+
+
+def _decode_table(table: Dict[str, Any]) -> List[Dict[str, Any]]:
+    strings = table["strings"]
+    groups = []
+    for group in table["groups"]:
+        fields = group["fields"]
+        if not fields:
+            groups.append([{} for _ in range(group["count"])])
+            continue
+        columns = [[strings[i] for i in values] if kind == "s" else values for kind, values in group["columns"]]
+        groups.append([dict(zip(fields, values)) for values in zip(*columns)])
+    if table["order"] is None:
+        return groups[0] if groups else []
+    iterators = [iter(group) for group in groups]
+    return [next(iterators[index]) for index in table["order"]]
+
+
+def encode(data: Records, compression: str = "none") -> bytes:
+    """Coleção (lista ou dict de registros) → bytes do snapshot"""
+    if compression not in CODECS:
+        raise ValueError(f"Compressão inválida: {compression}. Use: {', '.join(CODECS)}")
+    if isinstance(data, list):
+        rows = [_as_dict(row) for row in data]
+        body = {"kind": "list"}
+    else:
+        rows = [_as_dict(row) for row in data.values()]
+        body = {"kind": "dict", "keys": list(data)}
+    if all(isinstance(row, dict) for row in rows):
+        body["table"] = _encode_table(rows)
+    else:
+        body = {"kind": "raw", "data": data}
+
+    payload = json.dumps(body, ensure_ascii=False, separators=(",", ":"), default=_as_dict).encode("utf-8")
+    if compression == "gzip":
+        payload = gzip.compress(payload, compresslevel=1)
+    elif compression == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Compressão zstd requer o pacote zstandard")
+        payload = zstandard.ZstdCompressor(level=3).compress(payload)
+    return MAGIC + bytes([VERSION, CODECS[compression]]) + payload
+
+
+def decode(raw: bytes) -> Records:
+    """Bytes do snapshot → coleção"""
+    header = len(MAGIC) + 2
+    if raw[:len(MAGIC)] != MAGIC or len(raw) < header:
+        raise ValueError("Arquivo não é um snapshot")
+    version, codec = raw[len(MAGIC)], raw[len(MAGIC) + 1]
+    if version != VERSION:
+        raise ValueError(f"Versão de snapshot não suportada: {version}")
+    payload = raw[header:]
+    if codec == CODECS["gzip"]:
+        payload = gzip.decompress(payload)
+    elif codec == CODECS["zstd"]:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Snapshot comprimido com zstd: instale o pacote zstandard")
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    elif codec != CODECS["none"]:
+        raise ValueError(f"Codec de snapshot desconhecido: {codec}")
+
+    body = json.loads(payload)
+    if body["kind"] == "raw":
+        return body["data"]
+    rows = _decode_table(body["table"])
+    if body["kind"] == "list":
+        return rows
+    return dict(zip(body["keys"], rows))
+
+
+def write_file(path: str, data: Records, compression: str = "none", durable: bool = False) -> None:
+    """Grava o snapshot de forma atômica (arquivo temporário + rename)"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(encode(data, compression))
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def read_file(path: str) -> Records:
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+def convert(path: str, to: str = "binary", compression: str = "none") -> str:
+    """Converte um arquivo `.json` em `.snap` (ou o contrário); retorna o caminho gerado"""
+    if to == "binary":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        target = snapshot_path(path)
+        write_file(target, data, compression, durable=True)
+    else:
+        data = read_file(path)
+        target = f"{os.path.splitext(path)[0]}.json"
+        temp_path = f"{target}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, target)
+    return target
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Converte arquivos de dados entre JSON e snapshot binário")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--to", choices=("binary", "json"), default="binary")
+    parser.add_argument("--compression", choices=tuple(CODECS), default="none")
+    args = parser.parse_args(argv)
+
+    for path in args.files:
+        target = convert(path, args.to, args.compression)
+        print(f"{path} -> {target} ({os.path.getsize(path)} -> {os.path.getsize(target)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1511 @@
+"""
+Persistência dos serviços
+
+Os serviços guardam registros por chave (id, e-mail...). Motores,
+escolhidos por STORAGE_ENGINE:
+
+- `json` (padrão): JsonStore, o arquivo JSON inteiro é reescrito a cada mutação
+- `log`: LogStore, cada mutação acrescenta uma linha a um log (`<arquivo>.log`);
+  um snapshot em background (no mesmo formato do JsonStore) compacta o log.
+  Na inicialização o estado é o snapshot mais a cauda do log.
+- `sqlite`: SqliteStore, banco SQLite (`<arquivo sem .json>.db`) em modo WAL,
+  com índices nos campos de filtro (INDEXED_FIELDS). Na primeira abertura
+  importa o arquivo JSON existente.
+
+Os motores `json` e `log` mantêm a coleção em memória (`in_memory`) e
+são de um processo só. O `sqlite` não: cada leitura é uma consulta ao
+banco e a memória do processo não cresce com a coleção. Vários workers
+por serviço (gunicorn -w N) exigem `sqlite`: o banco é compartilhado e
+cada commit registra as chaves alteradas numa tabela `changes`. Antes de
+cada requisição o worker verifica (`PRAGMA data_version`) se outro
+processo gravou e entrega essas mudanças aos índices do serviço que
+precisam delas (`subscribe`/`refresh`).
+
+Leituras: `get(chave)`, `find(**filtros)` (igualdade, como nas rotas) e
+`select(...)`, que além dos filtros aceita um intervalo de datas, ordem,
+cursor e limite (a página de uma listagem). No SQLite elas viram WHERE /
+ORDER BY / LIMIT sobre as colunas indexadas, lidas em lotes de
+SQLITE_READ_BATCH; nos demais motores, uma varredura da memória.
+
+As gravações de todos os motores passam por um GroupCommit: mutações que
+chegam juntas viram uma única escrita (e um único fsync), e cada
+requisição espera apenas o lote em que entrou. A política de fsync e a
+janela de agrupamento são configuráveis por serviço (ver `open_store`).
+
+Com SNAPSHOT_FORMAT=binary o arquivo da coleção (o snapshot, no motor
+`log`) é gravado no formato binário de `services.snapshot` (`<coleção>.snap`,
+comprimido conforme SNAPSHOT_COMPRESSION); o `.json` existente é lido na
+primeira carga.
+
+Com STORAGE_SHARDING=office cada escritório tem o próprio arquivo
+(ShardedStore), carregado na primeira requisição do escritório: uma
+escrita reescreve (ou acrescenta ao log de) só o shard do escritório.
+
+O arquivo de snapshot de coleções em lista (prazos, audiências) continua
+sendo uma lista de registros; as chaves são o campo `id`.
+"""
+
+import copy
+import heapq
+import itertools
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from contextlib import contextmanager
+from urllib.parse import quote, unquote
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem vários workers, o lock entre processos é desnecessário
+    fcntl = None
+
+from services import snapshot
+
+logger = logging.getLogger(__name__)
+
+Records = Union[Dict[str, Any], List[Dict[str, Any]]]
+# Mutação pendente: ("put", chave, registro), ("del", chave, None) ou ("save", None, None)
+Op = Tuple[str, Optional[str], Optional[Dict[str, Any]]]
+
+STORAGE_ENGINE = os.getenv("STORAGE_ENGINE", "json").lower()
+LOG_SNAPSHOT_INTERVAL = float(os.getenv("LOG_SNAPSHOT_INTERVAL", "30"))
+LOG_SNAPSHOT_MIN_ENTRIES = int(os.getenv("LOG_SNAPSHOT_MIN_ENTRIES", "1000"))
+
+FSYNC_POLICIES = ("always", "batch", "interval")
+STORAGE_FSYNC_INTERVAL = float(os.getenv("STORAGE_FSYNC_INTERVAL", "1.0"))
+
+SNAPSHOT_FORMAT = os.getenv("SNAPSHOT_FORMAT", "json").lower()
+SNAPSHOT_COMPRESSION = os.getenv("SNAPSHOT_COMPRESSION", "none").lower()
+
+# `office`: um arquivo (e uma carga sob demanda) por escritório; `none`: um arquivo por coleção
+STORAGE_SHARDING = os.getenv("STORAGE_SHARDING", "none").lower()
+
+# Mudanças guardadas na tabela `changes`; um worker mais atrasado que isso recarrega tudo
+SQLITE_CHANGES_RETENTION = int(os.getenv("SQLITE_CHANGES_RETENTION", "10000"))
+
+# Registros lidos do SQLite por consulta: listagens longas não viram uma lista inteira em memória
+SQLITE_READ_BATCH = int(os.getenv("SQLITE_READ_BATCH", "500"))
+
+# Campos filtráveis (colunas indexadas no SQLite)
+INDEXED_FIELDS = ("office_id", "process_id", "number", "date", "due_date")
+
+# Maior caractere: o fim de um intervalo inclui valores que começam com ele
+_MAX = "\U0010ffff"
+
+# Intervalo de um campo de data: (campo, início, fim), extremos opcionais
+DateRange = Tuple[str, Optional[str], Optional[str]]
+SortKey = Tuple[str, str]
+
+
+def _check_indexed(field: str) -> str:
+    if field not in INDEXED_FIELDS:
+        raise ValueError(f"Campo não indexado: {field}")
+    return field
+
+
+def _active_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Filtros informados (valores vazios não filtram, como nas rotas)"""
+    for field in filters:
+        _check_indexed(field)
+    return {field: value for field, value in filters.items() if value}
+
+
+def _sort_key(field: str) -> Callable[[Any], SortKey]:
+    """Chave de ordenação (valor como texto, id), a mesma da paginação e das consultas SQL"""
+    def key(record: Any) -> SortKey:
+        value = record.get(field)
+        return ("" if value is None else str(value), str(record.get("id", "")))
+    return key
+
+
+def _in_range(value: Any, start: Optional[str], end: Optional[str]) -> bool:
+    """`start` <= valor <= `end` (o fim inclui valores que começam com ele); vazios ficam de fora"""
+    if not value:
+        return False
+    value = str(value)
+    return (not start or value >= start) and (not end or value <= end + _MAX)
+
+
+def _encode_record(obj: Any) -> Any:
+    """`default` do json: registros compactos (services.records) viram dicts"""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+class _Batch:
+    """Lote de mutações gravado de uma vez"""
+
+    __slots__ = ("ops", "done", "error")
+
+    def __init__(self):
+        self.ops: List[Op] = []
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class GroupCommit:
+    """
+    Escritor com group commit para um store
+
+    As mutações entram no lote aberto (`enqueue`, chamado sob o lock do
+    store, preservando a ordem) e quem as fez espera só esse lote
+    (`wait`). Uma thread grava cada lote com uma chamada a `flush`;
+    enquanto ela grava, o próximo lote acumula o que chegar.
+
+    Políticas de fsync:
+    - `always`: sem janela; cada lote é gravado e sincronizado antes da resposta
+    - `batch`: espera até `window` segundos para agrupar; um fsync por lote
+    - `interval`: agrupa como `batch`, mas responde após a escrita (cache do
+      SO) e sincroniza a cada `fsync_interval` segundos; uma queda do
+      sistema operacional perde no máximo esse intervalo
+    """
+
+    # Segundos sem mutações até a thread de escrita terminar
+    idle_timeout = 60.0
+
+    def __init__(
+        self,
+        flush: Callable[[List[Op], bool], None],
+        sync: Callable[[], None],
+        policy: str = "interval",
+        window: float = 0.0,
+        fsync_interval: float = STORAGE_FSYNC_INTERVAL,
+        name: str = "store"
+    ):
+        if policy not in FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync inválida: {policy}. Use: {', '.join(FSYNC_POLICIES)}")
+        self._flush = flush
+        self._sync = sync
+        self.policy = policy
+        self.window = 0.0 if policy == "always" else window
+        self.fsync_interval = fsync_interval
+        self.name = name
+        self._cond = threading.Condition()
+        self._pending: Optional[_Batch] = None
+        self._dirty = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def reset_after_fork(self) -> None:
+        """No processo filho (fork): a thread de escrita não existe mais"""
+        self._cond = threading.Condition()
+        self._pending = None
+        self._dirty = False
+        self._closed = False
+        self._thread = None
+
+    def enqueue(self, op: Op) -> _Batch:
+        """Adiciona a mutação ao lote aberto e retorna o lote"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Store {self.name} fechado")
+            if self._pending is None:
+                self._pending = _Batch()
+                self._cond.notify()
+            self._pending.ops.append(op)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"commit-{self.name}", daemon=True)
+                self._thread.start()
+            return self._pending
+
+    @staticmethod
+    def wait(batch: _Batch) -> None:
+        """Espera o lote ser gravado (e sincronizado, conforme a política)"""
+        batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+
+    def _run(self) -> None:
+        last_sync = time.monotonic()
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    if not self._dirty:
+                        # Ociosa (ex.: shard de um escritório sem escritas): a thread
+                        # termina e `enqueue` cria outra na próxima mutação
+                        if not self._cond.wait(self.idle_timeout) and self._pending is None:
+                            self._thread = None
+                            return
+                        continue
+                    remaining = self.fsync_interval - (time.monotonic() - last_sync)
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                closing = self._closed
+
+            if self.window > 0 and not closing:
+                # Janela de agrupamento: mutações que chegarem entram neste lote
+                time.sleep(self.window)
+            with self._cond:
+                batch, self._pending = self._pending, None
+
+            if batch is not None:
+                try:
+                    self._flush(batch.ops, self.policy != "interval")
+                    if self.policy == "interval":
+                        self._dirty = True
+                except Exception as e:
+                    logger.error(f"Falha ao gravar lote de {self.name}: {e}")
+                    batch.error = e
+                batch.done.set()
+
+            if self._dirty and (closing or time.monotonic() - last_sync >= self.fsync_interval):
+                try:
+                    self._sync()
+                except Exception as e:
+                    logger.error(f"Falha no fsync de {self.name}: {e}")
+                self._dirty = False
+                last_sync = time.monotonic()
+
+            if closing:
+                with self._cond:
+                    if self._pending is None:
+                        return
+
+    def close(self) -> None:
+        """Grava o que estiver pendente e encerra a thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class FileLock:
+    """
+    Lock exclusivo entre processos (`flock` em um arquivo) e entre threads
+
+    O arquivo é reaberto em cada processo: um descritor herdado por fork
+    compartilharia o lock com o processo pai.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+
+    def __enter__(self) -> "FileLock":
+        self._thread_lock.acquire()
+        try:
+            if self._pid != os.getpid():
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                self._pid = os.getpid()
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            self._thread_lock.release()
+
+
+# Mudanças recebidas de outros processos: {chave: registro ou None (removido)}, e se é a coleção inteira
+Listener = Callable[[Dict[str, Any], bool], None]
+
+
+class JsonStore:
+    """Persistência simples em arquivo JSON (dict ou lista de dicts)."""
+
+    _JSON_OPTIONS: Dict[str, Any] = {"indent": 2}
+    # Arquivo compartilhado por vários processos (`refresh` antes das requisições)
+    shared = False
+    # Coleção inteira em memória após `load`: os serviços podem manter índices sobre ela
+    in_memory = True
+
+    def __init__(
+        self,
+        file_path: str,
+        default: Optional[Records] = None,
+        fsync_policy: str = "interval",
+        commit_window: float = 0.0,
+        decode: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        snapshot_format: str = "json",
+        compression: str = "none"
+    ):
+        if snapshot_format not in ("json", "binary"):
+            raise ValueError(f"Formato de snapshot inválido: {snapshot_format}. Use: json, binary")
+        if compression not in snapshot.CODECS:
+            raise ValueError(f"Compressão inválida: {compression}. Use: {', '.join(snapshot.CODECS)}")
+        if compression == "zstd" and not snapshot.ZSTD_AVAILABLE:
+            logger.warning("zstandard não instalado; snapshots comprimidos com gzip")
+            compression = "gzip"
+        self.file_path = file_path
+        self.binary = snapshot_format == "binary"
+        self.compression = compression
+        self.snapshot_path = snapshot.snapshot_path(file_path) if self.binary else file_path
+        self.decode = decode
+        self.default: Records = default if default is not None else {}
+        self.is_list = isinstance(self.default, list)
+        self._records: Dict[str, Any] = {}
+        # Reentrante: `write()` mantém o lock enquanto o serviço chama put/delete
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._listeners: List[Listener] = []
+        self._commit = GroupCommit(
+            self._flush, self._sync, policy=fsync_policy, window=commit_window,
+            name=os.path.basename(file_path)
+        )
+        self._ensure_storage()
+
+    def _ensure_storage(self) -> None:
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        if not os.path.exists(self.snapshot_path) and not os.path.exists(self.file_path):
+            self._atomic_write(self.default)
+
+    def _atomic_write(self, data: Records, durable: bool = False) -> None:
+        if self.binary:
+            snapshot.write_file(self.snapshot_path, data, self.compression, durable)
+            return
+        temp_path = f"{self.file_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, default=_encode_record, **self._JSON_OPTIONS)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, self.file_path)
+
+    def _read_file(self) -> Records:
+        try:
+            if self.binary and os.path.exists(self.snapshot_path):
+                data = snapshot.read_file(self.snapshot_path)
+            else:
+                # Formato binário sem `.snap` ainda: migra a partir do JSON
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            if not isinstance(data, type(self.default)):
+                return self.default.copy()
+            return data
+        except Exception:
+            return self.default.copy()
+
+    def _to_records(self, data: Records) -> Dict[str, Any]:
+        items = data if self.is_list else data.values()
+        keys = (str(item.get("id")) for item in data) if self.is_list else data.keys()
+        if self.decode is not None:
+            items = map(self.decode, items)
+        return dict(zip(keys, items))
+
+    def _from_records(self, records: Dict[str, Any]) -> Records:
+        return list(records.values()) if self.is_list else dict(records)
+
+    def _flush(self, ops: List[Op], durable: bool) -> None:
+        # O arquivo inteiro reflete o estado atual: um lote inteiro custa uma reescrita
+        with self._lock:
+            data = self._from_records(self._records)
+        self._atomic_write(data, durable)
+
+    def _sync(self) -> None:
+        with open(self.snapshot_path, "rb") as f:
+            os.fsync(f.fileno())
+
+    def _submit(self, op: Op, apply: Callable[[], None]) -> None:
+        """Aplica a mutação em memória, a coloca no lote aberto e espera o lote ser gravado"""
+        with self._lock:
+            apply()
+            batch = self._commit.enqueue(op)
+        if getattr(self._local, "depth", 0):
+            # Dentro de write(): a espera fica para a saída do bloco
+            self._local.batch = batch
+            return
+        self._commit.wait(batch)
+
+    @contextmanager
+    def write(self, office_id: Optional[str] = None) -> Iterator[None]:
+        """
+        Bloco de escrita do serviço: a atualização da memória do serviço e os
+        put/delete do bloco acontecem sob o lock do store, na mesma ordem em
+        que vão para o disco, sem intercalar com mudanças de outros processos
+        (`refresh`). A espera pela gravação acontece na saída, fora do lock.
+        `office_id` escolhe o shard com sharding; aqui não é usado.
+        """
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth == 0:
+            local.batch = None
+        with self._lock:
+            local.depth = depth + 1
+            try:
+                yield
+            finally:
+                local.depth = depth
+        if depth == 0 and local.batch is not None:
+            batch, local.batch = local.batch, None
+            self._commit.wait(batch)
+
+    @contextmanager
+    def exclusive(self, office_id: Optional[str] = None) -> Iterator[None]:
+        """`write()` exclusivo entre processos (checagens de unicidade); aqui, de um processo só"""
+        with self.write():
+            yield
+
+    @contextmanager
+    def exclusive_collection(self, office_id: Optional[str] = None) -> Iterator[None]:
+        """`exclusive()` para unicidade entre escritórios (`lookup`); sem sharding, a coleção já é uma só"""
+        with self.exclusive(office_id):
+            yield
+
+    def subscribe(self, listener: Listener) -> None:
+        """Registra quem aplica à memória do serviço as mudanças de outros processos"""
+        self._listeners.append(listener)
+
+    def refresh(self) -> bool:
+        """Aplica as mudanças de outros processos; motores de arquivo não compartilham o arquivo"""
+        return False
+
+    def version(self, office_id: Optional[str] = None) -> Optional[str]:
+        """
+        Versão dos dados gravados, igual em todos os workers (motores
+        compartilhados); None nos motores de um processo só
+        """
+        return None
+
+    def load(self) -> Records:
+        with self._lock:
+            self._records = self._to_records(self._read_file())
+            return self._from_records(self._records)
+
+    def load_with(self, callback: Callable[[Records], None]) -> None:
+        """Entrega os registros à memória do serviço; com sharding, por escritório, no primeiro acesso"""
+        callback(self.load())
+
+    def open_office(self, office_id: Optional[str]) -> None:
+        """Garante a memória do escritório carregada (com sharding); aqui tudo já está"""
+
+    def open_all(self) -> None:
+        """Garante todos os escritórios carregados (com sharding)"""
+
+    def open_scope(self, office_id: Optional[str]) -> None:
+        """Escopo de uma requisição: o escritório informado, ou todos sem escritório"""
+
+    def save(self, data: Records) -> None:
+        """Substitui a coleção inteira"""
+        def apply():
+            self._records = self._to_records(data)
+        self._submit(("save", None, None), apply)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Cria ou substitui um registro"""
+        def apply():
+            self._records[key] = value
+        self._submit(("put", key, value), apply)
+
+    def delete(self, key: str) -> None:
+        """Remove um registro"""
+        def apply():
+            self._records.pop(key, None)
+        self._submit(("del", key, None), apply)
+
+    def get(self, key: Optional[str], office_id: Optional[str] = None) -> Optional[Any]:
+        """Registro da chave (None se não existe); `office_id` escolhe o shard com sharding"""
+        if key is None:
+            return None
+        with self._lock:
+            return self._records.get(key)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def lookup(self, field: str, value: Any) -> Optional[Any]:
+        """Registro com o valor de um campo único em toda a coleção (ex.: número do processo)"""
+        return next(self.select(limit=1, **{field: value}), None)
+
+    def find(self, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Registros cujos campos são iguais aos filtros, na ordem de inserção"""
+        filters = _active_filters(filters)
+        with self._lock:
+            records = list(self._records.values())
+        for record in records:
+            if all(record.get(field) == value for field, value in filters.items()):
+                yield record
+
+    def select(
+        self,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        after: Optional[SortKey] = None,
+        limit: Optional[int] = None,
+        between: Optional[DateRange] = None,
+        **filters: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        `find` com intervalo de datas e página: registros com `between`
+        (campo, início, fim) no intervalo, ordenados por (`order_by`, id)
+        — sem ordem, pelo campo do intervalo ou na ordem de inserção —,
+        depois da chave `after` e no máximo `limit`
+        """
+        records: Iterator[Dict[str, Any]] = self.find(**filters)
+        if between is not None:
+            field, start, end = between
+            records = (r for r in records if _in_range(r.get(field), start, end))
+        field = order_by or (between[0] if between is not None else None)
+        if field is None:
+            return records if limit is None else itertools.islice(records, limit)
+        key = _sort_key(field)
+        if after is not None:
+            records = (r for r in records if (key(r) < after if descending else key(r) > after))
+        return iter(sorted(records, key=key, reverse=descending)[:limit])
+
+    def close(self) -> None:
+        self._commit.close()
+
+
+class LogStore(JsonStore):
+    """
+    Snapshot (JSON ou binário) + log de mutações (uma linha JSON por put/delete)
+
+    Escrever custa O(tamanho do registro), não O(tamanho da coleção). Uma
+    thread compacta o log a cada `snapshot_interval` segundos quando ele
+    passa de `snapshot_min_entries` linhas: o log é rotacionado para
+    `<arquivo>.log.1`, o snapshot é gravado fora do lock (os escritores
+    seguem no log novo) e então o log rotacionado é apagado. Reaplicar um
+    log já incorporado ao snapshot não muda o estado (put/delete absolutos),
+    então uma queda em qualquer ponto é recuperada na próxima carga.
+    """
+
+    _JSON_OPTIONS: Dict[str, Any] = {"separators": (",", ":")}
+
+    def __init__(
+        self,
+        file_path: str,
+        default: Optional[Records] = None,
+        snapshot_interval: float = LOG_SNAPSHOT_INTERVAL,
+        snapshot_min_entries: int = LOG_SNAPSHOT_MIN_ENTRIES,
+        **options: Any
+    ):
+        self.log_path = f"{file_path}.log"
+        self.pending_path = f"{file_path}.log.1"
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_min_entries = snapshot_min_entries
+        self._log = None
+        self._log_entries = 0
+        self._snapshot_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        super().__init__(file_path, default, **options)
+
+    def _replay(self, path: str) -> int:
+        """Aplica as mutações de um arquivo de log; retorna quantas foram lidas"""
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Última linha truncada por uma queda no meio da escrita
+                    logger.warning(f"Linha inválida ignorada em {path}")
+                    continue
+                if entry.get("op") == "put":
+                    value = entry["value"]
+                    self._records[entry["key"]] = value if self.decode is None else self.decode(value)
+                elif entry.get("op") == "del":
+                    self._records.pop(entry["key"], None)
+                count += 1
+        return count
+
+    def load(self) -> Records:
+        with self._lock:
+            self._records = self._to_records(self._read_file())
+            self._log_entries = self._replay(self.pending_path) + self._replay(self.log_path)
+            if self._log is None:
+                self._log = open(self.log_path, "a", encoding="utf-8")
+            data = self._from_records(self._records)
+        self._start_snapshots()
+        return data
+
+    def _flush(self, ops: List[Op], durable: bool) -> None:
+        lines = "".join(
+            json.dumps({"op": op, "key": key, "value": value} if op == "put" else {"op": op, "key": key},
+                       ensure_ascii=False, separators=(",", ":"), default=_encode_record) + "\n"
+            for op, key, value in ops
+        )
+        # Sob o lock: a rotação do log (snapshot) não acontece no meio do lote
+        with self._lock:
+            if self._log is None:
+                self._log = open(self.log_path, "a", encoding="utf-8")
+            self._log.write(lines)
+            self._log.flush()
+            if durable:
+                os.fsync(self._log.fileno())
+            self._log_entries += len(ops)
+
+    def _sync(self) -> None:
+        with self._lock:
+            if self._log is not None:
+                os.fsync(self._log.fileno())
+
+    def save(self, data: Records) -> None:
+        with self._lock:
+            self._records = self._to_records(data)
+        self.snapshot(force=True)
+
+    def snapshot(self, force: bool = False) -> bool:
+        """Grava o snapshot e descarta o log já incorporado; retorna se gravou"""
+        with self._snapshot_lock:
+            with self._lock:
+                if not force and self._log_entries < self.snapshot_min_entries:
+                    return False
+                records = dict(self._records)
+                self._rotate_log()
+            self._atomic_write(self._from_records(records), durable=True)
+            if os.path.exists(self.pending_path):
+                os.remove(self.pending_path)
+            return True
+
+    def _rotate_log(self) -> None:
+        """Move o log atual para `.log.1` (acumulando se já existir) e abre um novo"""
+        if self._log is not None:
+            self._log.close()
+        if os.path.exists(self.log_path):
+            if os.path.exists(self.pending_path):
+                with open(self.pending_path, "a", encoding="utf-8") as pending, \
+                        open(self.log_path, "r", encoding="utf-8") as current:
+                    pending.write(current.read())
+                os.remove(self.log_path)
+            else:
+                os.replace(self.log_path, self.pending_path)
+        self._log = open(self.log_path, "a", encoding="utf-8")
+        self._log_entries = 0
+
+    def _start_snapshots(self) -> None:
+        if self._thread is not None or self.snapshot_interval <= 0:
+            return
+
+        def snapshot_loop():
+            while not self._stop.wait(self.snapshot_interval):
+                try:
+                    self.snapshot()
+                except Exception as e:
+                    logger.error(f"Falha ao gravar snapshot de {self.file_path}: {e}")
+
+        self._thread = threading.Thread(
+            target=snapshot_loop, name=f"snapshot-{os.path.basename(self.file_path)}", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Grava o pendente, para a thread de snapshot, compacta o log e fecha o arquivo"""
+        self._commit.close()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._log_entries:
+            self.snapshot(force=True)
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+class SqliteStore(JsonStore):
+    """
+    Registros em uma tabela SQLite, com as colunas de INDEXED_FIELDS indexadas
+
+    Uma conexão compartilhada (serializada pelo lock); o módulo sqlite3
+    reaproveita as instruções preparadas de SQL idêntico. Cada lote do
+    group commit é uma transação. Modo WAL; com `always`/`batch` o commit
+    sincroniza o WAL (synchronous=FULL), com `interval` não (NORMAL) e o
+    fsync periódico é um checkpoint do WAL.
+
+    Nada da coleção fica em memória: `get`/`find`/`select` consultam o
+    banco e devolvem os registros em lotes de SQLITE_READ_BATCH (paginação
+    por chave, não por OFFSET); `load_with` entrega a coleção também em
+    lotes, para os índices que o serviço mantiver (ex.: busca textual).
+
+    Vários processos: cada lote também grava em `changes` (seq, chave,
+    origem). `refresh` lê as mudanças novas de outras origens e entrega o
+    valor atual de cada chave aos listeners; chaves com escrita local ainda
+    não gravada são puladas (a escrita local vem depois no log). Se o
+    worker ficou para trás além de SQLITE_CHANGES_RETENTION, ou alguém
+    chamou `save`, os listeners recebem a coleção inteira. Sem listeners,
+    `refresh` só avança a posição no log (a versão dos ETags).
+    """
+
+    shared = True
+    in_memory = False
+    _COLUMNS = ", ".join(INDEXED_FIELDS)
+    _UPSERT = (
+        f"INSERT INTO records (key, value, {_COLUMNS}) VALUES (?, ?{', ?' * len(INDEXED_FIELDS)}) "
+        f"ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+        + ", ".join(f"{field} = excluded.{field}" for field in INDEXED_FIELDS)
+    )
+
+    def __init__(self, file_path: str, default: Optional[Records] = None, **options: Any):
+        self.db_path = f"{os.path.splitext(file_path)[0]}.db"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._synchronous = "NORMAL" if options.get("fsync_policy", "interval") == "interval" else "FULL"
+        self._file_lock = FileLock(f"{self.db_path}.lock")
+        self._origin = uuid.uuid4().hex
+        self._last_seq = 0
+        self._data_version: Optional[int] = None
+        # Chave → (escritas locais ainda não gravadas, último valor)
+        self._pending: Dict[str, Tuple[int, Any]] = {}
+        super().__init__(file_path, default, **options)
+
+        # Sob um servidor pre-fork com preload, cada worker precisa da própria conexão
+        ref = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: ref() is not None and ref()._after_fork())
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self._synchronous}")
+        # Outro worker com a escrita aberta: espera em vez de falhar
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _ensure_storage(self) -> None:
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = self._connect()
+        columns = ", ".join(f"{field} TEXT" for field in INDEXED_FIELDS)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS records (key TEXT PRIMARY KEY, value TEXT NOT NULL, {columns})")
+        for field in INDEXED_FIELDS:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_records_{field} ON records ({field})")
+        # Chave NULL: a coleção inteira foi substituída (save)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT, origin TEXT NOT NULL)"
+        )
+        # Identifica o banco: um banco recriado recomeça a sequência de `changes`
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', ?)", (uuid.uuid4().hex[:8],))
+        self._epoch = conn.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()[0]
+        self._conn = conn
+
+        # Migração: importa o arquivo JSON do motor anterior (um worker por vez)
+        with self._file_lock:
+            empty = conn.execute("SELECT 1 FROM records LIMIT 1").fetchone() is None
+            if empty and (os.path.exists(self.file_path) or os.path.exists(self.snapshot_path)):
+                data = self._read_file()
+                if data:
+                    self._write_all(self._to_records(data))
+                    logger.info(f"{self.file_path} importado para {self.db_path}")
+        # Posição no log de mudanças: leituras não dependem de `load`
+        self._data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        self._last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def _after_fork(self) -> None:
+        if self._conn is None:
+            return  # fechado antes do fork
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._file_lock = FileLock(self._file_lock.path)
+        self._origin = uuid.uuid4().hex
+        self._pending = {}
+        self._commit.reset_after_fork()
+        self._conn = self._connect()
+
+    @staticmethod
+    def _row(key: str, value: Dict[str, Any]) -> tuple:
+        indexed = tuple(
+            None if value.get(field) is None else str(value.get(field)) for field in INDEXED_FIELDS
+        )
+        return (key, json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_encode_record)) + indexed
+
+    def _decode_value(self, value: Optional[str]) -> Any:
+        if value is None:
+            return None
+        record = json.loads(value)
+        return record if self.decode is None else self.decode(record)
+
+    def _write_all(self, records: Dict[str, Any]) -> None:
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM records")
+            self._conn.executemany(self._UPSERT, [self._row(k, v) for k, v in records.items()])
+            self._conn.execute("INSERT INTO changes (key, origin) VALUES (NULL, ?)", (self._origin,))
+
+    def _mark_pending(self, key: str, value: Any) -> None:
+        count, _ = self._pending.get(key, (0, None))
+        self._pending[key] = (count + 1, value)
+
+    def _flush(self, ops: List[Op], durable: bool) -> None:
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute("BEGIN")
+                    for op, key, value in ops:
+                        if op == "put":
+                            self._conn.execute(self._UPSERT, self._row(key, value))
+                        else:
+                            self._conn.execute("DELETE FROM records WHERE key = ?", (key,))
+                    self._conn.executemany(
+                        "INSERT INTO changes (key, origin) VALUES (?, ?)",
+                        [(key, self._origin) for _, key, _ in ops]
+                    )
+                    seq = self._conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                    self._conn.execute("DELETE FROM changes WHERE seq <= ?", (seq - SQLITE_CHANGES_RETENTION,))
+                # Nenhum outro processo gravou desde o último refresh: as mudanças até aqui são nossas
+                if self._conn.execute("PRAGMA data_version").fetchone()[0] == self._data_version:
+                    self._last_seq = seq
+            finally:
+                for _, key, _ in ops:
+                    count, value = self._pending.pop(key, (1, None))
+                    if count > 1:
+                        self._pending[key] = (count - 1, value)
+
+    def _sync(self) -> None:
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def load(self) -> Records:
+        with self._lock:
+            # Versão lida antes: um commit entre ela e a leitura só causa um refresh sem mudanças
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            # Registros e posição no log de mudanças lidos na mesma transação
+            self._conn.execute("BEGIN")
+            try:
+                self._last_seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+                rows = self._conn.execute("SELECT key, value FROM records ORDER BY rowid").fetchall()
+            finally:
+                self._conn.execute("COMMIT")
+        return self._from_records({key: self._decode_value(value) for key, value in rows})
+
+    def load_with(self, callback: Callable[[Records], None]) -> None:
+        """Entrega a coleção em lotes de SQLITE_READ_BATCH (sem montá-la inteira em memória)"""
+        with self._lock:
+            # Posição lida antes dos registros: o que mudar durante a leitura chega de novo pelo `refresh`
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            self._last_seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+        rows = self._query([], [], None, False, None, None)
+        while True:
+            batch = dict(itertools.islice(rows, SQLITE_READ_BATCH))
+            if not batch:
+                return
+            callback(self._from_records(batch))
+
+    def save(self, data: Records) -> None:
+        with self._lock:
+            self._write_all(self._to_records(data))
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        self._submit(("put", key, value), lambda: self._mark_pending(key, value))
+
+    def delete(self, key: str) -> None:
+        self._submit(("del", key, None), lambda: self._mark_pending(key, None))
+
+    def get(self, key: Optional[str], office_id: Optional[str] = None) -> Optional[Any]:
+        if key is None:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM records WHERE key = ?", (key,)).fetchone()
+        return None if row is None else self._decode_value(row[0])
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def find(self, **filters: Any) -> Iterator[Dict[str, Any]]:
+        return self.select(**filters)
+
+    def select(
+        self,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        after: Optional[SortKey] = None,
+        limit: Optional[int] = None,
+        between: Optional[DateRange] = None,
+        **filters: Any
+    ) -> Iterator[Dict[str, Any]]:
+        filters = _active_filters(filters)
+        where = [f"{field} = ?" for field in filters]
+        args: List[Any] = [str(value) for value in filters.values()]
+        if between is not None:
+            field, start, end = between
+            # NULL e '' ficam de fora, como no índice de datas em memória
+            where.append(f"{_check_indexed(field)} <> ''")
+            if start:
+                where.append(f"{field} >= ?")
+                args.append(start)
+            if end:
+                where.append(f"{field} <= ?")
+                args.append(end + _MAX)
+        field = order_by or (between[0] if between is not None else None)
+        if field is None:
+            sort = None
+        elif field in INDEXED_FIELDS:
+            sort = f"COALESCE({field}, '')"
+        elif field.isidentifier():
+            sort = f"COALESCE(CAST(json_extract(value, '$.{field}') AS TEXT), '')"
+        else:
+            raise ValueError(f"Campo de ordenação inválido: {field}")
+        return (record for _, record in self._query(where, args, sort, descending, after, limit))
+
+    def _query(
+        self,
+        where: List[str],
+        args: List[Any],
+        sort: Optional[str],
+        descending: bool,
+        after: Optional[SortKey],
+        limit: Optional[int]
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Pares (chave, registro) em ordem de `sort` (expressão SQL) e chave, ou
+        de inserção (rowid), lidos em lotes: cada lote continua da última
+        posição lida (`(sort, key) > (?, ?)`), com o lock só durante a consulta
+        """
+        direction, compare = ("DESC", "<") if descending else ("ASC", ">")
+        if sort is None:
+            columns, order, position_sql = "rowid", "rowid", "rowid > ?"
+        else:
+            columns = f"{sort}, key"
+            order = f"{sort} {direction}, key {direction}"
+            position_sql = f"({sort}, key) {compare} (?, ?)"
+        position = tuple(after) if after is not None and sort is not None else None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = SQLITE_READ_BATCH if remaining is None else min(remaining, SQLITE_READ_BATCH)
+            conditions = where + [position_sql] if position is not None else where
+            sql = f"SELECT key, value, {columns} FROM records"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += f" ORDER BY {order} LIMIT ?"
+            with self._lock:
+                rows = self._conn.execute(sql, [*args, *(position or ()), size]).fetchall()
+            for row in rows:
+                yield row[0], self._decode_value(row[1])
+            if len(rows) < size:
+                return
+            position = tuple(rows[-1][2:])
+            if remaining is not None:
+                remaining -= len(rows)
+
+    @contextmanager
+    def exclusive(self, office_id: Optional[str] = None) -> Iterator[None]:
+        """
+        `write()` exclusivo entre processos: com o lock de arquivo, aplica as
+        mudanças dos outros workers, executa o bloco e só solta o lock depois
+        do commit, então o próximo worker a entrar enxerga a mutação
+        """
+        with self._file_lock:
+            self.refresh()
+            with self.write():
+                yield
+
+    def refresh(self) -> bool:
+        """
+        Aplica às memórias dos serviços (listeners) as mudanças gravadas por
+        outros processos; retorna se houve alguma
+
+        Custa um `PRAGMA data_version` quando ninguém mais gravou. Os
+        listeners rodam sob o lock do store, na ordem do log: não devem
+        chamar o store nem esperar locks mantidos durante escritas nele.
+        """
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return False
+            self._data_version = version
+
+            self._conn.execute("BEGIN")
+            try:
+                changes = self._conn.execute(
+                    "SELECT seq, key, origin FROM changes WHERE seq > ? ORDER BY seq", (self._last_seq,)
+                ).fetchall()
+                if not changes:
+                    return False
+                if not self._listeners:
+                    # Ninguém guarda registros em memória: basta avançar a posição
+                    self._last_seq = changes[-1][0]
+                    return True
+                oldest = self._conn.execute("SELECT MIN(seq) FROM changes").fetchone()[0]
+                reset = oldest > self._last_seq + 1 or any(key is None for _, key, _ in changes)
+                if reset:
+                    rows = self._conn.execute("SELECT key, value FROM records ORDER BY rowid").fetchall()
+                else:
+                    last_origin = {key: origin for _, key, origin in changes}
+                    keys = [
+                        key for key, origin in last_origin.items()
+                        if origin != self._origin and key not in self._pending
+                    ]
+                    rows = []
+                    for i in range(0, len(keys), 500):
+                        chunk = keys[i:i + 500]
+                        rows += self._conn.execute(
+                            f"SELECT key, value FROM records WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+                        ).fetchall()
+                    # Chaves sem linha foram removidas
+                    rows = [(key, None) for key in keys if key not in dict(rows)] + rows
+                self._last_seq = changes[-1][0]
+            finally:
+                self._conn.execute("COMMIT")
+
+            records = {key: self._decode_value(value) for key, value in rows}
+            if reset:
+                # Escritas locais ainda não gravadas valem sobre o estado lido
+                for key, (_, value) in self._pending.items():
+                    if value is None:
+                        records.pop(key, None)
+                    else:
+                        records[key] = value
+            elif not records:
+                return False
+            for listener in self._listeners:
+                listener(records, reset)
+            return True
+
+    def close(self) -> None:
+        self._commit.close()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def version(self, office_id: Optional[str] = None) -> Optional[str]:
+        """
+        Banco e posição no log de `changes` até onde a memória chegou: após
+        o `refresh` de cada requisição, a mesma em todos os workers. Vale
+        para a coleção inteira (com sharding, por escritório)
+        """
+        with self._lock:
+            return f"{self._epoch}.{self._last_seq}"
+
+
+class ShardedStore:
+    """
+    Uma store por escritório (STORAGE_SHARDING=office)
+
+    Cada escritório tem o próprio arquivo em `<coleção>/` (no motor
+    configurado: `<escritório>.json`, `.json.log`, `.db`...), com só os
+    registros dele: uma escrita toca apenas o shard do escritório dono do
+    registro e `find(office_id=...)` só percorre esse shard. O shard é
+    aberto, e seus registros entregues à memória do serviço (`load_with`),
+    no primeiro acesso ao escritório (`open_office`); operações sem
+    escritório abrem todos (`open_all`) e `select` junta os resultados já
+    ordenados de cada shard (`heapq.merge`).
+
+    Shards em memória (json/log) mantêm um mapa chave → escritório para
+    `get`/`delete` sem escritório; shards SQLite não guardam nada dos
+    registros: essas operações consultam os shards abertos.
+
+    Campos `unique` (ex.: número do processo) valem para a coleção inteira:
+    valor → (chave, escritório) fica numa tabela SQLite ao lado dos shards
+    (`<coleção>.unique.db`), atualizada a cada put/delete. `lookup` e a
+    checagem sob `exclusive_collection` consultam só essa tabela e o shard
+    do dono, sem abrir os demais.
+
+    Na primeira abertura, o arquivo único anterior (de qualquer motor) é
+    dividido por escritório; ele é mantido como estava.
+    """
+
+    # Arquivo dos registros sem escritório (nomes de escritório são escapados e nunca contêm "@")
+    NO_OFFICE = "@none"
+    # Marca, na tabela de valores únicos, de que ela já reflete os shards
+    _UNIQUE_READY = "@ready"
+
+    def __init__(
+        self, file_path: str, default: Records, store_cls: type, unique: Tuple[str, ...] = (), **options: Any
+    ):
+        self.file_path = file_path
+        self.directory = os.path.splitext(file_path)[0]
+        self.default = default
+        self.is_list = isinstance(default, list)
+        self.shared = store_cls.shared
+        self.in_memory = store_cls.in_memory
+        self._store_cls = store_cls
+        self._options = options
+        self._shards: Dict[Optional[str], JsonStore] = {}
+        self._callback: Optional[Callable[[Records], None]] = None
+        self._listeners: List[Listener] = []
+        self._lock = threading.RLock()
+        # Chave → escritório, dos shards em memória abertos: `delete(chave)` sabe qual arquivo tocar
+        self._owners: Dict[str, Optional[str]] = {}
+        self._owners_lock = threading.Lock()
+        self._migrate()
+        self._collection_lock = FileLock(f"{self.directory}.lock")
+        self.unique = tuple(unique)
+        self._unique: Optional[SqliteStore] = None
+        if self.unique:
+            self._unique = SqliteStore(f"{self.directory}.unique.json", {}, **{**options, "decode": None})
+            self._index_unique()
+
+    def _shard_path(self, office_id: Optional[str], directory: Optional[str] = None) -> str:
+        name = self.NO_OFFICE if office_id is None else quote(str(office_id), safe="").replace(".", "%2E")
+        return os.path.join(directory or self.directory, f"{name}.json")
+
+    def _open(self, path: str, **options: Any) -> JsonStore:
+        return self._store_cls(path, copy.copy(self.default), **{**self._options, **options})
+
+    def _key(self, key: Any, record: Any) -> str:
+        return str(record.get("id")) if self.is_list else key
+
+    def _items(self, data: Records) -> Iterator[Tuple[str, Any]]:
+        return ((self._key(None, r), r) for r in data) if self.is_list else iter(data.items())
+
+    def _migrate(self) -> None:
+        """Divide o arquivo único do motor anterior em shards (uma vez, um worker por vez)"""
+        legacy = [self.file_path, snapshot.snapshot_path(self.file_path), f"{self.file_path}.log",
+                  f"{os.path.splitext(self.file_path)[0]}.db"]
+        os.makedirs(os.path.dirname(self.directory), exist_ok=True)
+        with FileLock(f"{self.directory}.lock"):
+            if os.path.isdir(self.directory) or not any(os.path.exists(path) for path in legacy):
+                return
+            # O SQLite anterior, se existir; senão o arquivo da coleção mais a cauda do log.
+            # Registros copiados como estão no disco (sem `decode`)
+            options = {**self._options, "decode": None}
+            if os.path.exists(legacy[3]):
+                source: JsonStore = SqliteStore(self.file_path, copy.copy(self.default), **options)
+            else:
+                source = LogStore(self.file_path, copy.copy(self.default), snapshot_interval=0, **options)
+            offices: Dict[Optional[str], Dict[str, Any]] = {}
+            try:
+                for key, record in self._items(source.load()):
+                    offices.setdefault(record.get("office_id"), {})[key] = record
+            finally:
+                source.close()
+
+            # Shards gravados num diretório temporário: uma queda no meio não deixa metade migrada
+            temp_dir = f"{self.directory}.tmp"
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            os.makedirs(temp_dir)
+            for office_id, records in offices.items():
+                shard = self._open(self._shard_path(office_id, temp_dir), fsync_policy="always", decode=None)
+                shard.load()
+                shard.save(list(records.values()) if self.is_list else records)
+                shard.close()
+            os.replace(temp_dir, self.directory)
+            logger.info(f"{self.file_path} dividido em {len(offices)} shards em {self.directory}")
+
+    def _index_unique(self) -> None:
+        """Preenche a tabela de valores únicos a partir dos shards existentes (uma vez, um worker por vez)"""
+        with self._collection_lock:
+            if self._unique.get(self._UNIQUE_READY) is not None:
+                return
+            with self._unique.write():
+                for office_id in self.offices():
+                    shard = self._open(self._shard_path(office_id), decode=None)
+                    try:
+                        if shard.in_memory:
+                            shard.load()
+                        for record in shard.find():
+                            self._put_unique(str(record.get("id")), None, record)
+                    finally:
+                        shard.close()
+                self._unique.put(self._UNIQUE_READY, {})
+
+    def _put_unique(self, key: str, previous: Optional[Any], value: Optional[Any]) -> None:
+        """Atualiza valor → (chave, escritório) dos campos únicos de um registro gravado ou removido"""
+        for field in self.unique:
+            old = None if previous is None else previous.get(field)
+            new = None if value is None else value.get(field)
+            if old and old != new:
+                entry = self._unique.get(f"{field}:{old}")
+                if entry is not None and entry["key"] == key:
+                    self._unique.delete(f"{field}:{old}")
+            if new:
+                self._unique.put(f"{field}:{new}", {"key": key, "office_id": value.get("office_id")})
+
+    def offices(self) -> List[Optional[str]]:
+        """Escritórios com shard (abertos ou em disco)"""
+        found = dict.fromkeys(self._shards)
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                office = name.split(".", 1)[0]
+                found.setdefault(None if office == self.NO_OFFICE else unquote(office))
+        return list(found)
+
+    def shard(self, office_id: Optional[str]) -> JsonStore:
+        """Store do escritório, aberto (e entregue à memória do serviço) no primeiro acesso"""
+        shard = self._shards.get(office_id)
+        if shard is not None:
+            return shard
+        with self._lock:
+            shard = self._shards.get(office_id)
+            if shard is None:
+                os.makedirs(self.directory, exist_ok=True)
+                shard = self._open(self._shard_path(office_id))
+                if self._callback is not None:
+                    shard.load_with(lambda data: self._loaded(office_id, data))
+                elif shard.in_memory:
+                    self._loaded(office_id, shard.load())
+                shard.subscribe(self._deliver)
+                self._shards[office_id] = shard
+            return shard
+
+    def _loaded(self, office_id: Optional[str], data: Records) -> None:
+        """Registros de um shard aberto (um lote deles, no SQLite) a caminho da memória do serviço"""
+        if self.in_memory:
+            with self._owners_lock:
+                for key, _ in self._items(data):
+                    self._owners[key] = office_id
+        if self._callback is not None:
+            self._callback(data)
+
+    def _deliver(self, changes: Dict[str, Any], reset: bool) -> None:
+        """
+        Mudanças de outros processos num shard SQLite; um shard recarregado
+        chega como mudanças por chave (chaves removidas desde a última
+        posição não são conhecidas: quem indexa descarta as que `get` não acha)
+        """
+        for listener in self._listeners:
+            listener(changes, False)
+
+    def load_with(self, callback: Callable[[Records], None]) -> None:
+        self._callback = callback
+
+    def open_office(self, office_id: Optional[str]) -> None:
+        self.shard(office_id)
+
+    def open_all(self) -> None:
+        for office_id in self.offices():
+            self.shard(office_id)
+
+    def open_scope(self, office_id: Optional[str]) -> None:
+        if office_id:
+            self.shard(office_id)
+        else:
+            self.open_all()
+
+    def write(self, office_id: Optional[str] = None):
+        return self.shard(office_id).write()
+
+    def exclusive(self, office_id: Optional[str] = None):
+        return self.shard(office_id).exclusive()
+
+    @contextmanager
+    def exclusive_collection(self, office_id: Optional[str] = None) -> Iterator[None]:
+        """
+        `exclusive()` valendo para a coleção inteira (unicidade entre
+        escritórios): com o lock da coleção, checagens por `lookup` nos
+        campos `unique` enxergam as gravações de qualquer escritório e
+        worker; só o shard do escritório é aberto
+        """
+        with self._collection_lock:
+            with self.shard(office_id).exclusive():
+                yield
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        office_id = value.get("office_id")
+        shard = self.shard(office_id)
+        if self._unique is not None:
+            with self._unique.write():
+                self._put_unique(key, shard.get(key), value)
+        shard.put(key, value)
+        if self.in_memory:
+            with self._owners_lock:
+                self._owners[key] = office_id
+
+    def _shard_of(self, key: str) -> Optional[JsonStore]:
+        """Shard que guarda a chave (None se nenhum): pelo mapa em memória, ou consultando os shards"""
+        if self.in_memory:
+            if key not in self._owners:
+                self.open_all()
+            with self._owners_lock:
+                if key not in self._owners:
+                    return None
+                office_id = self._owners[key]
+            return self.shard(office_id)
+        self.open_all()
+        for shard in list(self._shards.values()):
+            if shard.get(key) is not None:
+                return shard
+        return None
+
+    def delete(self, key: str) -> None:
+        shard = self._shard_of(key)
+        if shard is None:
+            return
+        if self.in_memory:
+            with self._owners_lock:
+                self._owners.pop(key, None)
+        if self._unique is not None:
+            with self._unique.write():
+                self._put_unique(key, shard.get(key), None)
+        shard.delete(key)
+
+    def lookup(self, field: str, value: Any) -> Optional[Any]:
+        if field not in self.unique:
+            return next(self.select(limit=1, **{field: value}), None)
+        entry = self._unique.get(f"{field}:{value}")
+        if entry is None:
+            return None
+        record = self.shard(entry["office_id"]).get(entry["key"])
+        # Entrada de uma gravação que não chegou ao shard: vale o shard
+        return record if record is not None and record.get(field) == value else None
+
+    def get(self, key: Optional[str], office_id: Optional[str] = None) -> Optional[Any]:
+        if key is None:
+            return None
+        if office_id:
+            return self.shard(office_id).get(key)
+        shard = self._shard_of(key)
+        return None if shard is None else shard.get(key)
+
+    def count(self) -> int:
+        """Registros dos shards abertos"""
+        return sum(shard.count() for shard in list(self._shards.values()))
+
+    def find(self, **filters: Any) -> Iterator[Dict[str, Any]]:
+        office_id = filters.get("office_id")
+        if office_id:
+            return self.shard(office_id).find(**filters)
+        self.open_all()
+        return itertools.chain.from_iterable(shard.find(**filters) for shard in list(self._shards.values()))
+
+    def select(
+        self,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        after: Optional[SortKey] = None,
+        limit: Optional[int] = None,
+        between: Optional[DateRange] = None,
+        **filters: Any
+    ) -> Iterator[Dict[str, Any]]:
+        page = {"order_by": order_by, "descending": descending, "after": after, "limit": limit, "between": between}
+        office_id = filters.get("office_id")
+        if office_id:
+            return self.shard(office_id).select(**page, **filters)
+        self.open_all()
+        results = [shard.select(**page, **filters) for shard in list(self._shards.values())]
+        field = order_by or (between[0] if between is not None else None)
+        if field is None:
+            merged = itertools.chain.from_iterable(results)
+        else:
+            merged = heapq.merge(*results, key=_sort_key(field), reverse=descending)
+        return merged if limit is None else itertools.islice(merged, limit)
+
+    def subscribe(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    def refresh(self) -> bool:
+        changed = False
+        for shard in list(self._shards.values()):
+            changed = shard.refresh() or changed
+        return changed
+
+    def version(self, office_id: Optional[str] = None) -> Optional[str]:
+        """Versão do shard do escritório; sem escritório, a de todos os shards abertos"""
+        if not self.shared:
+            return None
+        if office_id:
+            return self.shard(office_id).version()
+        shards = sorted(self._shards.items(), key=lambda item: str(item[0]))
+        return ";".join(f"{office}={shard.version()}" for office, shard in shards)
+
+    def close(self) -> None:
+        for shard in list(self._shards.values()):
+            shard.close()
+        if self._unique is not None:
+            self._unique.close()
+
+
+def _setting(name: Optional[str], key: str, default: str) -> str:
+    """`<NOME>_<KEY>` do serviço, senão `STORAGE_<KEY>`, senão o padrão"""
+    if name:
+        value = os.getenv(f"{name.upper()}_{key}")
+        if value:
+            return value
+    return os.getenv(f"STORAGE_{key}", default)
+
+
+def open_store(
+    file_path: str,
+    default: Optional[Records] = None,
+    name: Optional[str] = None,
+    decode: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    by_office: bool = False,
+    unique: Tuple[str, ...] = ()
+) -> Union[JsonStore, "ShardedStore"]:
+    """
+    Store do motor configurado em STORAGE_ENGINE
+
+    `decode` converte cada registro lido do disco (ex.: `Deadline.from_dict`,
+    registros compactos); registros assim são gravados via `to_dict`.
+
+    Política de fsync e janela do group commit por serviço (`name`):
+    `<NOME>_FSYNC_POLICY` / `<NOME>_COMMIT_WINDOW_MS`, com
+    `STORAGE_FSYNC_POLICY` (padrão `interval`) e `STORAGE_COMMIT_WINDOW_MS`
+    (padrão 0: agrupa só o que chega enquanto o lote anterior é gravado).
+
+    Coleções `by_office` (registros com `office_id`) viram um ShardedStore
+    com STORAGE_SHARDING=office; `unique` são os campos (INDEXED_FIELDS)
+    únicos entre todos os escritórios, checados por `lookup`.
+    """
+    options = {
+        "fsync_policy": _setting(name, "FSYNC_POLICY", "interval").lower(),
+        "commit_window": float(_setting(name, "COMMIT_WINDOW_MS", "0")) / 1000,
+        "decode": decode,
+        "snapshot_format": SNAPSHOT_FORMAT,
+        "compression": SNAPSHOT_COMPRESSION,
+    }
+    store_cls = {"json": JsonStore, "log": LogStore, "sqlite": SqliteStore}.get(STORAGE_ENGINE)
+    if store_cls is None:
+        logger.warning(f"STORAGE_ENGINE desconhecido: {STORAGE_ENGINE}. Usando 'json'.")
+        store_cls = JsonStore
+    if by_office and STORAGE_SHARDING == "office":
+        return ShardedStore(file_path, default if default is not None else {}, store_cls, unique, **options)
+    if STORAGE_SHARDING not in ("none", "office"):
+        logger.warning(f"STORAGE_SHARDING desconhecido: {STORAGE_SHARDING}. Usando 'none'.")
+    return store_cls(file_path, default, **options)
+
+
+# Rotas que não leem dados de escritórios (o /health é sondado pelo Gateway a cada poucos segundos)
+NON_TENANT_ENDPOINTS = frozenset({"root", "root_index", "favicon", "health", "static"})
+
+
+def sync_before_request(app: Any, *stores: Union[JsonStore, ShardedStore]) -> None:
+    """
+    Antes de cada requisição do app Flask que lê dados de escritórios: com
+    sharding, abre o shard do escritório do header X-Office-ID (todos, sem o
+    header); com SQLite, aplica as mudanças gravadas por outros workers
+    (`refresh`). Rotas em NON_TENANT_ENDPOINTS não abrem shards.
+    """
+    sharded = [store for store in stores if isinstance(store, ShardedStore)]
+    shared = [store for store in stores if store.shared]
+    if not sharded and not shared:
+        return
+
+    from flask import request
+
+    @app.before_request
+    def prepare_stores() -> None:
+        if request.endpoint is None or request.endpoint in NON_TENANT_ENDPOINTS:
+            return
+        office_id = request.headers.get("X-Office-ID")
+        for store in sharded:
+            store.open_scope(office_id)
+        for store in shared:
+            store.refresh()
+
+
+def mirror(store: JsonStore, records: Dict[str, Any], versions: Any = None) -> None:
+    """
+    Mantém o dict em memória do serviço (chave → registro) igual às
+    mudanças de outros workers; com `versions` (CollectionVersions), invalida
+    os ETags dos escritórios afetados
+    """
+    def apply(changes: Dict[str, Any], reset: bool) -> None:
+        if reset:
+            records.clear()
+            records.update(changes)
+            if versions is not None:
+                versions.reset()
+            return
+        for key, value in changes.items():
+            previous = records.pop(key, None) if value is None else records.get(key)
+            if value is not None:
+                records[key] = value
+            if versions is not None:
+                for office_id in {r.get("office_id") for r in (previous, value) if r is not None}:
+                    versions.bump(office_id)
+
+    store.subscribe(apply)
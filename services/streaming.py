@@ -0,0 +1,43 @@
+"""
+Listagens em NDJSON (um registro JSON por linha)
+
+Com `Accept: application/x-ndjson` as listagens são geradas registro a
+registro, sem montar a lista inteira nem o documento JSON completo em
+memória. Os registros são agrupados em blocos de ~64 KiB antes de ir para
+o socket, para não gerar um chunk HTTP por registro.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator
+
+from flask import Response, request
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+CHUNK_SIZE = 64 * 1024
+
+
+def wants_ndjson() -> bool:
+    """O cliente prefere NDJSON a JSON (Accept)"""
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def iter_ndjson(records: Iterable[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Serializa os registros em linhas NDJSON, agrupadas em blocos de ~`chunk_size`"""
+    buffer = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def ndjson_response(records: Iterable[Dict[str, Any]]) -> Response:
+    """Resposta streaming com os registros em NDJSON"""
+    return Response(iter_ndjson(records), mimetype=NDJSON_MIMETYPE)
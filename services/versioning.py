@@ -0,0 +1,83 @@
+"""
+Versão por escritório das coleções dos serviços
+
+Cada mutação incrementa a versão do escritório dono do registro (e a
+versão global, usada quando a listagem não é filtrada por escritório).
+O ETag das listagens é derivado dessa versão, sem serializar a coleção.
+
+Com vários workers (motor `sqlite`) os contadores em memória seriam de
+cada processo; a versão vem então do próprio store (`store.version`,
+a posição no log de mudanças do banco), igual em todos os workers e
+alterada por escritas de qualquer um deles.
+"""
+
+import hashlib
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from flask import request, make_response
+
+from services.streaming import NDJSON_MIMETYPE, ndjson_response, wants_ndjson
+
+
+class CollectionVersions:
+    """Contadores de versão de uma coleção, por escritório."""
+
+    def __init__(self, name: str, store: Any = None):
+        self.name = name
+        # Store compartilhado entre processos: a versão vem dele
+        self._store = store if store is not None and store.shared else None
+        # Muda a cada inicialização: versões em memória recomeçam do zero
+        self._boot_id = uuid.uuid4().hex[:8]
+        self._versions: Dict[Optional[str], int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, office_id: Optional[str]) -> None:
+        with self._lock:
+            self._versions[office_id] = self._versions.get(office_id, 0) + 1
+            if office_id is not None:
+                self._versions[None] = self._versions.get(None, 0) + 1
+
+    def reset(self) -> None:
+        """Coleção recarregada por inteiro: ETags anteriores deixam de valer"""
+        with self._lock:
+            self._boot_id = uuid.uuid4().hex[:8]
+            self._versions = {}
+
+    def etag(self, office_id: Optional[str], variant: str = "") -> str:
+        if self._store is not None:
+            version = self._store.version(office_id)
+        else:
+            with self._lock:
+                version = f"{self._boot_id}:{self._versions.get(office_id, 0)}"
+        raw = f"{self.name}:{office_id}:{version}:{variant}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+    def conditional(
+        self,
+        office_id: Optional[str],
+        build_response: Callable,
+        stream: Optional[Callable[[], Iterable[Dict[str, Any]]]] = None,
+        variant: str = ""
+    ):
+        """
+        Responde 304 sem corpo se o If-None-Match bate com a versão atual;
+        caso contrário chama `build_response` e anexa o ETag.
+
+        Se `stream` for informado e o cliente pedir NDJSON, a resposta é
+        gerada a partir dos registros de `stream()` (ETag próprio).
+        `variant` distingue respostas diferentes da mesma versão (ex.: páginas).
+        """
+        streaming = stream is not None and wants_ndjson()
+        etag = self.etag(office_id, f"{variant}:{NDJSON_MIMETYPE}" if streaming else variant)
+        if request.if_none_match.contains_weak(etag):
+            response = make_response("", 304)
+        elif streaming:
+            response = ndjson_response(stream())
+        else:
+            response = make_response(build_response())
+        response.set_etag(etag, weak=True)
+        if stream is not None:
+            response.vary.add("Accept")
+        return response
@@ -54,3 +54,43 @@ def test_auth_register_and_login():
 
 
 
+
+
+def test_auth_login_does_not_rewrite_users(monkeypatch):
+    import hashlib
+    from services import storage
+    from services.auth.app import create_app
+
+    monkeypatch.setattr(storage, "STORAGE_ENGINE", "json")
+    # Conta antiga: sem email, user_type nem office_id; senha em SHA-256 sem sal
+    legacy = {
+        "password_hash": hashlib.sha256(b"secret123").hexdigest(),
+        "roles": ["advogado", "user"],
+        "permissions": ["read"],
+    }
+    with open(USERS_PATH, "w", encoding="utf-8") as f:
+        json.dump({"antigo@advogado.com": legacy}, f)
+
+    app = create_app()
+    # Migração em lote na subida já gravou os campos novos
+    with open(USERS_PATH, encoding="utf-8") as f:
+        migrated = json.load(f)["antigo@advogado.com"]
+    assert migrated["user_type"] == "advogado"
+    assert migrated["email"] == "antigo@advogado.com"
+    assert migrated["office_id"]
+
+    # Primeiro login regrava o hash antigo em scrypt
+    client = app.test_client()
+    login = {"email": "antigo@advogado.com", "password": "secret123"}
+    assert client.post("/auth/login", json=login).status_code == 200
+    with open(USERS_PATH, encoding="utf-8") as f:
+        upgraded = json.load(f)["antigo@advogado.com"]["password_hash"]
+    assert upgraded.startswith("scrypt$")
+
+    mtime = os.stat(USERS_PATH).st_mtime_ns
+    for _ in range(3):
+        resp = client.post("/auth/login", json=login)
+        assert resp.status_code == 200
+        assert resp.get_json()["user"]["office_id"] == migrated["office_id"]
+    assert client.post("/auth/login", json={**login, "password": "errada123"}).status_code == 401
+    assert os.stat(USERS_PATH).st_mtime_ns == mtime
@@ -51,4 +51,67 @@ def test_deadlines_crud():
     assert resp.status_code == 200
 
 
+def test_deadlines_cursor_pagination():
+    from services.deadlines.app import create_app
+
+    client = create_app().test_client()
+    headers = {"X-Office-ID": "office-pages"}
+    for day in ("05", "03", "01", "04", "02"):
+        resp = client.post(
+            "/deadlines",
+            json={"process_id": "P1", "due_date": f"2099-01-{day}", "description": "d"},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+
+    seen = []
+    cursor = None
+    while True:
+        query = "?sort=-due_date&limit=2" + (f"&cursor={cursor}" if cursor else "")
+        resp = client.get("/deadlines" + query, headers=headers)
+        assert resp.status_code == 200
+        page = resp.get_json()
+        assert len(page) <= 2
+        seen += [d["due_date"] for d in page]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [f"2099-01-0{d}" for d in (5, 4, 3, 2, 1)]
+
+    assert client.get("/deadlines?sort=office_id", headers=headers).status_code == 400
+    assert client.get("/deadlines?sort=due_date&cursor=" + "x" * 8, headers=headers).status_code == 400
+
+
+
+
 
+def test_deadlines_grpc_shares_store():
+    grpc = pytest.importorskip("grpc")
+    from concurrent import futures
+    from protos import deadlines_pb2, deadlines_pb2_grpc
+    from services.deadlines.app import create_app
+    from services.deadlines.grpc_server import register
+
+    app = create_app()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    register(server, app)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    try:
+        with grpc.insecure_channel(f"127.0.0.1:{port}") as channel:
+            stub = deadlines_pb2_grpc.DeadlinesStub(channel)
+            metadata = (("x-office-id", "office-grpc"),)
+            created = stub.CreateDeadline(
+                deadlines_pb2.CreateDeadlineRequest(process_id="P1", due_date="2099-01-01", description="d"),
+                metadata=metadata, timeout=5,
+            )
+            assert created.office_id == "office-grpc"
+
+            # Visível pela rota HTTP (mesmo armazenamento)
+            resp = app.test_client().get("/deadlines", headers={"X-Office-ID": "office-grpc"})
+            assert [d["id"] for d in resp.get_json()] == [created.id]
+
+            listed = stub.ListDeadlines(deadlines_pb2.ListDeadlinesRequest(), metadata=metadata, timeout=5)
+            assert [d.id for d in listed.items] == [created.id]
+    finally:
+        server.stop(None)
@@ -57,3 +57,64 @@ def test_documents_crud():
 
 
 
+
+
+def test_documents_list_ndjson():
+    from services.documents.app import service
+
+    client = service.app.test_client()
+    headers = {"X-Office-ID": "office-ndjson"}
+    for title in ("A", "B"):
+        resp = client.post(
+            "/documents",
+            json={"title": title, "content": "Texto", "author": "Autor"},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+
+    resp = client.get("/documents", headers={**headers, "Accept": "application/x-ndjson"})
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    lines = resp.get_data(as_text=True).splitlines()
+    assert sorted(json.loads(line)["title"] for line in lines) == ["A", "B"]
+
+    # ETag próprio por representação
+    json_resp = client.get("/documents", headers=headers)
+    assert json_resp.headers["ETag"] != resp.headers["ETag"]
+    resp = client.get(
+        "/documents",
+        headers={**headers, "Accept": "application/x-ndjson", "If-None-Match": resp.headers["ETag"]},
+    )
+    assert resp.status_code == 304
+
+
+def test_documents_search_ranks_and_scopes_by_office():
+    from services.documents.app import service
+
+    client = service.app.test_client()
+    headers = {"X-Office-ID": "office-search"}
+    docs = {}
+    for title, content in (
+        ("Contestação", "Prazo para contestação do réu"),
+        ("Petição inicial", "Ação de cobrança com pedido de contestações"),
+        ("Procuração", "Poderes gerais"),
+    ):
+        resp = client.post("/documents", json={"title": title, "content": content, "author": "Autor"}, headers=headers)
+        docs[title] = resp.get_json()["id"]
+    client.post(
+        "/documents",
+        json={"title": "Contestação", "content": "Outro escritório", "author": "Autor"},
+        headers={"X-Office-ID": "office-other"},
+    )
+
+    # Sem acento e no plural; título pesa mais que conteúdo
+    resp = client.get("/documents/search?q=contestacoes", headers=headers)
+    assert resp.status_code == 200
+    ids = [item["id"] for item in resp.get_json()["items"]]
+    assert ids == [docs["Contestação"], docs["Petição inicial"]]
+
+    client.put(f"/documents/{docs['Procuração']}", json={"content": "Contestação assinada"}, headers=headers)
+    client.delete(f"/documents/{docs['Contestação']}", headers=headers)
+    items = client.get("/documents/search?q=contestação", headers=headers).get_json()["items"]
+    assert sorted(item["id"] for item in items) == sorted([docs["Petição inicial"], docs["Procuração"]])
+    assert client.get("/documents/search", headers=headers).status_code == 400
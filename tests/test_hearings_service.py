@@ -52,3 +52,54 @@ def test_hearings_crud():
 
 
 
+
+
+def test_hearings_date_index():
+    import datetime
+    from services.hearings.app import create_app
+
+    client = create_app().test_client()
+    headers = {"X-Office-ID": "office-dates"}
+    today = datetime.date.today().isoformat()
+    ids = {}
+    for date in ("2099-03-10", "2099-03-01", "2099-03-20T14:00", today):
+        resp = client.post(
+            "/hearings",
+            json={"process_id": "P1", "date": date, "courtroom": "Sala 1", "description": "d"},
+            headers=headers,
+        )
+        ids[date] = resp.get_json()["id"]
+
+    resp = client.get("/hearings?from=2099-03-01&to=2099-03-20", headers=headers)
+    assert [h["date"] for h in resp.get_json()["items"]] == ["2099-03-01", "2099-03-10", "2099-03-20T14:00"]
+    resp = client.get("/hearings?date=2099-03-10", headers=headers)
+    assert [h["id"] for h in resp.get_json()["items"]] == [ids["2099-03-10"]]
+    assert client.get("/hearings?from=2099-03-01", headers={"X-Office-ID": "other"}).get_json()["items"] == []
+
+    resp = client.get("/hearings/today", headers=headers)
+    assert [h["id"] for h in resp.get_json()["items"]] == [ids[today]]
+
+    assert client.delete(f"/hearings/{ids['2099-03-10']}").status_code == 200
+    assert client.delete(f"/hearings/{ids['2099-03-10']}").status_code == 404
+    resp = client.get("/hearings?from=2099-03-01&to=2099-03-31", headers=headers)
+    assert [h["date"] for h in resp.get_json()["items"]] == ["2099-03-01", "2099-03-20T14:00"]
+
+
+def test_hearings_compact_records_keep_api_shape():
+    from services.hearings.app import Hearing, create_app
+
+    client = create_app().test_client()
+    payload = {"process_id": "P9", "date": "2099-05-02", "courtroom": "Sala 3", "description": "d"}
+    created = client.post("/hearings", json=payload, headers={"X-Office-ID": "office-compact"}).get_json()
+    assert {k: created[k] for k in payload} == payload
+
+    # Data ISO guardada como ordinal; o formato volta igual na listagem e após recarregar do disco
+    record = Hearing.from_dict(created)
+    assert isinstance(record.date, int)
+    assert record.to_dict() == created
+    reloaded = create_app().test_client().get("/hearings", headers={"X-Office-ID": "office-compact"})
+    assert reloaded.get_json()["items"] == [created]
+
+    # Valores fora do padrão e campos extras são preservados
+    odd = {"id": "x", "date": 20990502, "legacy": True}
+    assert Hearing.from_dict(odd).to_dict() == odd
@@ -0,0 +1,43 @@
+import hashlib
+
+import pytest
+
+from common import passwords
+from common.passwords import PasswordHasher, PasswordHasherBusy, hash_password, needs_rehash, verify_password
+
+
+def test_scrypt_hash_is_salted_and_upgrades_legacy(monkeypatch):
+    monkeypatch.setattr(passwords, "PASSWORD_SCRYPT_N", 1024)
+    first, second = hash_password("secret123"), hash_password("secret123")
+    assert first != second and first.startswith("scrypt$1024$")
+    assert verify_password("secret123", first)
+    assert not verify_password("errada", first)
+    assert not needs_rehash(first)
+
+    legacy = hashlib.sha256(b"secret123").hexdigest()
+    assert verify_password("secret123", legacy) and needs_rehash(legacy)
+    # Custo alterado: hashes antigos são regravados no próximo login
+    monkeypatch.setattr(passwords, "PASSWORD_SCRYPT_N", 2048)
+    assert needs_rehash(first) and verify_password("secret123", first)
+
+    hasher = PasswordHasher(workers=0, queue_size=0)
+    assert hasher.verify("secret123", legacy)  # SHA-256 não ocupa a fila
+    with pytest.raises(PasswordHasherBusy):
+        hasher.verify("secret123", first)
+    assert hasher.stats()["rejected"] == 1
+
+
+def test_scrypt_memory_is_bounded_by_config():
+    # Hash com custo forjado (n=2^20, ~1 GB) é recusado sem alocar a memória
+    assert not verify_password("secret123", f"scrypt${1 << 20}$8$1$00$00")
+
+
+def test_password_hasher_counts_only_successful_derivations():
+    def fail(*args):
+        raise RuntimeError("falha na derivação")
+
+    hasher = PasswordHasher(workers=0, queue_size=2)
+    with pytest.raises(RuntimeError):
+        hasher._run(fail)
+    assert hasher._run(lambda: "ok") == "ok"
+    assert hasher.stats()["completed"] == 1 and hasher.stats()["rejected"] == 0
@@ -58,4 +58,58 @@ def test_processes_crud():
     assert resp.status_code == 200
 
 
+def test_processes_list_etag():
+    from services.processes.app import create_app
+
+    app = create_app()
+    client = app.test_client()
+    headers = {"X-Office-ID": "office-etag"}
+
+    resp = client.get("/processes", headers=headers)
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+
+    # Mesma versão: 304 sem corpo
+    resp = client.get("/processes", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.data == b""
+
+    # Mutação no escritório invalida o ETag
+    resp = client.post(
+        "/processes",
+        json={"number": "PROC-987654", "title": "Ação"},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    resp = client.get("/processes", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+
+
+def test_processes_number_index():
+    from services.processes.app import create_app
+
+    client = create_app().test_client()
+    headers = {"X-Office-ID": "office-index"}
+
+    resp = client.post("/processes", json={"number": "PROC-880001", "title": "A"}, headers=headers)
+    assert resp.status_code == 201
+    proc_id = resp.get_json()["id"]
+    assert client.post("/processes", json={"number": "proc-880001", "title": "B"}, headers=headers).status_code == 409
+
+    # Renumerar libera o número antigo e ocupa o novo
+    resp = client.put(f"/processes/{proc_id}", json={"number": "PROC-880002"}, headers=headers)
+    assert resp.status_code == 200
+    assert client.get("/processes/by-number/PROC-880001", headers=headers).status_code == 404
+    assert client.get("/processes/by-number/PROC-880002", headers=headers).get_json()["id"] == proc_id
+    assert client.get("/processes/by-number/PROC-880002", headers={"X-Office-ID": "other"}).status_code == 404
+
+    # Índice reconstruído na carga; números são únicos entre escritórios
+    client = create_app().test_client()
+    other = {"X-Office-ID": "other"}
+    assert client.post("/processes", json={"number": "PROC-880002", "title": "C"}, headers=other).status_code == 409
+    assert client.get("/processes/by-number/PROC-880002", headers=headers).status_code == 200
+    assert [p["id"] for p in client.get("/processes", headers=headers).get_json()] == [proc_id]
 
+    assert client.delete(f"/processes/{proc_id}", headers=headers).status_code == 200
+    assert client.get("/processes/by-number/PROC-880002", headers=headers).status_code == 404
@@ -0,0 +1,336 @@
+import json
+import os
+import threading
+
+import pytest
+
+from services.storage import JsonStore, LogStore
+
+
+def test_log_store_recovers_snapshot_and_log(tmp_path):
+    path = str(tmp_path / "items.json")
+    store = LogStore(path, default=[], snapshot_interval=0)
+    assert store.load() == []
+    store.put("a", {"id": "a", "n": 1})
+    store.put("b", {"id": "b", "n": 2})
+    store.put("a", {"id": "a", "n": 3})
+    store.delete("b")
+
+    # Nada foi reescrito no snapshot; o estado vem do log
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == []
+    assert LogStore(path, default=[], snapshot_interval=0).load() == [{"id": "a", "n": 3}]
+
+    # Compactação: snapshot atualizado e log vazio
+    assert store.snapshot(force=True)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == [{"id": "a", "n": 3}]
+    assert os.path.getsize(store.log_path) == 0
+    assert not os.path.exists(store.pending_path)
+
+
+def test_log_store_replays_rotated_log_and_ignores_torn_line(tmp_path):
+    path = str(tmp_path / "items.json")
+    store = LogStore(path, default={}, snapshot_interval=0)
+    store.load()
+    store.put("a", {"id": "a"})
+    store.close()
+
+    # Queda entre a rotação do log e a gravação do snapshot, com uma linha truncada no log novo
+    with open(f"{path}.log.1", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "put", "key": "b", "value": {"id": "b"}}) + "\n")
+    with open(f"{path}.log", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "del", "key": "a"}) + "\n" + '{"op": "put", "ke')
+
+    assert LogStore(path, default={}, snapshot_interval=0).load() == {"b": {"id": "b"}}
+
+
+def test_sqlite_store_imports_json_and_filters(tmp_path):
+    from services.storage import SqliteStore
+
+    path = str(tmp_path / "items.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([
+            {"id": "a", "office_id": "o1", "date": "2099-01-01"},
+            {"id": "b", "office_id": "o2", "date": "2099-01-01"},
+        ], f)
+
+    store = SqliteStore(path, default=[])
+    assert [r["id"] for r in store.load()] == ["a", "b"]
+    store.put("c", {"id": "c", "office_id": "o1", "date": "2099-01-02"})
+    store.put("a", {"id": "a", "office_id": "o1", "date": "2099-01-03"})
+    store.delete("b")
+
+    assert [r["id"] for r in store.find(office_id="o1")] == ["a", "c"]
+    assert [r["id"] for r in store.find(office_id="o1", date="2099-01-02")] == ["c"]
+    assert [r["id"] for r in store.find(office_id=None)] == ["a", "c"]
+    store.close()
+
+    reopened = SqliteStore(path, default=[])
+    assert reopened.load()[0] == {"id": "a", "office_id": "o1", "date": "2099-01-03"}
+    reopened.close()
+
+
+def test_sqlite_store_shares_changes_between_workers(tmp_path, monkeypatch):
+    from services import storage
+
+    path = str(tmp_path / "items.json")
+    # Dois workers: duas conexões ao mesmo banco, cada uma com a sua memória
+    first = storage.SqliteStore(path, default={})
+    second = storage.SqliteStore(path, default={})
+    first.load()
+    second.load()
+    received = []
+    first.subscribe(lambda changes, reset: received.append(("first", changes, reset)))
+    second.subscribe(lambda changes, reset: received.append(("second", changes, reset)))
+
+    first.put("a", {"id": "a", "office_id": "o1"})
+    first.put("b", {"id": "b", "office_id": "o1"})
+    assert first.refresh() is False
+    assert second.refresh() is True
+    assert received == [("second", {"a": {"id": "a", "office_id": "o1"}, "b": {"id": "b", "office_id": "o1"}}, False)]
+    assert second.refresh() is False
+
+    # exclusive() aplica antes do bloco o que o outro worker gravou
+    received.clear()
+    second.delete("a")
+    with first.exclusive():
+        assert received == [("first", {"a": None}, False)]
+        first.put("c", {"id": "c", "office_id": "o2"})
+
+    # Worker atrasado além da retenção (ou save): coleção inteira
+    received.clear()
+    monkeypatch.setattr(storage, "SQLITE_CHANGES_RETENTION", 2)
+    for key in "defg":
+        first.put(key, {"id": key})
+    second.refresh()
+    assert received[-1][0] == "second" and received[-1][2] is True
+    assert sorted(received[-1][1]) == ["b", "c", "d", "e", "f", "g"]
+    first.close()
+    second.close()
+
+
+def test_sqlite_select_pages_in_sql_like_memory_engines(tmp_path, monkeypatch):
+    from services import storage
+
+    # Lotes pequenos: a leitura em várias consultas também é exercitada
+    monkeypatch.setattr(storage, "SQLITE_READ_BATCH", 2)
+    records = [
+        {"id": f"r{i}", "office_id": f"o{i % 2}", "date": f"2099-01-0{i % 4 + 1}", "title": "tbd"[i % 3]}
+        for i in range(9)
+    ] + [{"id": "blank", "office_id": "o0", "date": "", "title": None}]
+    stores = [
+        storage.JsonStore(str(tmp_path / "json" / "items.json"), default=[]),
+        storage.SqliteStore(str(tmp_path / "sqlite" / "items.json"), default=[]),
+        storage.ShardedStore(str(tmp_path / "sharded" / "items.json"), [], storage.SqliteStore),
+    ]
+    stores[0].load()
+    for store in stores:
+        for record in records:
+            store.put(record["id"], record)
+    assert not stores[1].in_memory and not stores[2].in_memory
+
+    queries = [
+        {"order_by": "title", "limit": 4},
+        {"order_by": "title", "descending": True, "after": ("d", "r5"), "limit": 3},
+        {"order_by": "date", "office_id": "o0"},
+        {"between": ("date", "2099-01-02", "2099-01-03")},
+        {"between": ("date", None, "2099-01-01"), "order_by": "title", "office_id": "o1"},
+    ]
+    for query in queries:
+        expected = [r["id"] for r in stores[0].select(**query)]
+        for store in stores[1:]:
+            assert [r["id"] for r in store.select(**query)] == expected, query
+    assert [r["id"] for r in stores[1].find()] == [r["id"] for r in records]
+    assert stores[1].get("r3") == records[3] and stores[2].get("r3", "o1") == records[3]
+    assert stores[2].get("r3", "o0") is None and stores[1].get("nope") is None
+    assert stores[1].count() == 10
+    for store in stores:
+        store.close()
+
+
+def test_collection_versions_etag_is_shared_between_workers(tmp_path):
+    from services.storage import SqliteStore
+    from services.versioning import CollectionVersions
+
+    path = str(tmp_path / "items.json")
+    first = SqliteStore(path, default={})
+    second = SqliteStore(path, default={})
+    first.load()
+    second.load()
+    first_versions = CollectionVersions("items", first)
+    second_versions = CollectionVersions("items", second)
+    etag = first_versions.etag("o1")
+    assert second_versions.etag("o1") == etag
+
+    # Escrita num worker muda o ETag do outro (após o refresh de cada requisição)
+    first.put("a", {"id": "a", "office_id": "o1"})
+    second.refresh()
+    assert second_versions.etag("o1") != etag
+    assert second_versions.etag("o1") == first_versions.etag("o1")
+
+    # Motores de um processo só continuam com os contadores em memória
+    local = CollectionVersions("items", JsonStore(str(tmp_path / "local.json"), default={}))
+    local_etag = local.etag("o1")
+    local.bump("o1")
+    assert local.etag("o1") != local_etag
+    first.close()
+    second.close()
+
+
+def test_sharded_store_splits_by_office_and_loads_lazily(tmp_path):
+    from services.storage import ShardedStore
+
+    path = str(tmp_path / "items.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([
+            {"id": "a", "office_id": "o1"},
+            {"id": "b", "office_id": "o2"},
+            {"id": "c", "office_id": None},
+        ], f)
+
+    # O arquivo único é dividido por escritório na primeira abertura
+    store = ShardedStore(path, [], JsonStore)
+    assert sorted(os.listdir(tmp_path / "items")) == ["@none.json", "o1.json", "o2.json"]
+    loaded = []
+    store.load_with(loaded.append)
+    assert loaded == []
+
+    store.open_office("o1")
+    assert loaded == [[{"id": "a", "office_id": "o1"}]]
+
+    # A escrita toca só o shard do escritório
+    o2_before = (tmp_path / "items" / "o2.json").read_text(encoding="utf-8")
+    with store.write("o1"):
+        store.put("d", {"id": "d", "office_id": "o1"})
+    store.delete("a")
+    assert (tmp_path / "items" / "o2.json").read_text(encoding="utf-8") == o2_before
+    assert [r["id"] for r in store.find(office_id="o1")] == ["d"]
+    assert len(loaded) == 1
+
+    # Sem escritório: todos os shards
+    assert sorted(r["id"] for r in store.find()) == ["b", "c", "d"]
+    assert len(loaded) == 3
+    store.close()
+
+    reopened = ShardedStore(path, [], JsonStore)
+    assert sorted(reopened.offices(), key=str) == [None, "o1", "o2"]
+    reopened.close()
+
+
+def test_sharded_store_checks_unique_values_without_opening_shards(tmp_path):
+    from services.storage import ShardedStore
+
+    path = str(tmp_path / "items.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"a": {"id": "a", "office_id": "o1", "number": "N1"},
+                   "b": {"id": "b", "office_id": "o2", "number": "N2"}}, f)
+
+    # Tabela de números montada a partir dos shards na primeira abertura
+    store = ShardedStore(path, {}, JsonStore, unique=("number",))
+    assert store._shards == {}
+    with store.exclusive_collection("o1"):
+        assert store.lookup("number", "N1")["id"] == "a"
+        assert store.lookup("number", "N3") is None
+        store.put("c", {"id": "c", "office_id": "o1", "number": "N3"})
+    assert list(store._shards) == ["o1"]
+    assert store.lookup("number", "N2")["id"] == "b"
+    assert sorted(store._shards) == ["o1", "o2"]
+
+    # Renumerar libera o número antigo; remover libera o atual
+    store.put("c", {"id": "c", "office_id": "o1", "number": "N4"})
+    store.delete("a")
+    store.close()
+
+    reopened = ShardedStore(path, {}, JsonStore, unique=("number",))
+    assert [reopened.lookup("number", n) for n in ("N1", "N3")] == [None, None]
+    assert reopened.lookup("number", "N4")["id"] == "c"
+    assert list(reopened._shards) == ["o1"]
+    reopened.close()
+
+
+def test_sync_before_request_skips_non_tenant_routes(tmp_path):
+    from flask import Flask
+    from services.storage import ShardedStore, sync_before_request
+
+    path = str(tmp_path / "items.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([{"id": "a", "office_id": "A"}, {"id": "b", "office_id": "B"}], f)
+    store = ShardedStore(path, [], JsonStore)
+    store.load_with(lambda records: None)
+
+    app = Flask(__name__)
+    app.add_url_rule("/health", "health", lambda: ("ok", 200))
+    app.add_url_rule("/items", "list_items", lambda: ("[]", 200))
+    sync_before_request(app, store)
+
+    client = app.test_client()
+    client.get("/items", headers={"X-Office-ID": "A"})
+    client.get("/health")
+    assert list(store._shards) == ["A"]
+    # Rota de dados sem escritório: todos os shards
+    client.get("/items")
+    assert sorted(store._shards) == ["A", "B"]
+    store.close()
+
+
+def test_group_commit_batches_concurrent_writes(tmp_path):
+    path = str(tmp_path / "items.json")
+    store = JsonStore(path, default={}, fsync_policy="batch", commit_window=0.05)
+    store.load()
+    flushes = []
+    flush = store._commit._flush
+    store._commit._flush = lambda ops, durable: (flushes.append((len(ops), durable)), flush(ops, durable))
+
+    missing = []
+
+    def writer(i):
+        store.put(str(i), {"id": str(i)})
+        # Confirmado: o registro já está no arquivo
+        with open(path, encoding="utf-8") as f:
+            if str(i) not in json.load(f):
+                missing.append(i)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert missing == []
+    assert sum(n for n, _ in flushes) == 20
+    assert len(flushes) < 20
+    assert all(durable for _, durable in flushes)
+    store.close()
+
+
+def test_group_commit_rejects_unknown_policy(tmp_path):
+    with pytest.raises(ValueError):
+        JsonStore(str(tmp_path / "items.json"), fsync_policy="never")
+
+
+def test_binary_snapshot_round_trip_and_migration(tmp_path):
+    from services import snapshot
+
+    records = [
+        {"id": "a", "office_id": "o1", "date": "2099-01-01"},
+        {"id": "b", "office_id": "o1", "date": "2099-01-01", "extra": [1, None]},
+        {"id": "c", "office_id": "o1", "date": "2099-01-02"},
+        {},
+    ]
+    for compression in ("none", "gzip"):
+        assert snapshot.decode(snapshot.encode(records, compression)) == records
+    assert snapshot.decode(snapshot.encode({"k": {"n": 1}, "j": {"n": 2}})) == {"k": {"n": 1}, "j": {"n": 2}}
+    with pytest.raises(ValueError):
+        snapshot.decode(b"[]")
+
+    # Store binário lê o JSON existente na primeira carga e passa a gravar o .snap
+    path = str(tmp_path / "items.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records[:3], f)
+    store = JsonStore(path, default=[], snapshot_format="binary", compression="gzip")
+    assert store.load() == records[:3]
+    store.delete("b")
+    store.close()
+    assert snapshot.read_file(str(tmp_path / "items.snap")) == [records[0], records[2]]
+    assert JsonStore(path, default=[], snapshot_format="binary").load() == [records[0], records[2]]
@@ -81,6 +81,27 @@ class ApiService {
     return this.request(path, 'GET', null, options);
   }
 
+  /**
+   * GET one page of a list endpoint
+   * @param {string} path - API endpoint
+   * @param {Object} page - Pagination options (limit, cursor, sort, params)
+   * @returns {Promise<Object>} Response with `items` and `nextCursor` (null on the last page)
+   */
+  async getPage(path, { limit = 50, cursor = null, sort = null, params = {} } = {}) {
+    const query = new URLSearchParams(params);
+    query.set('limit', String(limit));
+    if (cursor) query.set('cursor', cursor);
+    if (sort) query.set('sort', sort);
+
+    const response = await this.get(`${path}?${query.toString()}`);
+    const data = response.data;
+    return {
+      ...response,
+      items: Array.isArray(data) ? data : (data && data.items) || [],
+      nextCursor: response.headers.get('X-Next-Cursor')
+    };
+  }
+
   /**
    * POST request
    * @param {string} path - API endpoint
@@ -6,17 +6,23 @@ class DocumentService {
   constructor(app) {
     this.app = app;
     this.api = app.getService('api');
+    this.items = [];
+    this.nextCursor = null;
   }
 
   /**
-   * List all documents
+   * List documents, one page at a time (newest first)
+   * @param {string|null} cursor - Cursor of the next page (null for the first one)
    */
-  async list() {
+  async list(cursor = null) {
     try {
-      const response = await this.api.get('/api/documents');
+      const response = await this.api.getPage('/api/documents', { cursor, sort: '-created_at' });
       
       if (response.ok) {
-        this.showDataModal('Documentos', response.data);
+        this.items = cursor ? this.items.concat(response.items) : response.items;
+        this.nextCursor = response.nextCursor;
+        this.showDataModal('Documentos', this.items);
+        this.renderLoadMore();
       } else {
         this.api.handleError(response, 'Listar documentos');
       }
@@ -25,6 +31,20 @@ class DocumentService {
     }
   }
 
+  /**
+   * Append a "load more" button when there is a next page
+   */
+  renderLoadMore() {
+    const container = document.getElementById('dataTableContainer');
+    if (!container || !this.nextCursor) return;
+
+    const button = document.createElement('button');
+    button.className = 'btn';
+    button.textContent = 'Carregar mais';
+    button.onclick = () => this.list(this.nextCursor);
+    container.appendChild(button);
+  }
+
   /**
    * Show create document modal
    */